@@ -1,18 +1,82 @@
 """Agent registry for discovery and instantiation."""
 
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Type
 
 from app.agents.base_agent import BaseAgent
+from app.config import settings
+
+
+class AgentPool:
+    """
+    Bounded pool of warm, initialized agents of a single type.
+
+    Agents are created lazily up to ``max_size`` and handed out one task at a
+    time, so an agent instance is never shared by two concurrent tasks. Idle
+    agents keep their tools and shared LLM client, which means ``initialize()``
+    runs once per instance instead of once per workflow step.
+    """
+
+    def __init__(self, agent_class: Type[BaseAgent], max_size: int) -> None:
+        """Initialize an empty pool."""
+        self.agent_class = agent_class
+        self.max_size = max_size
+        self._idle: deque[BaseAgent] = deque()
+        self._created = 0
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore bounding checkouts, bound to the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_size)
+            self._loop = loop
+        return self._semaphore
+
+    async def acquire(self) -> BaseAgent:
+        """Check out an agent, waiting if all ``max_size`` agents are busy."""
+        await self._get_semaphore().acquire()
+        try:
+            if self._idle:
+                return self._idle.pop()
+
+            agent = self.agent_class()
+            await agent.initialize()
+            agent._is_initialized = True
+            self._created += 1
+            return agent
+        except BaseException:
+            self._get_semaphore().release()
+            raise
+
+    def release(self, agent: BaseAgent) -> None:
+        """Reset an agent and return it to the pool."""
+        try:
+            agent.reset()
+            self._idle.append(agent)
+        finally:
+            self._get_semaphore().release()
+
+    @property
+    def size(self) -> int:
+        """Number of agents created by this pool."""
+        return self._created
 
 
 class AgentRegistry:
     """
     Registry for all specialized agents.
 
-    Provides discovery and instantiation of agents by name.
+    Provides discovery and instantiation of agents by name, and pooled
+    checkout of warm agent instances via ``acquire()``.
     """
 
     _agents: dict[str, Type[BaseAgent]] = {}
+    _pools: dict[str, AgentPool] = {}
 
     @classmethod
     def register(cls, name: str) -> callable:
@@ -27,6 +91,7 @@ class AgentRegistry:
 
         def decorator(agent_class: Type[BaseAgent]) -> Type[BaseAgent]:
             cls._agents[name] = agent_class
+            cls._pools.pop(name, None)
             return agent_class
 
         return decorator
@@ -44,6 +109,29 @@ class AgentRegistry:
             return agent_class(**kwargs)
         return None
 
+    @classmethod
+    @asynccontextmanager
+    async def acquire(cls, name: str) -> AsyncIterator[BaseAgent]:
+        """
+        Check out a pooled agent for the duration of one task.
+
+        Usage:
+            async with AgentRegistry.acquire("identity") as agent:
+                result = await agent.run(task)
+        """
+        pool = cls._pools.get(name)
+        if pool is None:
+            agent_class = cls.get(name)
+            if agent_class is None:
+                raise ValueError(f"Agent '{name}' not found in registry")
+            pool = cls._pools[name] = AgentPool(agent_class, settings.agent_pool_size)
+
+        agent = await pool.acquire()
+        try:
+            yield agent
+        finally:
+            pool.release(agent)
+
     @classmethod
     def list_agents(cls) -> list[str]:
         """List all registered agent names."""
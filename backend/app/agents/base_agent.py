@@ -1,3 +1,5 @@
+import asyncio
+import random
 from abc import ABC, abstractmethod
 from typing import Any
 
@@ -6,6 +8,15 @@ from langchain_core.language_models import BaseChatModel
 from pydantic import BaseModel, Field
 
 from app.agents.llm_factory import LLMFactory
+from app.agents.tool_cache import ToolCachePolicy, get_cache_policy, tool_result_cache
+from app.config import settings
+from app.core.circuit_breaker import get_circuit_breaker
+from app.core.deadline import remaining_time
+from app.core.exceptions import CircuitOpenError
+from app.core.idempotency import idempotency_key, is_side_effect_tool
+from app.core.rate_limiter import get_rate_limiter
+from app.core.tracing import start_span
+from app.orchestrator.instrumentation import record_agent_result
 
 logger = structlog.get_logger()
 
@@ -29,6 +40,8 @@ class AgentResult(BaseModel):
     confidence_score: float = 1.0
     tokens_used: int = 0
     tool_calls: list[str] = Field(default_factory=list)
+    attempts: int = 1
+    timeouts: int = 0
 
 
 class BaseAgent(ABC):
@@ -50,7 +63,7 @@ class BaseAgent(ABC):
         """Initialize the base agent."""
         self.name = name
         self.description = description
-        self.llm = llm or LLMFactory.create()
+        self.llm = llm or LLMFactory.get_shared()
         self.max_retries = max_retries
         self.timeout_seconds = timeout_seconds
         self.tools: list[Any] = []
@@ -104,6 +117,16 @@ class BaseAgent(ABC):
             confidence_score=0.0,
         )
 
+    def reset(self) -> None:
+        """
+        Clear per-task state before the agent goes back to the pool.
+
+        Pooled agents are reused across workflows, so anything a subclass
+        stores on ``self`` while executing a task must be cleared here.
+        Per-task data should normally live in ``AgentState`` instead.
+        """
+        pass
+
     async def cleanup(self) -> None:
         """
         Clean up resources after execution.
@@ -112,38 +135,168 @@ class BaseAgent(ABC):
         """
         pass
 
+    async def invoke_tool(
+        self, tool: Any, tool_input: dict[str, Any], integration: str | None = None
+    ) -> Any:
+        """
+        Invoke a tool through the rate limit and circuit breaker of the integration it calls.
+
+        Tools that call the same external service should share an
+        ``integration`` name so they share a rate limit and trip the same
+        breaker; it defaults to the tool name. Tools opted in with
+        ``@cached_tool`` are served from the tool result cache first, so cached
+        lookups never spend a rate-limit token or reach the breaker.
+
+        Tools marked with ``@side_effect_tool`` are passed an
+        ``idempotency_key`` derived from the workflow step and the arguments
+        (see ``app.core.idempotency``), so a repeated call, such as an agent
+        retry after a timeout, is deduplicated by the provider. Their
+        completed results are also recorded under that key for
+        ``TOOL_REPLAY_TTL`` seconds: when the step runs again, e.g. a
+        parallel branch re-run after its workflow was parked and resumed,
+        the recorded result is returned without calling the provider.
+
+        Raises:
+            CircuitOpenError: If the integration's breaker is open
+            RateLimitExceededError: If a rate-limit token would not be due in time
+        """
+        integration = integration or tool.name
+        key = idempotency_key(tool.name, tool_input) if is_side_effect_tool(tool.name) else None
+        if key is not None:
+            tool_input = {**tool_input, "idempotency_key": key}
+        breaker = get_circuit_breaker(integration)
+        limiter = get_rate_limiter(integration)
+
+        async def call() -> Any:
+            with start_span(f"tool {tool.name}", tool=tool.name, integration=integration):
+                if limiter is not None:
+                    await limiter.acquire()
+                return await breaker.call(tool.ainvoke, tool_input)
+
+        if key is not None:
+            return await tool_result_cache.get_or_call(
+                f"toolreplay:{key}", ToolCachePolicy(ttl=settings.tool_replay_ttl), call
+            )
+
+        policy = get_cache_policy(tool.name)
+        if policy is None:
+            return await call()
+
+        return await tool_result_cache.get_or_call(
+            policy.key(tool.name, tool_input), policy, call
+        )
+
+    def _attempt_timeout(self) -> float | None:
+        """Time allowed for the next attempt: the per-attempt timeout capped by the deadline."""
+        remaining = remaining_time()
+        if remaining is None:
+            return self.timeout_seconds
+        return min(self.timeout_seconds, remaining)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay before retrying after ``attempt``."""
+        ceiling = min(
+            settings.agent_retry_max_delay,
+            settings.agent_retry_base_delay * 2 ** (attempt - 1),
+        )
+        return random.uniform(0, ceiling)
+
+    def _can_retry(self, attempt: int, delay: float) -> bool:
+        """Check whether another attempt fits in the retry and time budget."""
+        if attempt >= self.max_retries:
+            return False
+        remaining = remaining_time()
+        return remaining is None or remaining - delay >= settings.agent_min_attempt_seconds
+
     async def run(self, task: dict[str, Any], state: AgentState | None = None) -> AgentResult:
         """
         Main entry point for running the agent.
 
         Handles initialization, execution, error handling, and cleanup.
-        """
-        if state is None:
-            state = AgentState()
+        Each attempt is bounded by ``timeout_seconds`` and by the remaining
+        workflow deadline (see ``app.core.deadline``). Exceptions and timeouts
+        are retried up to ``max_retries`` attempts with jittered exponential
+        backoff, as long as the remaining budget still fits another attempt.
+        Failed results returned by ``execute()`` are not retried. A timed-out
+        attempt may already have called its tools; side-effecting tools get
+        the same idempotency key on the retry, so those calls are not repeated.
 
-        if not self._is_initialized:
-            await self.initialize()
-            self._is_initialized = True
+        An open circuit breaker is never retried. With
+        ``CIRCUIT_BREAKER_PARK_WORKFLOWS`` the ``CircuitOpenError`` propagates
+        so the engine can park the workflow; otherwise the agent fails fast.
 
-        await logger.ainfo(
-            "agent_started",
-            agent=self.name,
-            task_type=task.get("type", "unknown"),
-        )
+        The whole run, retries included, is traced as one span.
+        """
+        with start_span(
+            f"agent {self.name}", agent=self.name, task_type=task.get("type", "unknown")
+        ) as span:
+            if state is None:
+                state = AgentState()
+
+            if not self._is_initialized:
+                await self.initialize()
+                self._is_initialized = True
 
-        try:
-            result = await self.execute(task, state)
             await logger.ainfo(
-                "agent_completed",
+                "agent_started",
                 agent=self.name,
-                success=result.success,
-                confidence=result.confidence_score,
+                task_type=task.get("type", "unknown"),
             )
-            return result
-        except Exception as e:
-            return await self.handle_error(e, state)
-        finally:
-            await self.cleanup()
+
+            attempt = 0
+            timeouts = 0
+            try:
+                while True:
+                    attempt += 1
+                    try:
+                        result = await asyncio.wait_for(
+                            self.execute(task, state), timeout=self._attempt_timeout()
+                        )
+                        break
+                    except CircuitOpenError as e:
+                        if settings.circuit_breaker_park_workflows:
+                            raise
+                        result = await self.handle_error(e, state)
+                        break
+                    except TimeoutError:
+                        timeouts += 1
+                        error: Exception = TimeoutError(
+                            f"{self.name} attempt {attempt} timed out"
+                        )
+                    except Exception as e:
+                        error = e
+
+                    delay = self._backoff_delay(attempt)
+                    if not self._can_retry(attempt, delay):
+                        result = await self.handle_error(error, state)
+                        break
+
+                    await logger.awarning(
+                        "agent_retrying",
+                        agent=self.name,
+                        attempt=attempt,
+                        delay=round(delay, 3),
+                        error=str(error),
+                    )
+                    await asyncio.sleep(delay)
+
+                result.attempts = attempt
+                result.timeouts = timeouts
+                record_agent_result(self, result)
+                span.set_attribute("success", result.success)
+                span.set_attribute("confidence", result.confidence_score)
+                span.set_attribute("attempts", attempt)
+                await logger.ainfo(
+                    "agent_completed",
+                    agent=self.name,
+                    success=result.success,
+                    confidence=result.confidence_score,
+                    attempts=attempt,
+                    timeouts=timeouts,
+                )
+                return result
+            finally:
+                await self.cleanup()
 
     def __repr__(self) -> str:
         """String representation of the agent."""
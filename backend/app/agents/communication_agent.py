@@ -6,12 +6,18 @@ from langchain_core.tools import tool
 
 from app.agents.agent_registry import AgentRegistry
 from app.agents.base_agent import AgentResult, AgentState, BaseAgent
+from app.core.idempotency import side_effect_tool
 
 
 # Mock Tools for Communication Agent
+@side_effect_tool
 @tool
 def send_email(
-    to_email: str, subject: str, template_id: str, variables: dict[str, Any]
+    to_email: str,
+    subject: str,
+    template_id: str,
+    variables: dict[str, Any],
+    idempotency_key: str | None = None,
 ) -> dict[str, Any]:
     """
     Send an email using a template.
@@ -21,6 +27,7 @@ def send_email(
         subject: Email subject
         template_id: Template identifier
         variables: Variables to inject into template
+        idempotency_key: Key the provider uses to deduplicate repeated requests
 
     Returns:
         Send status and message ID
@@ -31,12 +38,17 @@ def send_email(
         "message_id": f"msg_{hash(to_email + template_id)}",
         "recipient": to_email,
         "template": template_id,
+        "idempotency_key": idempotency_key,
     }
 
 
+@side_effect_tool
 @tool
 def send_slack_notification(
-    channel: str, message: str, mentions: list[str] | None = None
+    channel: str,
+    message: str,
+    mentions: list[str] | None = None,
+    idempotency_key: str | None = None,
 ) -> dict[str, Any]:
     """
     Send a notification to a Slack channel.
@@ -45,6 +57,7 @@ def send_slack_notification(
         channel: Channel name or ID
         message: Message content
         mentions: List of user IDs to mention
+        idempotency_key: Key the provider uses to deduplicate repeated requests
 
     Returns:
         Send status
@@ -55,6 +68,7 @@ def send_slack_notification(
         "channel": channel,
         "timestamp": "1234567890.123456",
         "mentions_count": len(mentions or []),
+        "idempotency_key": idempotency_key,
     }
 
 
@@ -96,24 +110,28 @@ class CommunicationAgent(BaseAgent):
 
         if notification_type in ["email", "all"]:
             tool_calls.append("send_email")
-            email_result = send_email.invoke(
+            email_result = await self.invoke_tool(
+                send_email,
                 {
                     "to_email": recipient,
                     "subject": task.get("subject", "Notification"),
                     "template_id": task.get("template", "default_template"),
                     "variables": task.get("variables", {}),
-                }
+                },
+                integration="sendgrid",
             )
             results["email"] = email_result
 
         if notification_type in ["slack", "all"]:
             tool_calls.append("send_slack_notification")
-            slack_result = send_slack_notification.invoke(
+            slack_result = await self.invoke_tool(
+                send_slack_notification,
                 {
                     "channel": task.get("channel", "#general"),
                     "message": task.get("message", "Update available"),
                     "mentions": task.get("mentions", []),
-                }
+                },
+                integration="slack",
             )
             results["slack"] = slack_result
 
@@ -6,12 +6,16 @@ from langchain_core.tools import tool
 
 from app.agents.agent_registry import AgentRegistry
 from app.agents.base_agent import AgentResult, AgentState, BaseAgent
+from app.core.idempotency import side_effect_tool
 
 
 # Mock Tools for CRM Agent
+@side_effect_tool
 @tool
 def create_crm_account(
-    customer_data: dict[str, Any], crm_platform: str = "salesforce"
+    customer_data: dict[str, Any],
+    crm_platform: str = "salesforce",
+    idempotency_key: str | None = None,
 ) -> dict[str, Any]:
     """
     Create a new account in the CRM system.
@@ -19,6 +23,7 @@ def create_crm_account(
     Args:
         customer_data: Customer information (name, company, email, etc.)
         crm_platform: Target CRM platform (default: salesforce)
+        idempotency_key: Key the provider uses to deduplicate repeated requests
 
     Returns:
         Result with new CRM ID
@@ -32,6 +37,7 @@ def create_crm_account(
         "crm_id": crm_id,
         "platform": crm_platform,
         "record_url": f"https://{crm_platform}.com/lightning/r/Account/{crm_id}/view",
+        "idempotency_key": idempotency_key,
     }
 
 
@@ -97,19 +103,24 @@ class CRMAgent(BaseAgent):
 
         if action == "create_account":
             tool_calls.append("create_crm_account")
-            result = create_crm_account.invoke(
-                {"customer_data": customer_data, "crm_platform": task.get("platform", "salesforce")}
+            platform = task.get("platform", "salesforce")
+            result = await self.invoke_tool(
+                create_crm_account,
+                {"customer_data": customer_data, "crm_platform": platform},
+                integration=platform,
             )
             results["account"] = result
 
         elif action == "update_stage":
             tool_calls.append("update_opportunity_stage")
-            result = update_opportunity_stage.invoke(
+            result = await self.invoke_tool(
+                update_opportunity_stage,
                 {
                     "crm_id": task.get("crm_id", "00000"),
                     "stage": task.get("stage", "Onboarding"),
                     "probability": 100,
-                }
+                },
+                integration="salesforce",
             )
             results["opportunity"] = result
 
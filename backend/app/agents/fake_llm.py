@@ -0,0 +1,208 @@
+"""Offline chat model with scripted responses and simulated latency, for benchmarks."""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# Rough characters per token, used to estimate token counts
+CHARS_PER_TOKEN = 4
+
+_FILLER_WORDS = (
+    "customer onboarding verification complete account review approved "
+    "document identity provisioning workflow status summary next step"
+).split()
+
+
+def load_script(path: str) -> list[dict[str, Any]]:
+    """
+    Load scripted responses from a JSON file.
+
+    The file holds a list whose items are either a string, used as the reply
+    text, or an object with ``content`` and optional ``tool_calls``
+    (``[{"name": ..., "args": {...}}]``).
+    """
+    with open(path, encoding="utf-8") as script:
+        items = json.load(script)
+    return [{"content": item} if isinstance(item, str) else item for item in items]
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model that answers locally without any network access.
+
+    The reply, its latency and its token counts are derived from a hash of
+    the prompt and ``seed``, so the same prompt always gets the same answer
+    and the same simulated timing, regardless of call order or concurrency.
+    Replies come from ``responses`` when it is set, otherwise they are
+    ``completion_tokens`` filler tokens.
+
+    Latency is a time to first token drawn from a log-normal distribution
+    with mean ``latency`` and standard deviation ``latency_jitter``, followed
+    by one token every ``1 / tokens_per_second`` seconds. Streaming yields
+    the reply text word by word on the same schedule; scripted tool calls
+    are only returned by non-streaming calls.
+    """
+
+    model: str = "fake"
+    responses: list[dict[str, Any]] = []
+    latency: float = 0.5
+    latency_jitter: float = 0.2
+    tokens_per_second: float = 80.0
+    completion_tokens: int = 200
+    seed: int = 0
+    streaming: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"model": self.model, "seed": self.seed}
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> Any:
+        """Accept tools like real providers; scripted tool calls come from ``responses``."""
+        return self.bind(tools=list(tools), **kwargs)
+
+    def _rng(self, messages: list[BaseMessage]) -> random.Random:
+        """Random generator seeded by the prompt, for per-prompt determinism."""
+        prompt = "\n".join(f"{m.type}:{m.content}" for m in messages)
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def _reply(self, rng: random.Random) -> tuple[str, list[dict[str, Any]]]:
+        """Pick the reply text and tool calls."""
+        if self.responses:
+            response = self.responses[rng.randrange(len(self.responses))]
+            return response.get("content", ""), response.get("tool_calls", [])
+        words = [rng.choice(_FILLER_WORDS) for _ in range(self.completion_tokens)]
+        return " ".join(words), []
+
+    def _first_token_delay(self, rng: random.Random) -> float:
+        """Sample the time to first token from a log-normal distribution."""
+        if self.latency <= 0:
+            return 0.0
+        if self.latency_jitter <= 0:
+            return self.latency
+        # Log-normal parameters giving the configured mean and standard deviation
+        sigma_squared = math.log(1 + (self.latency_jitter / self.latency) ** 2)
+        mu = math.log(self.latency) - sigma_squared / 2
+        return rng.lognormvariate(mu, math.sqrt(sigma_squared))
+
+    def _token_delay(self) -> float:
+        """Seconds between generated tokens."""
+        return 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _result(
+        self, messages: list[BaseMessage], content: str, tool_calls: list[dict[str, Any]]
+    ) -> ChatResult:
+        """Build the chat result with OpenAI-style token usage."""
+        prompt_tokens = sum(estimate_tokens(str(m.content)) for m in messages)
+        completion_tokens = estimate_tokens(content + json.dumps(tool_calls))
+        token_usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+        additional_kwargs: dict[str, Any] = {}
+        if tool_calls:
+            additional_kwargs["tool_calls"] = [
+                {
+                    "id": f"call_{i}",
+                    "type": "function",
+                    "function": {
+                        "name": call["name"],
+                        "arguments": json.dumps(call.get("args", {})),
+                    },
+                }
+                for i, call in enumerate(tool_calls)
+            ]
+
+        message = AIMessage(content=content, additional_kwargs=additional_kwargs)
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={"token_usage": token_usage, "model_name": self.model},
+        )
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        rng = self._rng(messages)
+        content, tool_calls = self._reply(rng)
+        time.sleep(self._first_token_delay(rng) + estimate_tokens(content) * self._token_delay())
+        return self._result(messages, content, tool_calls)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        rng = self._rng(messages)
+        content, tool_calls = self._reply(rng)
+        await asyncio.sleep(
+            self._first_token_delay(rng) + estimate_tokens(content) * self._token_delay()
+        )
+        return self._result(messages, content, tool_calls)
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        rng = self._rng(messages)
+        content, _ = self._reply(rng)
+        time.sleep(self._first_token_delay(rng))
+        for i, word in enumerate(content.split(" ")):
+            token = word if i == 0 else f" {word}"
+            if i:
+                time.sleep(self._token_delay())
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        rng = self._rng(messages)
+        content, _ = self._reply(rng)
+        await asyncio.sleep(self._first_token_delay(rng))
+        for i, word in enumerate(content.split(" ")):
+            token = word if i == 0 else f" {word}"
+            if i:
+                await asyncio.sleep(self._token_delay())
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
@@ -6,9 +6,16 @@ from langchain_core.tools import tool
 
 from app.agents.agent_registry import AgentRegistry
 from app.agents.base_agent import AgentResult, AgentState, BaseAgent
+from app.agents.tool_cache import cached_tool
 
 
 # Mock Tools for Identity Verification
+# 6 hours: watchlist screening results age quickly. Failed checks are never reused.
+@cached_tool(
+    ttl=21600,
+    cache_if=lambda result: result.get("status") == "verified",
+    case_insensitive=["name"],
+)
 @tool
 def verify_kyc(name: str, dob: str, document_id: str) -> dict[str, Any]:
     """
@@ -35,6 +42,12 @@ def verify_kyc(name: str, dob: str, document_id: str) -> dict[str, Any]:
     }
 
 
+# 1 day: registry data rarely changes. Failed checks are never reused.
+@cached_tool(
+    ttl=86400,
+    cache_if=lambda result: result.get("status") == "verified",
+    case_insensitive=["company_name"],
+)
 @tool
 def verify_kyb(company_name: str, registration_number: str) -> dict[str, Any]:
     """
@@ -104,22 +117,26 @@ class IdentityAgent(BaseAgent):
             # ensuring parameters are extracted from the prompt/task.
             # For this mock/MVP, we're calling it directly to simulate the outcome.
 
-            check_result = verify_kyc.invoke(
+            check_result = await self.invoke_tool(
+                verify_kyc,
                 {
                     "name": customer_data.get("name", "Unknown"),
                     "dob": customer_data.get("dob", "1990-01-01"),
                     "document_id": customer_data.get("document_id", "123456789"),
-                }
+                },
+                integration="kyc_provider",
             )
             results["kyc"] = check_result
 
         elif customer_type == "business":
             tool_calls.append("verify_kyb")
-            check_result = verify_kyb.invoke(
+            check_result = await self.invoke_tool(
+                verify_kyb,
                 {
                     "company_name": customer_data.get("company_name", "Unknown Inc"),
                     "registration_number": customer_data.get("registration_number", "000000"),
-                }
+                },
+                integration="kyc_provider",
             )
             results["kyb"] = check_result
 
@@ -6,11 +6,18 @@ from langchain_core.tools import tool
 
 from app.agents.agent_registry import AgentRegistry
 from app.agents.base_agent import AgentResult, AgentState, BaseAgent
+from app.core.idempotency import side_effect_tool
 
 
 # Mock Tools for IT Agent
+@side_effect_tool
 @tool
-def provision_account(employee_id: str, email: str, services: list[str]) -> dict[str, Any]:
+def provision_account(
+    employee_id: str,
+    email: str,
+    services: list[str],
+    idempotency_key: str | None = None,
+) -> dict[str, Any]:
     """
     Provision IT accounts for a new user.
 
@@ -18,6 +25,7 @@ def provision_account(employee_id: str, email: str, services: list[str]) -> dict
         employee_id: Internal employee/customer ID
         email: Work email to create
         services: List of services to provision (e.g., "slack", "jira", "aws")
+        idempotency_key: Key the provider uses to deduplicate repeated requests
 
     Returns:
         Provisioning status and credentials
@@ -30,6 +38,7 @@ def provision_account(employee_id: str, email: str, services: list[str]) -> dict
         "services_provisioned": services,
         "sso_link": f"https://sso.example.com/setup/{employee_id}",
         "temporary_password": f"Welcome{employee_id[-4:]}!",
+        "idempotency_key": idempotency_key,
     }
 
 
@@ -98,23 +107,27 @@ class ITAgent(BaseAgent):
         if customer_data.get("customer_type") == "enterprise":
             services.extend(["jira", "confluence"])
 
-        provision_result = provision_account.invoke(
+        provision_result = await self.invoke_tool(
+            provision_account,
             {
                 "employee_id": customer_id,
                 "email": customer_data.get("email", f"user_{customer_id}@example.com"),
                 "services": services,
-            }
+            },
+            integration="it_provisioning",
         )
         results["provisioning"] = provision_result
 
         # Assign permissions
         tool_calls.append("assign_permissions")
-        perm_result = assign_permissions.invoke(
+        perm_result = await self.invoke_tool(
+            assign_permissions,
             {
                 "email": provision_result["email"],
                 "role": "customer_admin",
                 "groups": ["customer_portal_users"],
-            }
+            },
+            integration="it_provisioning",
         )
         results["permissions"] = perm_result
 
@@ -6,15 +6,18 @@ from langchain_core.tools import tool
 
 from app.agents.agent_registry import AgentRegistry
 from app.agents.base_agent import AgentResult, AgentState, BaseAgent
+from app.core.idempotency import side_effect_tool
 
 
 # Mock Tools for Legal Agent
+@side_effect_tool
 @tool
 def generate_contract(
     template_type: str,
     customer_name: str,
     address: str,
     contract_terms: dict[str, Any] | None = None,
+    idempotency_key: str | None = None,
 ) -> dict[str, Any]:
     """
     Generate a legal contract based on a template.
@@ -24,6 +27,7 @@ def generate_contract(
         customer_name: Name of the customer
         address: Customer address
         contract_terms: Specific terms to include
+        idempotency_key: Key the provider uses to deduplicate repeated requests
 
     Returns:
         Result with generated document ID and URL
@@ -35,12 +39,19 @@ def generate_contract(
         "document_id": doc_id,
         "document_url": f"https://mock-storage.com/{doc_id}.pdf",
         "template_used": template_type,
+        "idempotency_key": idempotency_key,
         "metadata": {"page_count": 5, "generated_at": "2024-02-01T12:00:00Z"},
     }
 
 
+@side_effect_tool
 @tool
-def trigger_esign(document_id: str, signer_email: str, signer_name: str) -> dict[str, Any]:
+def trigger_esign(
+    document_id: str,
+    signer_email: str,
+    signer_name: str,
+    idempotency_key: str | None = None,
+) -> dict[str, Any]:
     """
     Send a document for electronic signature.
 
@@ -48,6 +59,7 @@ def trigger_esign(document_id: str, signer_email: str, signer_name: str) -> dict
         document_id: ID of the document to sign
         signer_email: Email address of the signer
         signer_name: Name of the signer
+        idempotency_key: Key the provider uses to deduplicate repeated requests
 
     Returns:
         Envelope ID and status
@@ -58,6 +70,7 @@ def trigger_esign(document_id: str, signer_email: str, signer_name: str) -> dict
         "envelope_id": f"env_{document_id}",
         "signer": signer_email,
         "provider": "docusign_mock",
+        "idempotency_key": idempotency_key,
     }
 
 
@@ -105,13 +118,15 @@ class LegalAgent(BaseAgent):
             if customer_data.get("customer_type") == "enterprise":
                 contract_type = "master_service_agreement"
 
-            contract_result = generate_contract.invoke(
+            contract_result = await self.invoke_tool(
+                generate_contract,
                 {
                     "template_type": contract_type,
                     "customer_name": customer_data.get("name", "Unknown"),
                     "address": customer_data.get("address", "Unknown Address"),
                     "contract_terms": task.get("terms", {}),
-                }
+                },
+                integration="docusign",
             )
             results["contract"] = contract_result
 
@@ -120,12 +135,14 @@ class LegalAgent(BaseAgent):
                 doc_id = contract_result["document_id"]
                 tool_calls.append("trigger_esign")
 
-                esign_result = trigger_esign.invoke(
+                esign_result = await self.invoke_tool(
+                    trigger_esign,
                     {
                         "document_id": doc_id,
                         "signer_email": customer_data.get("email", ""),
                         "signer_name": customer_data.get("name", ""),
-                    }
+                    },
+                    integration="docusign",
                 )
                 results["esign"] = esign_result
 
@@ -1,13 +1,13 @@
 """LLM Factory for creating configured ChatModel instances."""
 
-from typing import Literal
+from typing import Any, Literal
 
-from langchain_anthropic import ChatAnthropic
 from langchain_core.language_models import BaseChatModel
-from langchain_openai import ChatOpenAI
 
 from app.config import settings
 
+LLMProvider = Literal["openai", "anthropic", "azure", "fake"]
+
 
 class LLMFactory:
     """
@@ -17,9 +17,11 @@ class LLMFactory:
     consistency across all agents.
     """
 
+    _shared: dict[tuple[str, str, float, bool], BaseChatModel] = {}
+
     @staticmethod
     def create(
-        provider: Literal["openai", "anthropic", "azure"] | None = None,
+        provider: LLMProvider | None = None,
         model: str | None = None,
         temperature: float | None = None,
         streaming: bool = True,
@@ -35,12 +37,17 @@ class LLMFactory:
 
         Returns:
             Configured BaseChatModel instance
+
+        Provider SDKs are imported on first use, so the "fake" provider works
+        without them or any network access.
         """
         provider = provider or settings.llm_provider
         model = model or settings.llm_model
         temperature = temperature if temperature is not None else settings.llm_temperature
 
         if provider == "anthropic":
+            from langchain_anthropic import ChatAnthropic
+
             return ChatAnthropic(
                 model=model,
                 temperature=temperature,
@@ -49,6 +56,8 @@ class LLMFactory:
                 max_retries=3,
             )
         elif provider == "openai":
+            from langchain_openai import ChatOpenAI
+
             return ChatOpenAI(
                 model=model,
                 temperature=temperature,
@@ -56,9 +65,56 @@ class LLMFactory:
                 streaming=streaming,
                 max_retries=3,
             )
+        elif provider == "fake":
+            from app.agents.fake_llm import FakeChatModel, load_script
+
+            return FakeChatModel(
+                model=model,
+                responses=(
+                    load_script(settings.fake_llm_responses_file)
+                    if settings.fake_llm_responses_file
+                    else []
+                ),
+                latency=settings.fake_llm_latency,
+                latency_jitter=settings.fake_llm_latency_jitter,
+                tokens_per_second=settings.fake_llm_tokens_per_second,
+                completion_tokens=settings.fake_llm_completion_tokens,
+                seed=settings.fake_llm_seed,
+                streaming=streaming,
+            )
         else:
             raise ValueError(f"Unsupported LLM provider: {provider}")
 
+    @classmethod
+    def get_shared(
+        cls,
+        provider: LLMProvider | None = None,
+        model: str | None = None,
+        temperature: float | None = None,
+        streaming: bool = True,
+    ) -> BaseChatModel:
+        """
+        Get a process-wide chat model for the given configuration.
+
+        Clients are created once per (provider, model, temperature, streaming)
+        and reused, so agents share their HTTP connection pools instead of
+        opening new ones for every workflow step. Chat models are stateless
+        between calls, which makes sharing them safe.
+        """
+        key = (
+            provider or settings.llm_provider,
+            model or settings.llm_model,
+            temperature if temperature is not None else settings.llm_temperature,
+            streaming,
+        )
+        llm = cls._shared.get(key)
+        if llm is None:
+            llm = cls._shared[key] = cls.create(*key)
+        return llm
+
 
-# Default LLM instance for convenience
-default_llm = LLMFactory.create()
+def __getattr__(name: str) -> Any:
+    """Create the default LLM on first access instead of at import time."""
+    if name == "default_llm":
+        return LLMFactory.get_shared()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
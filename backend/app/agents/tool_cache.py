@@ -0,0 +1,202 @@
+"""Memoization of idempotent agent tool results."""
+
+import asyncio
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+from langchain_core.tools import BaseTool
+
+from app.config import settings
+from app.core.events import get_or_create_redis
+
+logger = structlog.get_logger()
+
+_MISS = object()
+
+
+def normalize_arguments(
+    value: Any, case_insensitive: frozenset[str] = frozenset(), *, fold: bool = False
+) -> Any:
+    """
+    Normalize tool arguments so equivalent inputs share a cache key.
+
+    Only string values of the fields named in ``case_insensitive`` (at any
+    depth) are trimmed, case-folded and have inner whitespace collapsed;
+    every other value is kept as is, since case and spacing can matter for
+    IDs, dates and free text. Dicts and lists are normalized recursively.
+    """
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold() if fold else value
+    if isinstance(value, dict):
+        return {
+            str(k): normalize_arguments(v, case_insensitive, fold=k in case_insensitive)
+            for k, v in value.items()
+        }
+    if isinstance(value, list | tuple):
+        return [normalize_arguments(v, case_insensitive, fold=fold) for v in value]
+    return value
+
+
+@dataclass(frozen=True)
+class ToolCachePolicy:
+    """How long results of a tool are cached, which results qualify and how keys are built."""
+
+    ttl: int
+    cache_if: Callable[[Any], bool] | None = None
+    case_insensitive: frozenset[str] = frozenset()
+
+    def key(self, tool_name: str, tool_input: dict[str, Any]) -> str:
+        """Build the cache key for a call from its normalized arguments."""
+        normalized = json.dumps(
+            normalize_arguments(tool_input, self.case_insensitive), sort_keys=True, default=str
+        )
+        digest = hashlib.sha256(normalized.encode()).hexdigest()
+        return f"toolcache:{tool_name}:{digest}"
+
+
+# Cache policies of opted-in tools, keyed by tool name
+_policies: dict[str, ToolCachePolicy] = {}
+
+
+def cached_tool(
+    ttl: int,
+    cache_if: Callable[[Any], bool] | None = None,
+    case_insensitive: Iterable[str] = (),
+) -> Callable[[BaseTool], BaseTool]:
+    """
+    Opt a LangChain tool into result memoization.
+
+    Only use this for idempotent lookups whose result depends on the
+    arguments alone. Calls made through ``BaseAgent.invoke_tool`` are then
+    served from the cache for ``ttl`` seconds. ``cache_if`` can reject
+    results that should not be reused. Arguments named in
+    ``case_insensitive`` are compared ignoring case and spacing when
+    building the cache key.
+
+    Usage:
+        @cached_tool(ttl=86400, case_insensitive=["company_name"])
+        @tool
+        def verify_kyb(company_name: str, registration_number: str) -> dict:
+            ...
+    """
+
+    def decorator(tool: BaseTool) -> BaseTool:
+        _policies[tool.name] = ToolCachePolicy(
+            ttl=ttl, cache_if=cache_if, case_insensitive=frozenset(case_insensitive)
+        )
+        return tool
+
+    return decorator
+
+
+def get_cache_policy(tool_name: str) -> ToolCachePolicy | None:
+    """Get the cache policy of a tool, or None if it is not memoized."""
+    return _policies.get(tool_name)
+
+
+class ToolResultCache:
+    """
+    Two-level cache for tool results with single-flight loading.
+
+    Lookups check a bounded in-process LRU first, then Redis, which is shared
+    by all workers. Concurrent identical calls in this process wait for the
+    first one instead of calling the provider again. Redis errors are logged
+    and the cache falls back to calling the tool.
+
+    Cached values are stored as they come back from JSON, so a result looks
+    the same (e.g. lists rather than tuples, dates as strings) whether it
+    was just fetched, served from the LRU or read from Redis.
+    """
+
+    def __init__(self, max_entries: int | None = None, local_ttl: int | None = None) -> None:
+        """Initialize an empty cache."""
+        self.max_entries = max_entries or settings.tool_cache_max_entries
+        self.local_ttl = local_ttl or settings.tool_cache_local_ttl
+        self._local: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def _get_local(self, key: str) -> Any:
+        entry = self._local.get(key)
+        if entry is None:
+            return _MISS
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._local[key]
+            return _MISS
+        self._local.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: Any, ttl: int) -> None:
+        self._local[key] = (time.monotonic() + min(ttl, self.local_ttl), value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def _get_remote(self, key: str) -> Any:
+        try:
+            cached = await get_or_create_redis().get(key)
+        except Exception as e:
+            await logger.awarning("tool_cache_read_failed", key=key, error=str(e))
+            return _MISS
+        return _MISS if cached is None else json.loads(cached)
+
+    async def _set_remote(self, key: str, value: Any, ttl: int) -> None:
+        try:
+            await get_or_create_redis().set(key, json.dumps(value, default=str), ex=ttl)
+        except Exception as e:
+            await logger.awarning("tool_cache_write_failed", key=key, error=str(e))
+
+    async def get_or_call(
+        self,
+        key: str,
+        policy: ToolCachePolicy,
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return the cached result for ``key``, calling the tool once on a miss."""
+        value = self._get_local(key)
+        if value is not _MISS:
+            return copy.deepcopy(value)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return copy.deepcopy(await asyncio.shield(inflight))
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._get_remote(key)
+            if value is _MISS:
+                value = await call()
+                if policy.cache_if is None or policy.cache_if(value):
+                    value = json.loads(json.dumps(value, default=str))
+                    await self._set_remote(key, value, policy.ttl)
+                    self._set_local(key, value, policy.ttl)
+            else:
+                self._set_local(key, value, policy.ttl)
+            future.set_result(value)
+            return copy.deepcopy(value)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved in case there are none
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def clear(self) -> None:
+        """Drop every entry of the in-process LRU."""
+        self._local.clear()
+
+
+# Process-wide tool result cache
+tool_result_cache = ToolResultCache()
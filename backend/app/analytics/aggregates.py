@@ -0,0 +1,127 @@
+"""Single-pass aggregate queries over onboarding workflows."""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import extract, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.database.customer import Customer
+from app.models.database.onboarding_workflow import OnboardingWorkflow, WorkflowStatus
+
+
+@dataclass(frozen=True)
+class WorkflowAggregates:
+    """Workflow counts and derived rates computed in one query."""
+
+    total: int = 0
+    pending: int = 0
+    in_progress: int = 0
+    awaiting_input: int = 0
+    awaiting_approval: int = 0
+    approved: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    completed_today: int = 0
+    avg_completion_minutes: float = 0.0
+    customers_created: int | None = None
+
+    @property
+    def active(self) -> int:
+        """Workflows still being processed (not waiting on a human)."""
+        return self.pending + self.in_progress + self.awaiting_input
+
+    @property
+    def success_rate(self) -> float:
+        """Completed workflows as a percentage of all workflows."""
+        return self.completed / self.total * 100 if self.total > 0 else 0.0
+
+    @property
+    def failure_rate(self) -> float:
+        """Failed workflows as a percentage of all workflows."""
+        return self.failed / self.total * 100 if self.total > 0 else 0.0
+
+    @property
+    def finished_success_rate(self) -> float:
+        """Completed workflows as a percentage of completed plus failed."""
+        finished = self.completed + self.failed
+        return self.completed / finished * 100 if finished > 0 else 100.0
+
+
+def _count_status(status: WorkflowStatus):
+    return func.count().filter(OnboardingWorkflow.status == status)
+
+
+async def get_workflow_aggregates(
+    session: AsyncSession,
+    since: datetime | None = None,
+    today_start: datetime | None = None,
+    include_customers: bool = False,
+) -> WorkflowAggregates:
+    """
+    Compute every workflow dashboard metric in a single round trip.
+
+    All status counts use ``COUNT(*) FILTER (WHERE ...)`` over one scan of
+    ``onboarding_workflows``. The customer count, when requested, is added as
+    a scalar subquery of the same statement.
+
+    Args:
+        session: Database session
+        since: Only include workflows (and customers) created at or after this time
+        today_start: Start of the "completed today" window (omit to skip the metric)
+        include_customers: Also count customers created since ``since``
+    """
+    completion_seconds = extract(
+        "epoch", OnboardingWorkflow.completed_at - OnboardingWorkflow.created_at
+    )
+    columns = [
+        func.count().label("total"),
+        _count_status(WorkflowStatus.PENDING).label("pending"),
+        _count_status(WorkflowStatus.IN_PROGRESS).label("in_progress"),
+        _count_status(WorkflowStatus.AWAITING_INPUT).label("awaiting_input"),
+        _count_status(WorkflowStatus.AWAITING_APPROVAL).label("awaiting_approval"),
+        _count_status(WorkflowStatus.APPROVED).label("approved"),
+        _count_status(WorkflowStatus.COMPLETED).label("completed"),
+        _count_status(WorkflowStatus.FAILED).label("failed"),
+        _count_status(WorkflowStatus.CANCELLED).label("cancelled"),
+        func.avg(completion_seconds)
+        .filter(OnboardingWorkflow.status == WorkflowStatus.COMPLETED)
+        .label("avg_completion_seconds"),
+    ]
+    if today_start is not None:
+        columns.append(
+            func.count()
+            .filter(
+                OnboardingWorkflow.status == WorkflowStatus.COMPLETED,
+                OnboardingWorkflow.completed_at >= today_start,
+            )
+            .label("completed_today")
+        )
+    if include_customers:
+        customers = select(func.count(Customer.id))
+        if since is not None:
+            customers = customers.where(Customer.created_at >= since)
+        columns.append(customers.scalar_subquery().label("customers_created"))
+
+    query = select(*columns).select_from(OnboardingWorkflow)
+    if since is not None:
+        query = query.where(OnboardingWorkflow.created_at >= since)
+
+    row = (await session.execute(query)).one()._mapping
+    avg_seconds = row["avg_completion_seconds"]
+
+    return WorkflowAggregates(
+        total=row["total"],
+        pending=row["pending"],
+        in_progress=row["in_progress"],
+        awaiting_input=row["awaiting_input"],
+        awaiting_approval=row["awaiting_approval"],
+        approved=row["approved"],
+        completed=row["completed"],
+        failed=row["failed"],
+        cancelled=row["cancelled"],
+        completed_today=row.get("completed_today", 0),
+        avg_completion_minutes=float(avg_seconds) / 60 if avg_seconds is not None else 0.0,
+        customers_created=row.get("customers_created"),
+    )
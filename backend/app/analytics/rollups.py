@@ -0,0 +1,246 @@
+"""Incrementally maintained hourly rollups for workflow and step analytics."""
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.database.analytics_rollup import StepRollup, WorkflowRollup
+from app.models.database.onboarding_workflow import OnboardingWorkflow, WorkflowStatus
+from app.models.database.workflow_step import WorkflowStep
+
+
+def hour_bucket(moment: datetime | None) -> datetime:
+    """Truncate a timestamp to the start of its UTC hour."""
+    moment = moment or datetime.now(timezone.utc)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _upsert(model, key_columns: list[str], rows: list[dict]):
+    """
+    Build an INSERT ... ON CONFLICT statement that adds to existing counters.
+
+    Rows are sorted by their conflict key, so concurrent statements touching
+    overlapping rollup rows lock them in the same order and cannot deadlock.
+    """
+    rows = sorted(rows, key=lambda row: tuple(row[column] for column in key_columns))
+    statement = insert(model).values(rows)
+    counters = [
+        column.name
+        for column in model.__table__.columns
+        if column.name.endswith(("_count", "_sum"))
+    ]
+    return statement.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={
+            **{name: getattr(model, name) + statement.excluded[name] for name in counters},
+            "updated_at": func.now(),
+        },
+    )
+
+
+async def record_workflow_transition(
+    session: AsyncSession,
+    workflow: OnboardingWorkflow,
+    old_status: WorkflowStatus | None,
+    new_status: WorkflowStatus,
+) -> None:
+    """
+    Move a workflow's count from its old status to its new one.
+
+    Pass ``old_status=None`` when the workflow is created; status changes
+    go through ``set_workflow_status``, which reads the old status from the
+    row it updates. Completion time is added to the duration sums when the
+    new status is COMPLETED. The statement runs in the caller's transaction,
+    so the rollup commits atomically with the status change.
+    """
+    if old_status == new_status:
+        return
+
+    bucket = hour_bucket(workflow.created_at)
+    rows = [
+        {
+            "bucket": bucket,
+            "workflow_type": workflow.workflow_type,
+            "status": new_status,
+            "workflow_count": 1,
+            "duration_seconds_sum": 0.0,
+            "duration_count": 0,
+        }
+    ]
+    if new_status == WorkflowStatus.COMPLETED and workflow.completed_at and workflow.created_at:
+        rows[0]["duration_seconds_sum"] = (
+            workflow.completed_at - workflow.created_at
+        ).total_seconds()
+        rows[0]["duration_count"] = 1
+    if old_status is not None:
+        rows.append(
+            {
+                "bucket": bucket,
+                "workflow_type": workflow.workflow_type,
+                "status": old_status,
+                "workflow_count": -1,
+                "duration_seconds_sum": 0.0,
+                "duration_count": 0,
+            }
+        )
+
+    await session.execute(_upsert(WorkflowRollup, ["bucket", "workflow_type", "status"], rows))
+
+
+async def set_workflow_status(
+    session: AsyncSession,
+    workflow: OnboardingWorkflow,
+    new_status: WorkflowStatus,
+) -> WorkflowStatus | None:
+    """
+    Update a workflow's status and move its rollup count, returning the old status.
+
+    The old status is read by the UPDATE itself, from a locked subselect,
+    rather than taken from the loaded instance. Two transactions changing
+    the same workflow are serialized on the row, and each moves the count
+    from the status it actually replaced, so a stale instance can never
+    decrement the wrong status. ``workflow.status`` is updated to match.
+    Returns None if the workflow row no longer exists.
+    """
+    table = OnboardingWorkflow.__table__
+    previous = (
+        select(table.c.id, table.c.status)
+        .where(table.c.id == workflow.id)
+        .with_for_update()
+        .subquery("previous")
+    )
+    old_status = await session.scalar(
+        update(table)
+        .where(table.c.id == previous.c.id)
+        .values(status=new_status, updated_at=func.now())
+        .returning(previous.c.status)
+    )
+    if old_status is None:
+        return None
+
+    set_committed_value(workflow, "status", new_status)
+    await record_workflow_transition(session, workflow, old_status, new_status)
+    return old_status
+
+
+async def record_steps(session: AsyncSession, steps: Iterable[WorkflowStep]) -> None:
+    """
+    Add a batch of finished steps to the step rollups in one statement.
+
+    Steps are pre-aggregated by (bucket, step_name, status), because one
+    upsert statement cannot touch the same row twice.
+    """
+    totals: dict[tuple, dict] = defaultdict(
+        lambda: {"execution_count": 0, "duration_seconds_sum": 0.0, "duration_count": 0}
+    )
+    for step in steps:
+        bucket = hour_bucket(step.completed_at or step.created_at)
+        counters = totals[(bucket, step.step_name, step.status)]
+        counters["execution_count"] += 1
+        if step.duration_seconds is not None:
+            counters["duration_seconds_sum"] += step.duration_seconds
+            counters["duration_count"] += 1
+
+    if not totals:
+        return
+
+    rows = [
+        {"bucket": bucket, "step_name": step_name, "status": status, **counters}
+        for (bucket, step_name, status), counters in totals.items()
+    ]
+    await session.execute(_upsert(StepRollup, ["bucket", "step_name", "status"], rows))
+
+
+async def record_created_workflows(session: AsyncSession, rows: Iterable[Mapping]) -> None:
+    """
+    Count a batch of newly created workflows in one statement.
+
+    ``rows`` are workflow rows as passed to a bulk insert, with at least
+    ``created_at``, ``workflow_type`` and ``status``. This is the bulk
+    equivalent of calling ``record_workflow_transition(..., old_status=None, ...)``
+    for each workflow.
+    """
+    totals: dict[tuple, int] = defaultdict(int)
+    for row in rows:
+        totals[(hour_bucket(row["created_at"]), row["workflow_type"], row["status"])] += 1
+
+    if not totals:
+        return
+
+    rollup_rows = [
+        {
+            "bucket": bucket,
+            "workflow_type": workflow_type,
+            "status": status,
+            "workflow_count": count,
+            "duration_seconds_sum": 0.0,
+            "duration_count": 0,
+        }
+        for (bucket, workflow_type, status), count in totals.items()
+    ]
+    await session.execute(
+        _upsert(WorkflowRollup, ["bucket", "workflow_type", "status"], rollup_rows)
+    )
+
+
+async def rebuild_rollups(session: AsyncSession) -> None:
+    """
+    Recompute both rollup tables from the source rows.
+
+    Incremental maintenance is the normal path; this is for data loaded behind
+    the application's back (bulk seeding, restores). Run it while nothing
+    else writes workflows, since concurrent updates would be counted twice.
+    """
+    await session.execute(delete(WorkflowRollup))
+    await session.execute(delete(StepRollup))
+    await session.execute(
+        text(
+            """
+            INSERT INTO workflow_rollups (
+                bucket, workflow_type, status, workflow_count,
+                duration_seconds_sum, duration_count, created_at, updated_at
+            )
+            SELECT
+                date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+                workflow_type,
+                status,
+                count(*),
+                coalesce(sum(extract(epoch FROM completed_at - created_at))
+                    FILTER (WHERE status = 'COMPLETED' AND completed_at IS NOT NULL), 0),
+                count(*) FILTER (WHERE status = 'COMPLETED' AND completed_at IS NOT NULL),
+                now(),
+                now()
+            FROM onboarding_workflows
+            GROUP BY 1, 2, 3
+            """
+        )
+    )
+    await session.execute(
+        text(
+            """
+            INSERT INTO step_rollups (
+                bucket, step_name, status, execution_count,
+                duration_seconds_sum, duration_count, created_at, updated_at
+            )
+            SELECT
+                date_trunc('hour', coalesce(completed_at, created_at) AT TIME ZONE 'UTC')
+                    AT TIME ZONE 'UTC',
+                step_name,
+                status,
+                count(*),
+                coalesce(sum(duration_seconds), 0),
+                count(duration_seconds),
+                now(),
+                now()
+            FROM workflow_steps
+            GROUP BY 1, 2, 3
+            """
+        )
+    )
@@ -1,21 +1,61 @@
 """Analytics endpoints for dashboard metrics and reporting."""
 
+import logging
+from datetime import datetime, timedelta, timezone
+
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, desc, select, and_
+from sqlalchemy import desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime, timedelta
-import logging
 
+from app.analytics.aggregates import get_workflow_aggregates
+from app.analytics.rollups import hour_bucket
+from app.core.cache import ANALYTICS_NAMESPACE, cached_response
+from app.core.rate_limiter import rate_limit_summary
+from app.core.scheduling import queue_wait_summary
 from app.database.session import get_db_session
-from app.models.database.onboarding_workflow import OnboardingWorkflow
-from app.models.database.workflow_step import WorkflowStep
+from app.models.database.analytics_rollup import StepRollup, WorkflowRollup
 from app.models.database.customer import Customer
+from app.models.database.onboarding_workflow import OnboardingWorkflow, WorkflowStatus
+from app.models.database.workflow_step import StepStatus
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+# date_trunc unit and bucket width for each trends granularity
+TREND_UNITS = {"hourly": "hour", "daily": "day", "weekly": "week"}
+TREND_STEPS = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+
+
+def _utc(moment: datetime) -> datetime:
+    """Normalize a timestamp to an aware UTC datetime."""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def _trend_buckets(start: datetime, end: datetime, granularity: str) -> list[datetime]:
+    """List every bucket start between two timestamps, matching Postgres date_trunc."""
+    current = hour_bucket(start)
+    if granularity != "hourly":
+        current = current.replace(hour=0)
+    if granularity == "weekly":
+        # date_trunc('week') starts weeks on Monday
+        current -= timedelta(days=current.weekday())
+
+    buckets = []
+    end = _utc(end)
+    while current <= end:
+        buckets.append(current)
+        current += TREND_STEPS[granularity]
+    return buckets
+
 
 @router.get("/summary")
+@cached_response(ANALYTICS_NAMESPACE, key_params=("days",))
 async def get_analytics_summary(
     session: AsyncSession = Depends(get_db_session),
     days: int = Query(30, ge=1, le=365)
@@ -23,76 +63,21 @@ async def get_analytics_summary(
     """Get comprehensive analytics summary for the last N days."""
     try:
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
-        total_result = await session.execute(
-            select(func.count(OnboardingWorkflow.id)).where(
-                OnboardingWorkflow.created_at >= cutoff_date
-            )
-        )
-        total_workflows = total_result.scalar() or 0
-        
-        completed_result = await session.execute(
-            select(func.count(OnboardingWorkflow.id)).where(
-                and_(
-                    OnboardingWorkflow.created_at >= cutoff_date,
-                    OnboardingWorkflow.status == "completed"
-                )
-            )
-        )
-        completed_workflows = completed_result.scalar() or 0
-        
-        failed_result = await session.execute(
-            select(func.count(OnboardingWorkflow.id)).where(
-                and_(
-                    OnboardingWorkflow.created_at >= cutoff_date,
-                    OnboardingWorkflow.status == "failed"
-                )
-            )
-        )
-        failed_workflows = failed_result.scalar() or 0
-        
-        in_progress_result = await session.execute(
-            select(func.count(OnboardingWorkflow.id)).where(
-                and_(
-                    OnboardingWorkflow.created_at >= cutoff_date,
-                    OnboardingWorkflow.status == "in_progress"
-                )
-            )
+        aggregates = await get_workflow_aggregates(
+            session, since=cutoff_date, include_customers=True
         )
-        in_progress_workflows = in_progress_result.scalar() or 0
-        
-        pending_result = await session.execute(
-            select(func.count(OnboardingWorkflow.id)).where(
-                and_(
-                    OnboardingWorkflow.created_at >= cutoff_date,
-                    OnboardingWorkflow.status == "awaiting_approval"
-                )
-            )
-        )
-        pending_workflows = pending_result.scalar() or 0
-        
-        success_rate = (
-            (completed_workflows / total_workflows * 100) if total_workflows > 0 else 0
-        )
-        
-        customer_result = await session.execute(
-            select(func.count(Customer.id)).where(
-                Customer.created_at >= cutoff_date
-            )
-        )
-        total_customers = customer_result.scalar() or 0
-        
+
         return {
             "period_days": days,
-            "total_workflows": total_workflows,
-            "completed_workflows": completed_workflows,
-            "failed_workflows": failed_workflows,
-            "in_progress_workflows": in_progress_workflows,
-            "pending_approval_workflows": pending_workflows,
-            "success_rate": round(success_rate, 2),
-            "failure_rate": round((failed_workflows / total_workflows * 100) if total_workflows > 0 else 0, 2),
-            "avg_completion_minutes": 0,
-            "total_customers_onboarded": total_customers,
+            "total_workflows": aggregates.total,
+            "completed_workflows": aggregates.completed,
+            "failed_workflows": aggregates.failed,
+            "in_progress_workflows": aggregates.in_progress,
+            "pending_approval_workflows": aggregates.awaiting_approval,
+            "success_rate": round(aggregates.success_rate, 2),
+            "failure_rate": round(aggregates.failure_rate, 2),
+            "avg_completion_minutes": round(aggregates.avg_completion_minutes, 2),
+            "total_customers_onboarded": aggregates.customers_created,
             "generated_at": datetime.utcnow().isoformat()
         }
     except Exception as e:
@@ -101,34 +86,60 @@ async def get_analytics_summary(
 
 
 @router.get("/trends")
+@cached_response(ANALYTICS_NAMESPACE, key_params=("days", "granularity"))
 async def get_analytics_trends(
     session: AsyncSession = Depends(get_db_session),
     days: int = Query(30, ge=1, le=365),
     granularity: str = Query("daily", regex="^(hourly|daily|weekly)$")
 ):
-    """Get trends data for visualization over time."""
+    """
+    Get trends data for visualization over time.
+
+    Buckets are truncated to the requested granularity server-side, per-status
+    counts come from conditional aggregation in the same query, and buckets
+    without workflows are filled with zeros.
+    """
     try:
         cutoff_date = datetime.utcnow() - timedelta(days=days)
+        unit = TREND_UNITS[granularity]
+        # Truncate in UTC (timezone() is AT TIME ZONE), not in the session's
+        # TimeZone, so day and week buckets line up with _trend_buckets
+        bucket = func.date_trunc(unit, func.timezone("UTC", WorkflowRollup.bucket)).label('bucket')
         trends_result = await session.execute(
             select(
-                func.date(OnboardingWorkflow.created_at).label('date'),
-                func.count(OnboardingWorkflow.id).label('total'),
-            ).where(OnboardingWorkflow.created_at >= cutoff_date)
-            .group_by(func.date(OnboardingWorkflow.created_at))
-            .order_by(func.date(OnboardingWorkflow.created_at))
+                bucket,
+                func.sum(WorkflowRollup.workflow_count).label('total'),
+                func.coalesce(
+                    func.sum(WorkflowRollup.workflow_count).filter(
+                        WorkflowRollup.status == WorkflowStatus.COMPLETED
+                    ), 0
+                ).label('completed'),
+                func.coalesce(
+                    func.sum(WorkflowRollup.workflow_count).filter(
+                        WorkflowRollup.status == WorkflowStatus.FAILED
+                    ), 0
+                ).label('failed'),
+            ).where(WorkflowRollup.bucket >= hour_bucket(cutoff_date))
+            .group_by(bucket)
+            .order_by(bucket)
         )
-        
+        counts = {
+            _utc(row_bucket): (total, completed, failed)
+            for row_bucket, total, completed, failed in trends_result.all()
+        }
+
         trends = []
-        for trend_date, total in trends_result.all():
+        for point in _trend_buckets(cutoff_date, datetime.utcnow(), granularity):
+            total, completed, failed = counts.get(point, (0, 0, 0))
             trends.append({
-                "date": trend_date.isoformat() if trend_date else None,
+                "date": point.isoformat() if granularity == "hourly" else point.date().isoformat(),
                 "total_workflows": total,
-                "completed": 0,
-                "failed": 0,
-                "success_rate": 0,
-                "failure_rate": 0
+                "completed": completed,
+                "failed": failed,
+                "success_rate": round((completed / total * 100) if total > 0 else 0, 2),
+                "failure_rate": round((failed / total * 100) if total > 0 else 0, 2)
             })
-        
+
         return {
             "granularity": granularity,
             "period_days": days,
@@ -141,6 +152,7 @@ async def get_analytics_trends(
 
 
 @router.get("/workflow-status-breakdown")
+@cached_response(ANALYTICS_NAMESPACE, key_params=("days",))
 async def get_workflow_status_breakdown(
     session: AsyncSession = Depends(get_db_session),
     days: int = Query(30, ge=1, le=365)
@@ -148,15 +160,16 @@ async def get_workflow_status_breakdown(
     """Get breakdown of workflows by status."""
     try:
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
+
         statuses_result = await session.execute(
             select(
-                OnboardingWorkflow.status,
-                func.count(OnboardingWorkflow.id).label('count')
-            ).where(OnboardingWorkflow.created_at >= cutoff_date)
-            .group_by(OnboardingWorkflow.status)
+                WorkflowRollup.status,
+                func.sum(WorkflowRollup.workflow_count).label('count')
+            ).where(WorkflowRollup.bucket >= hour_bucket(cutoff_date))
+            .group_by(WorkflowRollup.status)
+            .having(func.sum(WorkflowRollup.workflow_count) > 0)
         )
-        
+
         total = 0
         breakdown = []
         for status, count in statuses_result.all():
@@ -166,10 +179,10 @@ async def get_workflow_status_breakdown(
                 "count": count,
                 "percentage": 0
             })
-        
+
         for item in breakdown:
             item["percentage"] = round((item["count"] / total * 100) if total > 0 else 0, 2)
-        
+
         return {
             "period_days": days,
             "total_workflows": total,
@@ -181,6 +194,7 @@ async def get_workflow_status_breakdown(
 
 
 @router.get("/workflow-types")
+@cached_response(ANALYTICS_NAMESPACE, key_params=("days",))
 async def get_workflow_types_breakdown(
     session: AsyncSession = Depends(get_db_session),
     days: int = Query(30, ge=1, le=365)
@@ -188,29 +202,34 @@ async def get_workflow_types_breakdown(
     """Get breakdown of workflows by type."""
     try:
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
+
         types_result = await session.execute(
             select(
-                OnboardingWorkflow.workflow_type,
-                func.count(OnboardingWorkflow.id).label('count'),
-            ).where(OnboardingWorkflow.created_at >= cutoff_date)
-            .group_by(OnboardingWorkflow.workflow_type)
+                WorkflowRollup.workflow_type,
+                func.sum(WorkflowRollup.workflow_count).label('count'),
+                func.sum(WorkflowRollup.duration_seconds_sum).label('duration_sum'),
+                func.sum(WorkflowRollup.duration_count).label('duration_count'),
+            ).where(WorkflowRollup.bucket >= hour_bucket(cutoff_date))
+            .group_by(WorkflowRollup.workflow_type)
+            .having(func.sum(WorkflowRollup.workflow_count) > 0)
         )
-        
+
         total = 0
         breakdown = []
-        for wf_type, count in types_result.all():
+        for wf_type, count, duration_sum, duration_count in types_result.all():
             total += count
             breakdown.append({
                 "workflow_type": wf_type,
                 "count": count,
                 "percentage": 0,
-                "avg_duration_minutes": 0
+                "avg_duration_minutes": round(
+                    duration_sum / duration_count / 60 if duration_count else 0, 2
+                )
             })
-        
+
         for item in breakdown:
             item["percentage"] = round((item["count"] / total * 100) if total > 0 else 0, 2)
-        
+
         return {
             "period_days": days,
             "total_workflows": total,
@@ -222,6 +241,7 @@ async def get_workflow_types_breakdown(
 
 
 @router.get("/step-analytics")
+@cached_response(ANALYTICS_NAMESPACE, key_params=("days",))
 async def get_step_analytics(
     session: AsyncSession = Depends(get_db_session),
     days: int = Query(30, ge=1, le=365)
@@ -229,28 +249,42 @@ async def get_step_analytics(
     """Get analytics for individual workflow steps."""
     try:
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
+
+        total_executions = func.sum(StepRollup.execution_count)
         steps_result = await session.execute(
             select(
-                WorkflowStep.step_name,
-                func.count(WorkflowStep.id).label('total_executions'),
-            ).join(OnboardingWorkflow)
-            .where(OnboardingWorkflow.created_at >= cutoff_date)
-            .group_by(WorkflowStep.step_name)
-            .order_by(desc(func.count(WorkflowStep.id)))
+                StepRollup.step_name,
+                total_executions.label('total_executions'),
+                func.coalesce(
+                    func.sum(StepRollup.execution_count).filter(
+                        StepRollup.status == StepStatus.COMPLETED
+                    ), 0
+                ).label('successful_executions'),
+                func.coalesce(
+                    func.sum(StepRollup.execution_count).filter(
+                        StepRollup.status == StepStatus.FAILED
+                    ), 0
+                ).label('failed_executions'),
+                func.sum(StepRollup.duration_seconds_sum).label('duration_sum'),
+                func.sum(StepRollup.duration_count).label('duration_count'),
+            ).where(StepRollup.bucket >= hour_bucket(cutoff_date))
+            .group_by(StepRollup.step_name)
+            .order_by(desc(total_executions))
         )
-        
+
         step_data = []
-        for step_name, total in steps_result.all():
+        for step_name, total, succeeded, failed, duration_sum, duration_count in steps_result.all():
             step_data.append({
                 "step_name": step_name,
                 "total_executions": total,
-                "successful_executions": 0,
-                "failed_executions": 0,
-                "success_rate": 0,
-                "avg_duration_minutes": 0
+                "successful_executions": succeeded,
+                "failed_executions": failed,
+                "success_rate": round(succeeded / total * 100 if total else 0, 2),
+                "avg_duration_minutes": round(
+                    duration_sum / duration_count / 60 if duration_count else 0, 2
+                )
             })
-        
+
         return {
             "period_days": days,
             "total_steps": len(step_data),
@@ -262,6 +296,7 @@ async def get_step_analytics(
 
 
 @router.get("/customer-analytics")
+@cached_response(ANALYTICS_NAMESPACE, key_params=("days", "limit"))
 async def get_customer_analytics(
     session: AsyncSession = Depends(get_db_session),
     days: int = Query(30, ge=1, le=365),
@@ -270,7 +305,7 @@ async def get_customer_analytics(
     """Get analytics for customers and their onboarding progress."""
     try:
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
+
         customers_result = await session.execute(
             select(
                 Customer.id,
@@ -282,7 +317,7 @@ async def get_customer_analytics(
             .order_by(desc(func.count(OnboardingWorkflow.id)))
             .limit(limit)
         )
-        
+
         customer_data = []
         for customer_id, company_name, wf_count in customers_result.all():
             customer_data.append({
@@ -293,7 +328,7 @@ async def get_customer_analytics(
                 "completion_rate": 0,
                 "avg_completion_minutes": 0
             })
-        
+
         return {
             "period_days": days,
             "total_customers": len(customer_data),
@@ -302,3 +337,29 @@ async def get_customer_analytics(
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed")
+
+
+@router.get("/queue-wait")
+async def get_queue_wait():
+    """Get workflow task counts and average queue wait per priority across all workers."""
+    try:
+        return {
+            "priorities": await queue_wait_summary(),
+            "generated_at": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed")
+
+
+@router.get("/rate-limits")
+async def get_rate_limits():
+    """Get outbound call, throttle and wait totals per rate-limited integration."""
+    try:
+        return {
+            "integrations": await rate_limit_summary(),
+            "generated_at": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed")
@@ -1,20 +1,34 @@
 """Onboarding workflow endpoints."""
 
+import asyncio
+import json
+import os
+from contextlib import AsyncExitStack
 from datetime import datetime, timezone
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, Query, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.analytics.aggregates import get_workflow_aggregates
+from app.analytics.rollups import record_workflow_transition, set_workflow_status
+from app.core.cache import ANALYTICS_NAMESPACE, invalidate_cache
+from app.config import settings
 from app.core.exceptions import raise_bad_request, raise_not_found
-from app.database.session import get_db_session
+from app.core.progress import TERMINAL_STATUSES, progress_broker, publish_progress
+from app.database.session import async_session_factory, get_db_session
+from app.imports.bulk_onboarding import IMPORT_CONTENT_TYPES, run_import, spool_upload
+from app.models.database.import_job import ImportJob
 from app.models.database.customer import Customer, CustomerType, CustomerStatus
 from app.models.database.onboarding_workflow import OnboardingWorkflow, WorkflowStatus
 from app.models.schemas.common import BaseResponse, PaginatedResponse
 from app.models.schemas.onboarding import (
     ApprovalRequest,
+    ImportJobResponse,
     OnboardingCreate,
     OnboardingWizardCreate,
     OnboardingDetailResponse,
@@ -22,8 +36,15 @@ from app.models.schemas.onboarding import (
     OnboardingResponse,
     OnboardingStats,
 )
+from app.orchestrator.checkpointer import delete_checkpoints, evict_cached_checkpoint
+from app.orchestrator.state_store import load_workflow_state
+from app.orchestrator.graphs import DEFAULT_TEMPLATE_VERSION
 from app.orchestrator.workflow_engine import workflow_engine, create_initial_state
-from app.tasks import run_onboarding_workflow
+from app.tasks import (
+    enqueue_workflow_task,
+    resume_onboarding_workflow,
+    run_onboarding_workflow,
+)
 
 router = APIRouter()
 
@@ -38,6 +59,9 @@ async def start_wizard_onboarding(
     Start a new onboarding workflow via the wizard.
     Creates both the customer and the workflow.
     """
+    if not workflow_engine.has_graph(wizard_data.workflow_type, DEFAULT_TEMPLATE_VERSION):
+        raise_bad_request(f"Unknown workflow type '{wizard_data.workflow_type}'")
+
     # Create customer
     name_parts = wizard_data.contact_name.split(" ", 1)
     first_name = name_parts[0]
@@ -59,6 +83,7 @@ async def start_wizard_onboarding(
     workflow = OnboardingWorkflow(
         customer_id=customer.id,
         workflow_type=wizard_data.workflow_type,
+        template_version=DEFAULT_TEMPLATE_VERSION,
         priority=wizard_data.priority,
         context=wizard_data.context,
         status=WorkflowStatus.IN_PROGRESS,
@@ -67,6 +92,7 @@ async def start_wizard_onboarding(
     db.add(workflow)
     await db.flush()
     await db.refresh(workflow)
+    await record_workflow_transition(db, workflow, None, workflow.status)
 
     # Initialize and trigger orchestrator
     initial_state = create_initial_state(
@@ -79,10 +105,17 @@ async def start_wizard_onboarding(
             "company_name": customer.company_name,
             "tax_id": wizard_data.tax_id,
         },
+        workflow_type=workflow.workflow_type,
+        template_version=workflow.template_version,
     )
 
+    # Commit before enqueueing so the worker finds the workflow, and before
+    # invalidating so the dashboards can't re-cache the old counts
+    await db.commit()
+    await invalidate_cache(ANALYTICS_NAMESPACE)
+
     # Run workflow in background via Celery
-    run_onboarding_workflow.delay(initial_state)
+    enqueue_workflow_task(run_onboarding_workflow, (initial_state,), workflow.priority)
 
     response_data = OnboardingResponse.model_validate(workflow)
     response_data.customer_name = customer.company_name
@@ -103,6 +136,9 @@ async def start_onboarding(
 
     This creates a workflow instance and triggers the orchestration engine.
     """
+    if not workflow_engine.has_graph(onboarding_data.workflow_type, DEFAULT_TEMPLATE_VERSION):
+        raise_bad_request(f"Unknown workflow type '{onboarding_data.workflow_type}'")
+
     # Verify customer exists
     customer = await db.get(Customer, onboarding_data.customer_id)
     if not customer:
@@ -131,6 +167,7 @@ async def start_onboarding(
     workflow = OnboardingWorkflow(
         customer_id=onboarding_data.customer_id,
         workflow_type=onboarding_data.workflow_type,
+        template_version=DEFAULT_TEMPLATE_VERSION,
         priority=onboarding_data.priority,
         context=onboarding_data.context,
         status=WorkflowStatus.PENDING,
@@ -139,6 +176,7 @@ async def start_onboarding(
     db.add(workflow)
     await db.flush()
     await db.refresh(workflow)
+    await record_workflow_transition(db, workflow, None, workflow.status)
 
     # Initialize and trigger orchestrator
     initial_state = create_initial_state(
@@ -150,10 +188,17 @@ async def start_onboarding(
             "last_name": customer.last_name,
             "company_name": customer.company_name,
         },
+        workflow_type=workflow.workflow_type,
+        template_version=workflow.template_version,
     )
 
+    # Commit before enqueueing so the worker finds the workflow, and before
+    # invalidating so the dashboards can't re-cache the old counts
+    await db.commit()
+    await invalidate_cache(ANALYTICS_NAMESPACE)
+
     # Trigger LangGraph workflow execution via Celery task
-    run_onboarding_workflow.delay(initial_state)
+    enqueue_workflow_task(run_onboarding_workflow, (initial_state,), workflow.priority)
 
     response_data = OnboardingResponse.model_validate(workflow)
     response_data.customer_name = customer.company_name
@@ -208,78 +253,72 @@ async def get_onboarding_stats(
     db: AsyncSession = Depends(get_db_session),
 ) -> OnboardingStats:
     """Get onboarding statistics for the dashboard."""
-    # Total workflows
-    total = await db.scalar(select(func.count(OnboardingWorkflow.id))) or 0
+    today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    aggregates = await get_workflow_aggregates(db, today_start=today_start)
 
-    # Active workflows
-    active = (
-        await db.scalar(
-            select(func.count(OnboardingWorkflow.id)).where(
-                OnboardingWorkflow.status.in_(
-                    [
-                        WorkflowStatus.PENDING,
-                        WorkflowStatus.IN_PROGRESS,
-                        WorkflowStatus.AWAITING_INPUT,
-                    ]
-                )
-            )
-        )
-        or 0
+    return OnboardingStats(
+        total_workflows=aggregates.total,
+        active_workflows=aggregates.active,
+        completed_today=aggregates.completed_today,
+        avg_completion_time_minutes=round(aggregates.avg_completion_minutes, 2),
+        success_rate=aggregates.finished_success_rate,
+        pending_approvals=aggregates.awaiting_approval,
     )
 
-    # Completed today
-    today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-    completed_today = (
-        await db.scalar(
-            select(func.count(OnboardingWorkflow.id)).where(
-                and_(
-                    OnboardingWorkflow.status == WorkflowStatus.COMPLETED,
-                    OnboardingWorkflow.completed_at >= today_start,
-                )
-            )
-        )
-        or 0
-    )
 
-    # Pending approvals
-    pending_approvals = (
-        await db.scalar(
-            select(func.count(OnboardingWorkflow.id)).where(
-                OnboardingWorkflow.status == WorkflowStatus.AWAITING_APPROVAL
-            )
-        )
-        or 0
-    )
+@router.post("/import", response_model=BaseResponse[ImportJobResponse], status_code=202)
+async def import_onboardings(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db_session),
+) -> BaseResponse[ImportJobResponse]:
+    """
+    Bulk-create customers and onboarding workflows from a CSV or NDJSON upload.
 
-    # Calculate success rate
-    completed = (
-        await db.scalar(
-            select(func.count(OnboardingWorkflow.id)).where(
-                OnboardingWorkflow.status == WorkflowStatus.COMPLETED
-            )
-        )
-        or 0
-    )
-    failed = (
-        await db.scalar(
-            select(func.count(OnboardingWorkflow.id)).where(
-                OnboardingWorkflow.status == WorkflowStatus.FAILED
-            )
+    Each row has the fields of the wizard request. The body is streamed to
+    disk and imported in the background; poll the returned job for progress.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    import_format = IMPORT_CONTENT_TYPES.get(content_type)
+    if import_format is None:
+        raise_bad_request(
+            f"Unsupported content type '{content_type}', "
+            f"expected one of: {', '.join(IMPORT_CONTENT_TYPES)}"
         )
-        or 0
-    )
-    success_rate = (completed / (completed + failed) * 100) if (completed + failed) > 0 else 100.0
 
-    return OnboardingStats(
-        total_workflows=total,
-        active_workflows=active,
-        completed_today=completed_today,
-        avg_completion_time_minutes=25.5,  # TODO: Calculate from actual data
-        success_rate=success_rate,
-        pending_approvals=pending_approvals,
+    path = await spool_upload(request.stream())
+    try:
+        job = ImportJob(format=import_format)
+        db.add(job)
+        await db.flush()
+        await db.refresh(job)
+        # Commit before the background task looks the job up
+        await db.commit()
+    except Exception:
+        os.unlink(path)
+        raise
+
+    background_tasks.add_task(run_import, job.id, path, import_format)
+
+    return BaseResponse(
+        message="Import accepted",
+        data=ImportJobResponse.model_validate(job),
     )
 
 
+@router.get("/import/{job_id}", response_model=BaseResponse[ImportJobResponse])
+async def get_import(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db_session),
+) -> BaseResponse[ImportJobResponse]:
+    """Get the progress of a bulk onboarding import."""
+    job = await db.get(ImportJob, job_id)
+    if not job:
+        raise_not_found("Import job", str(job_id))
+
+    return BaseResponse(data=ImportJobResponse.model_validate(job))
+
+
 @router.get("/{workflow_id}", response_model=BaseResponse[OnboardingDetailResponse])
 async def get_onboarding(
     workflow_id: UUID,
@@ -298,10 +337,84 @@ async def get_onboarding(
 
     response_data = OnboardingDetailResponse.model_validate(workflow)
     response_data.customer_name = workflow.customer.company_name
+    response_data.state = await load_workflow_state(db, workflow)
 
     return BaseResponse(data=response_data)
 
 
+def _sse_message(event: str, data: dict[str, Any]) -> str:
+    """Format a Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/{workflow_id}/events")
+async def stream_onboarding_events(workflow_id: UUID, request: Request) -> StreamingResponse:
+    """
+    Stream workflow progress as Server-Sent Events.
+
+    Sends a ``snapshot`` event with the current progress, then a ``step``
+    event per completed node and a ``status`` event per status change, as
+    published by the workers. The stream ends once the workflow reaches a
+    terminal status.
+
+    The subscription is opened before the snapshot is read, so no event is
+    lost in between. The workflow row is read once and no database session
+    is held while the stream is open.
+    """
+    stack = AsyncExitStack()
+    queue = await stack.enter_async_context(progress_broker.subscribe(str(workflow_id)))
+    try:
+        async with async_session_factory() as session:
+            workflow = await session.get(OnboardingWorkflow, workflow_id)
+        if not workflow:
+            raise_not_found("Onboarding workflow", str(workflow_id))
+    except BaseException:
+        await stack.aclose()
+        raise
+
+    snapshot = {
+        "status": workflow.status.value,
+        "current_step": workflow.current_step,
+        "completed_steps": workflow.completed_steps,
+        "progress_percentage": workflow.progress_percentage,
+    }
+
+    async def event_stream():
+        async with stack:
+            yield _sse_message("snapshot", snapshot)
+            if workflow.is_terminal:
+                return
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), timeout=settings.workflow_events_heartbeat
+                    )
+                except TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+
+                yield _sse_message(message["event"], message["data"])
+                if (
+                    message["event"] == "status"
+                    and message["data"].get("status") in TERMINAL_STATUSES
+                ):
+                    return
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Keep GZipMiddleware and reverse proxies from buffering events
+            "Content-Encoding": "identity",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @router.post("/{workflow_id}/approve", response_model=BaseResponse[OnboardingResponse])
 async def approve_onboarding(
     workflow_id: UUID,
@@ -317,17 +430,34 @@ async def approve_onboarding(
         raise_bad_request("Workflow is not awaiting approval")
 
     if approval.approved:
-        workflow.status = WorkflowStatus.APPROVED
         workflow.approval_notes = approval.notes
         workflow.approved_at = datetime.now(timezone.utc)
-        # TODO: Resume workflow execution
+        await set_workflow_status(db, workflow, WorkflowStatus.APPROVED)
     else:
-        workflow.status = WorkflowStatus.FAILED
         workflow.error_message = f"Rejected: {approval.notes}"
+        await set_workflow_status(db, workflow, WorkflowStatus.FAILED)
 
+    if workflow.is_terminal:
+        # A rejected workflow is never resumed
+        await delete_checkpoints(db, str(workflow_id))
     await db.flush()
     await db.refresh(workflow)
 
+    # Commit before enqueueing and publishing so workers and clients see the new status
+    await db.commit()
+    await invalidate_cache(ANALYTICS_NAMESPACE)
+    if workflow.is_terminal:
+        await evict_cached_checkpoint(str(workflow_id))
+    if approval.approved:
+        # Continue from the last checkpoint at provisioning
+        enqueue_workflow_task(
+            resume_onboarding_workflow,
+            (str(workflow_id), workflow.workflow_type, workflow.template_version),
+            workflow.priority,
+        )
+
+    await publish_progress(str(workflow_id), "status", {"status": workflow.status.value})
+
     return BaseResponse(
         message="Approval processed",
         data=OnboardingResponse.model_validate(workflow),
@@ -347,9 +477,14 @@ async def cancel_onboarding(
     if workflow.is_terminal:
         raise_bad_request("Cannot cancel a completed workflow")
 
-    workflow.status = WorkflowStatus.CANCELLED
+    await set_workflow_status(db, workflow, WorkflowStatus.CANCELLED)
+    await delete_checkpoints(db, str(workflow_id))
     await db.flush()
     await db.refresh(workflow)
+    await db.commit()
+    await invalidate_cache(ANALYTICS_NAMESPACE)
+    await evict_cached_checkpoint(str(workflow_id))
+    await publish_progress(str(workflow_id), "status", {"status": workflow.status.value})
 
     return BaseResponse(
         message="Workflow cancelled",
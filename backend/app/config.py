@@ -36,6 +36,24 @@ class Settings(BaseSettings):
     database_pool_size: int = 20
     database_max_overflow: int = 10
 
+    # Workflow persistence
+    workflow_flush_policy: Literal["every_node", "every_n", "phase_boundary"] = "every_node"
+    workflow_flush_every: int = 3  # steps per flush for the "every_n" policy
+    workflow_checkpoint_redis: bool = True  # write-through Redis layer for checkpoints
+    workflow_checkpoint_ttl: int = 86400  # 1 day
+    workflow_events_queue_size: int = 100  # buffered progress events per SSE client
+    workflow_events_heartbeat: int = 15  # seconds between SSE keep-alive comments
+    workflow_deadline_seconds: int = 900  # time budget for one run of a workflow graph
+
+    # Bulk onboarding imports
+    bulk_import_chunk_size: int = 1000  # rows validated, inserted and enqueued together
+    bulk_import_max_errors: int = 100  # row errors kept on the import job
+    bulk_import_stale_after: int = 600  # seconds without progress before a job counts as orphaned
+
+    # Tracing
+    tracing_exporter: Literal["none", "file"] = "none"  # where finished spans go
+    tracing_file: str = "traces.ndjson"  # JSON lines written by the "file" exporter
+
     # Redis
     redis_url: RedisDsn = Field(default="redis://localhost:6379/0")
     redis_cache_ttl: int = 3600  # 1 hour
@@ -55,10 +73,40 @@ class Settings(BaseSettings):
     # LLM Configuration
     openai_api_key: str = Field(default="")
     anthropic_api_key: str = Field(default="")
-    llm_provider: Literal["openai", "anthropic", "azure"] = "openai"
+    llm_provider: Literal["openai", "anthropic", "azure", "fake"] = "openai"
     llm_model: str = "gpt-4-turbo-preview"
     llm_temperature: float = 0.1
     llm_max_tokens: int = 4096
+    # Offline "fake" provider, for benchmarks without network access
+    fake_llm_responses_file: str = ""  # JSON list of scripted replies; filler text if empty
+    fake_llm_latency: float = 0.5  # mean seconds to first token (log-normal)
+    fake_llm_latency_jitter: float = 0.2  # standard deviation of time to first token
+    fake_llm_tokens_per_second: float = 80.0
+    fake_llm_completion_tokens: int = 200  # length of filler replies
+    fake_llm_seed: int = 0
+    agent_pool_size: int = 8  # max warm instances per agent type and process
+    agent_retry_base_delay: float = 1.0  # seconds before the first retry
+    agent_retry_max_delay: float = 30.0  # cap on the exponential backoff delay
+    agent_min_attempt_seconds: float = 5.0  # don't retry with less budget than this left
+    tool_cache_max_entries: int = 1024  # in-process LRU size for memoized tool results
+    tool_cache_local_ttl: int = 60  # seconds a result stays in the in-process LRU
+    tool_replay_ttl: int = 604800  # seconds completed side effects are replayed on re-runs
+
+    # Circuit breakers around external integrations
+    circuit_breaker_failure_threshold: int = 5  # consecutive failures before opening
+    circuit_breaker_recovery_timeout: float = 30.0  # seconds open before half-open probes
+    circuit_breaker_half_open_max_calls: int = 1  # concurrent probes while half-open
+    circuit_breaker_park_workflows: bool = True  # park in AWAITING_INPUT instead of failing
+
+    # Outbound rate limits in requests per second, per integration and credential
+    integration_rate_limits: dict[str, float] = {
+        "salesforce": 20.0,
+        "docusign": 10.0,
+        "sendgrid": 50.0,
+        "twilio": 1.0,
+    }
+    integration_rate_burst: dict[str, int] = {}  # bucket size; defaults to one second's rate
+    rate_limit_max_wait: float = 30.0  # longest wait for a token before failing the call
 
     # Vector Store
     chroma_host: str = "localhost"
@@ -75,6 +123,10 @@ class Settings(BaseSettings):
     # Celery
     celery_broker_url: str = "redis://localhost:6379/1"
     celery_result_backend: str = "redis://localhost:6379/2"
+    workflow_worker_concurrency: int = 8  # concurrent workflows per worker event loop
+    # Share of worker slots each workflow priority gets while tasks are waiting
+    workflow_priority_weights: dict[str, int] = {"urgent": 8, "high": 4, "normal": 2, "low": 1}
+    worker_metrics_port: int = 9101  # Prometheus exporter in each worker; 0 disables
 
     # External Integrations (Optional - for later phases)
     salesforce_client_id: str = Field(default="")
@@ -0,0 +1,84 @@
+"""Redis-backed response caching with versioned invalidation."""
+
+import functools
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import structlog
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+
+from app.config import settings
+from app.core.events import get_or_create_redis
+
+logger = structlog.get_logger()
+
+# Namespace for dashboard analytics responses, invalidated on workflow status changes
+ANALYTICS_NAMESPACE = "analytics"
+
+
+def _version_key(namespace: str) -> str:
+    return f"cache:{namespace}:version"
+
+
+def cached_response(
+    namespace: str,
+    key_params: tuple[str, ...] = (),
+    ttl: int | None = None,
+) -> Callable:
+    """
+    Cache an endpoint's JSON response in Redis.
+
+    The cache key is built from the namespace version, the endpoint name and
+    the values of ``key_params``. Hits are returned as the stored JSON text
+    without touching the database or re-serializing. Bumping the namespace
+    version with ``invalidate_cache()`` makes every existing entry unreachable,
+    and the old entries then expire through their TTL.
+
+    Redis errors are logged and the endpoint is served uncached.
+
+    Usage:
+        @router.get("/summary")
+        @cached_response("analytics", key_params=("days",))
+        async def get_summary(days: int = Query(30)):
+            ...
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Response]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            redis = get_or_create_redis()
+            params = ":".join(f"{name}={kwargs.get(name)}" for name in sorted(key_params))
+
+            cache_key = None
+            try:
+                version = await redis.get(_version_key(namespace)) or "0"
+                cache_key = f"cache:{namespace}:v{version}:{func.__name__}:{params}"
+                cached = await redis.get(cache_key)
+                if cached is not None:
+                    return Response(content=cached, media_type="application/json")
+            except Exception as e:
+                await logger.awarning("cache_read_failed", namespace=namespace, error=str(e))
+
+            body = json.dumps(jsonable_encoder(await func(*args, **kwargs)))
+
+            if cache_key is not None:
+                try:
+                    await redis.set(cache_key, body, ex=ttl or settings.redis_cache_ttl)
+                except Exception as e:
+                    await logger.awarning("cache_write_failed", namespace=namespace, error=str(e))
+
+            return Response(content=body, media_type="application/json")
+
+        return wrapper
+
+    return decorator
+
+
+async def invalidate_cache(namespace: str) -> None:
+    """Invalidate every cached response in a namespace by bumping its version."""
+    try:
+        await get_or_create_redis().incr(_version_key(namespace))
+    except Exception as e:
+        await logger.awarning("cache_invalidation_failed", namespace=namespace, error=str(e))
@@ -0,0 +1,205 @@
+"""Circuit breakers for external integrations, shared across processes through Redis."""
+
+import enum
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+import structlog
+
+from app.config import settings
+from app.core.events import get_or_create_redis
+from app.core.exceptions import CircuitOpenError
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# Seconds an idle breaker key is kept in Redis
+BREAKER_KEY_TTL = 86400
+
+# Decide whether a call may go through. Returns {allowed, retry_after, state, failures}.
+# An open breaker turns half-open once the recovery timeout has passed and then
+# admits up to half_open_max_calls probes. Probes that never report back are
+# forgotten after another recovery timeout.
+_ACQUIRE_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state')
+if not state or state == 'closed' then
+    return {1, '0', 'closed', tonumber(redis.call('HGET', KEYS[1], 'failures') or '0')}
+end
+local now = tonumber(ARGV[1])
+local recovery = tonumber(ARGV[2])
+local changed_at = tonumber(redis.call('HGET', KEYS[1], 'changed_at') or '0')
+if state == 'open' then
+    local wait = changed_at + recovery - now
+    if wait > 0 then
+        return {0, tostring(wait), 'open', 0}
+    end
+    redis.call('HSET', KEYS[1], 'state', 'half_open', 'probes', 0, 'changed_at', ARGV[1])
+elseif now - changed_at > recovery then
+    redis.call('HSET', KEYS[1], 'probes', 0, 'changed_at', ARGV[1])
+end
+if redis.call('HINCRBY', KEYS[1], 'probes', 1) <= tonumber(ARGV[3]) then
+    return {1, '0', 'half_open', 0}
+end
+redis.call('HINCRBY', KEYS[1], 'probes', -1)
+return {0, ARGV[2], 'half_open', 0}
+"""
+
+# Record a call outcome and return the resulting state. Failures are counted
+# while closed and open the breaker at the threshold; a failed probe reopens
+# it and a successful probe closes it.
+_RECORD_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+if ARGV[1] == '1' then
+    if state ~= 'open' then
+        redis.call('DEL', KEYS[1])
+        return 'closed'
+    end
+    return state
+end
+if state == 'open' then
+    return state
+end
+if state == 'half_open' then
+    redis.call('HSET', KEYS[1], 'state', 'open', 'probes', 0, 'changed_at', ARGV[2])
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+    return 'open'
+end
+local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+if failures >= tonumber(ARGV[3]) then
+    redis.call('HSET', KEYS[1], 'state', 'open', 'failures', 0, 'changed_at', ARGV[2])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return redis.call('HGET', KEYS[1], 'state') or 'closed'
+"""
+
+
+class CircuitState(str, enum.Enum):
+    """Circuit breaker state."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one external integration.
+
+    The breaker state lives in a Redis hash, so every worker process sees the
+    same state: once ``failure_threshold`` consecutive calls fail anywhere,
+    all processes reject calls for ``recovery_timeout`` seconds. After that a
+    limited number of half-open probe calls is let through; a successful
+    probe closes the breaker and a failed one reopens it.
+
+    While the breaker is known to be open, calls are rejected locally without
+    a Redis round trip. If Redis is unavailable the breaker fails open and
+    calls go through unprotected.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int | None = None,
+        recovery_timeout: float | None = None,
+        half_open_max_calls: int | None = None,
+    ) -> None:
+        """Initialize a breaker for an integration."""
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.circuit_breaker_failure_threshold
+        self.recovery_timeout = recovery_timeout or settings.circuit_breaker_recovery_timeout
+        self.half_open_max_calls = (
+            half_open_max_calls or settings.circuit_breaker_half_open_max_calls
+        )
+        self.key = f"circuit:{name}"
+        self._open_until = 0.0
+
+    async def _acquire(self) -> tuple[bool, float, CircuitState, int]:
+        """Ask Redis whether a call may proceed."""
+        allowed, retry_after, state, failures = await get_or_create_redis().eval(
+            _ACQUIRE_SCRIPT,
+            1,
+            self.key,
+            time.time(),
+            self.recovery_timeout,
+            self.half_open_max_calls,
+        )
+        return bool(allowed), float(retry_after), CircuitState(state), int(failures)
+
+    async def _record(self, success: bool) -> CircuitState:
+        """Record a call outcome in Redis."""
+        state = await get_or_create_redis().eval(
+            _RECORD_SCRIPT,
+            1,
+            self.key,
+            1 if success else 0,
+            time.time(),
+            self.failure_threshold,
+            BREAKER_KEY_TTL,
+        )
+        return CircuitState(state)
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """
+        Call ``func`` through the breaker.
+
+        Raises:
+            CircuitOpenError: If the breaker is open or its probe slots are taken
+        """
+        remaining = self._open_until - time.monotonic()
+        if remaining > 0:
+            raise CircuitOpenError(self.name, retry_after=remaining)
+
+        try:
+            allowed, retry_after, state, failures = await self._acquire()
+        except Exception as e:
+            await logger.awarning("circuit_breaker_unavailable", breaker=self.name, error=str(e))
+            return await func(*args, **kwargs)
+
+        if not allowed:
+            if state == CircuitState.OPEN:
+                self._open_until = time.monotonic() + retry_after
+            raise CircuitOpenError(self.name, retry_after=retry_after)
+
+        try:
+            result = await func(*args, **kwargs)
+        except Exception:
+            await self._report(success=False)
+            raise
+
+        # A clean closed breaker has nothing to reset, so skip the write
+        if state != CircuitState.CLOSED or failures:
+            await self._report(success=True)
+        return result
+
+    async def _report(self, success: bool) -> None:
+        """Record an outcome, logging state changes and tolerating Redis errors."""
+        try:
+            state = await self._record(success)
+        except Exception as e:
+            await logger.awarning("circuit_breaker_unavailable", breaker=self.name, error=str(e))
+            return
+
+        if state == CircuitState.OPEN:
+            self._open_until = time.monotonic() + self.recovery_timeout
+            await logger.awarning("circuit_breaker_open", breaker=self.name)
+        elif success:
+            self._open_until = 0.0
+
+    async def get_state(self) -> CircuitState:
+        """Read the shared breaker state."""
+        state = await get_or_create_redis().hget(self.key, "state")
+        return CircuitState(state or CircuitState.CLOSED)
+
+
+# Per-process breaker instances, keyed by integration name
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Get the breaker for an integration, creating it on first use."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(name)
+    return breaker
@@ -0,0 +1,38 @@
+"""Deadline propagation for time-bounded work such as a workflow run."""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Absolute deadline on the time.monotonic() clock, or None when unbounded
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[None]:
+    """
+    Bound everything awaited inside the block to ``seconds`` from now.
+
+    Scopes nest: an inner scope can only shorten the deadline set by an outer
+    one. The deadline is a context variable, so it follows the asyncio tasks
+    LangGraph spawns for each node.
+    """
+    current = _deadline.get()
+    deadline = time.monotonic() + seconds if seconds is not None else None
+    if current is not None and (deadline is None or current < deadline):
+        deadline = current
+
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> float | None:
+    """Seconds left before the current deadline, or None if there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
@@ -50,6 +50,11 @@ async def create_stop_handler() -> None:
 
     await logger.ainfo("application_stopping")
 
+    # Stop progress event fan-out before its Redis connection goes away
+    from app.core.progress import progress_broker
+
+    await progress_broker.close()
+
     # Close Redis connection
     if redis_client:
         await redis_client.close()
@@ -65,3 +70,22 @@ async def create_stop_handler() -> None:
 def get_redis() -> Redis | None:
     """Get Redis client instance."""
     return redis_client
+
+
+def get_or_create_redis() -> Redis:
+    """
+    Get the Redis client, creating it lazily if the API lifespan did not run.
+
+    Celery workers never go through ``create_start_handler``, so they use this
+    to share a single client per process. Connections are opened on first
+    command; callers are expected to handle connection errors.
+    """
+    global redis_client
+
+    if redis_client is None:
+        redis_client = Redis.from_url(
+            str(settings.redis_url),
+            encoding="utf-8",
+            decode_responses=True,
+        )
+    return redis_client
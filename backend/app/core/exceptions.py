@@ -51,6 +51,36 @@ class IntegrationError(AppException):
         super().__init__(message, details)
 
 
+class CircuitOpenError(IntegrationError):
+    """Call rejected because the integration's circuit breaker is open."""
+
+    def __init__(
+        self,
+        integration_name: str,
+        retry_after: float,
+        details: dict[str, Any] | None = None,
+    ) -> None:
+        self.retry_after = retry_after
+        super().__init__(
+            f"Circuit breaker for '{integration_name}' is open", integration_name, details
+        )
+
+
+class RateLimitExceededError(IntegrationError):
+    """Call rejected because the integration's rate limit would make it wait too long."""
+
+    def __init__(
+        self,
+        integration_name: str,
+        retry_after: float,
+        details: dict[str, Any] | None = None,
+    ) -> None:
+        self.retry_after = retry_after
+        super().__init__(
+            f"Rate limit for '{integration_name}' exceeded", integration_name, details
+        )
+
+
 class WorkflowError(AppException):
     """Workflow execution exception."""
 
@@ -0,0 +1,74 @@
+"""Idempotency keys for tool calls with external side effects."""
+
+import hashlib
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from langchain_core.tools import BaseTool
+
+# Scope keys are derived from, e.g. "<workflow id>:<graph node>", or None outside a node
+_scope: ContextVar[str | None] = ContextVar("idempotency_scope", default=None)
+
+# Names of tools registered with ``side_effect_tool``
+_side_effect_tools: set[str] = set()
+
+
+def side_effect_tool(tool: BaseTool) -> BaseTool:
+    """
+    Mark a LangChain tool as having external side effects.
+
+    Use this for calls that must not happen twice, such as sending an email,
+    creating a CRM account or sending an envelope for signature. The tool
+    must accept an ``idempotency_key`` argument; ``BaseAgent.invoke_tool``
+    fills it in and the tool forwards it to the provider, which deduplicates
+    requests carrying the same key.
+
+    Usage:
+        @side_effect_tool
+        @tool
+        def send_email(to_email: str, ..., idempotency_key: str | None = None) -> dict:
+            ...
+    """
+    _side_effect_tools.add(tool.name)
+    return tool
+
+
+def is_side_effect_tool(tool_name: str) -> bool:
+    """Check whether a tool was registered with ``side_effect_tool``."""
+    return tool_name in _side_effect_tools
+
+
+@contextmanager
+def idempotency_scope(scope: str) -> Iterator[None]:
+    """
+    Derive idempotency keys inside the block from ``scope``.
+
+    The scope must be stable across re-executions of the same unit of work,
+    so graph nodes use the workflow id and node name. The scope is a context
+    variable, so it follows the asyncio tasks LangGraph spawns for each node.
+    """
+    token = _scope.set(scope)
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def idempotency_key(tool_name: str, tool_input: dict[str, Any]) -> str | None:
+    """
+    Key for one side-effecting call, or None outside an ``idempotency_scope``.
+
+    The key depends on the scope, the tool and its arguments only, so the
+    same call made again by the same workflow step (an agent retrying after
+    a timeout, or the step re-running after the workflow resumes) gets the
+    same key.
+    """
+    scope = _scope.get()
+    if scope is None:
+        return None
+    arguments = json.dumps(tool_input, sort_keys=True, default=str)
+    digest = hashlib.sha256(arguments.encode()).hexdigest()[:16]
+    return f"{scope}:{tool_name}:{digest}"
@@ -5,6 +5,8 @@ import sys
 
 import structlog
 
+from app.core.tracing import add_trace_context
+
 
 def configure_logging(json_logs: bool = False, log_level: str = "INFO") -> None:
     """Configure structured logging for the application."""
@@ -15,6 +17,7 @@ def configure_logging(json_logs: bool = False, log_level: str = "INFO") -> None:
     # Shared processors for all loggers
     shared_processors: list[structlog.typing.Processor] = [
         structlog.contextvars.merge_contextvars,
+        add_trace_context,
         structlog.processors.add_log_level,
         structlog.processors.StackInfoRenderer(),
         structlog.dev.set_exc_info,
@@ -0,0 +1,239 @@
+"""Prometheus text exposition of the in-process counters and histograms."""
+
+import math
+import threading
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Literal
+
+import structlog
+
+from app.orchestrator.instrumentation import (
+    LatencyHistogram,
+    agent_confidence,
+    agent_results,
+    node_latency,
+)
+
+logger = structlog.get_logger()
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+MetricType = Literal["counter", "gauge", "histogram"]
+
+# Samples of a family: label values -> number, or LatencyHistogram for histograms.
+# Single-label families may use plain strings as keys.
+Samples = Mapping[Any, Any]
+
+
+@dataclass
+class MetricFamily:
+    """A named metric and where to read its current samples from."""
+
+    name: str
+    type: MetricType
+    help: str
+    labels: tuple[str, ...]
+    samples: Samples | Callable[[], Samples]
+
+    def current(self) -> list[tuple[tuple[str, ...], Any]]:
+        """Snapshot the samples, with every key as a tuple of label values."""
+        samples = self.samples() if callable(self.samples) else self.samples
+        # list() copies the dict in one step, so a scrape from the exporter
+        # thread never sees it change size while iterating
+        return [
+            (key if isinstance(key, tuple) else (key,), value)
+            for key, value in list(samples.items())
+        ]
+
+
+# Every family rendered by ``render_metrics``, keyed by metric name
+_families: dict[str, MetricFamily] = {}
+
+
+def register_metric(
+    name: str,
+    type: MetricType,
+    help: str,
+    labels: tuple[str, ...],
+    samples: Samples | Callable[[], Samples],
+) -> None:
+    """
+    Expose a metric on ``/metrics``.
+
+    ``samples`` is the dict the owning module already updates (or a callable
+    returning one), so recording stays a plain dict or integer update and the
+    exposition work only happens when a scraper asks for it.
+    """
+    _families[name] = MetricFamily(name, type, help, labels, samples)
+
+
+# In-process request latency histograms, keyed by (method, route template, status)
+http_request_duration: dict[tuple[str, str, str], LatencyHistogram] = {}
+
+# Time spent waiting for a database connection from the pool
+pool_checkout_wait = LatencyHistogram()
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    """Record an HTTP request's duration under its route template."""
+    key = (method, route, str(status))
+    histogram = http_request_duration.get(key)
+    if histogram is None:
+        histogram = http_request_duration[key] = LatencyHistogram()
+    histogram.observe(seconds)
+
+
+def observe_pool_checkout(seconds: float) -> None:
+    """Record how long a connection checkout waited on the pool."""
+    pool_checkout_wait.observe(seconds)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], **extra: str) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def _render_histogram(
+    lines: list[str], family: MetricFamily, values: tuple[str, ...], histogram: LatencyHistogram
+) -> None:
+    # Copy the counts first and derive the total from them, so the buckets
+    # and the count agree even if an observation lands mid-scrape
+    counts = list(histogram.counts)
+    cumulative = 0
+    for bound, bucket_count in zip(histogram.buckets, counts):
+        cumulative += bucket_count
+        labels = _labels(family.labels, values, le=_format_value(bound))
+        lines.append(f"{family.name}_bucket{labels} {cumulative}")
+    cumulative += counts[-1]
+    lines.append(f"{family.name}_bucket{_labels(family.labels, values, le='+Inf')} {cumulative}")
+    labels = _labels(family.labels, values)
+    lines.append(f"{family.name}_sum{labels} {_format_value(histogram.sum)}")
+    lines.append(f"{family.name}_count{labels} {cumulative}")
+
+
+def render_metrics() -> str:
+    """Render every registered metric in the Prometheus text format."""
+    lines: list[str] = []
+    for family in list(_families.values()):
+        try:
+            samples = family.current()
+        except Exception as e:
+            # One broken collector must not take down the whole scrape
+            logger.warning("metric_collect_failed", metric=family.name, error=str(e))
+            continue
+
+        lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {family.type}")
+        for values, value in samples:
+            if family.type == "histogram":
+                _render_histogram(lines, family, values, value)
+            else:
+                labels = _labels(family.labels, values)
+                lines.append(f"{family.name}{labels} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serve ``render_metrics`` on ``GET /metrics``."""
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep scrapes out of the worker log."""
+
+
+_server: ThreadingHTTPServer | None = None
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> None:
+    """
+    Serve ``/metrics`` from a daemon thread, for processes without the API.
+
+    Celery workers call this once on startup. Scrapes only read the metric
+    dicts, so they never block the worker event loop.
+    """
+    global _server
+
+    if _server is not None:
+        return
+    try:
+        _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.warning("metrics_server_failed", port=port, error=str(e))
+        return
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="metrics-exporter", daemon=True).start()
+    logger.info("metrics_server_started", port=port)
+
+
+def stop_metrics_server() -> None:
+    """Stop the exporter started by ``start_metrics_server``."""
+    global _server
+
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
+
+
+register_metric(
+    "http_request_duration_seconds",
+    "histogram",
+    "HTTP request duration until the response starts, by route template.",
+    ("method", "route", "status"),
+    http_request_duration,
+)
+register_metric(
+    "workflow_node_duration_seconds",
+    "histogram",
+    "Workflow graph node execution time.",
+    ("node",),
+    node_latency,
+)
+register_metric(
+    "agent_runs_total",
+    "counter",
+    "Agent runs by outcome, after retries.",
+    ("agent", "outcome"),
+    agent_results,
+)
+register_metric(
+    "agent_confidence_score",
+    "histogram",
+    "Confidence score reported by successful agent runs.",
+    ("agent",),
+    agent_confidence,
+)
+register_metric(
+    "db_pool_checkout_wait_seconds",
+    "histogram",
+    "Time spent waiting for a database connection from the pool.",
+    (),
+    lambda: {(): pool_checkout_wait},
+)
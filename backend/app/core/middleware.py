@@ -2,73 +2,114 @@
 
 import time
 import uuid
-from typing import Callable
 
 import structlog
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-logger = structlog.get_logger()
+from app.core.metrics import observe_request
+from app.core.tracing import start_span
 
+logger = structlog.get_logger()
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
-    """Middleware to add unique request ID to each request."""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Add request ID to request state and response headers."""
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
-        request.state.request_id = request_id
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the route that handled a request, e.g. ``/api/v1/customers/{customer_id}``.
 
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
+    Metrics are labelled with the template rather than the raw path so that
+    IDs in URLs don't create a new series per request.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
 
-        return response
 
+class RequestContextMiddleware:
+    """
+    Request ID, trace span, timing, latency metrics and access log for each request.
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for structured request/response logging."""
+    A plain ASGI middleware rather than a ``BaseHTTPMiddleware``: the request
+    runs in the caller's task with no extra task or body-stream wrapping, so
+    streaming responses such as the SSE progress feed pass straight through.
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Log request details and timing."""
-        start_time = time.perf_counter()
+    The request ID (from ``X-Request-ID`` or generated) is stored on
+    ``request.state.request_id`` and bound to the structlog context. The
+    request runs in a span that continues the caller's ``traceparent``
+    header if it sent one. Response headers carry ``X-Request-ID``,
+    ``X-Trace-ID`` and ``X-Process-Time`` (milliseconds until the response
+    started), and that same time is recorded in the request latency
+    histogram. One access log line is emitted when the response body has
+    been sent, with the total duration.
+    """
 
-        # Get request ID if available
-        request_id = getattr(request.state, "request_id", "unknown")
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap ``app``."""
+        self.app = app
 
-        # Log request
-        await logger.ainfo(
-            "request_started",
-            request_id=request_id,
-            method=request.method,
-            path=request.url.path,
-            client_ip=request.client.host if request.client else "unknown",
-        )
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle one ASGI connection; non-HTTP scopes pass through untouched."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        try:
-            response = await call_next(request)
-            process_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        headers = Headers(scope=scope)
+        request_id = headers.get("x-request-id") or str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        method = scope["method"]
+        status_code = 500
+        response_started = False
+
+        with (
+            structlog.contextvars.bound_contextvars(request_id=request_id),
+            start_span(
+                f"{method} {scope['path']}",
+                traceparent=headers.get("traceparent"),
+                request_id=request_id,
+            ) as span,
+        ):
+
+            async def send_with_context(message: Message) -> None:
+                nonlocal status_code, response_started
+                if message["type"] == "http.response.start":
+                    response_started = True
+                    status_code = message["status"]
+                    process_time = time.perf_counter() - start_time
+                    observe_request(method, route_template(scope), status_code, process_time)
+
+                    response_headers = MutableHeaders(scope=message)
+                    response_headers["X-Request-ID"] = request_id
+                    response_headers["X-Trace-ID"] = span.trace_id
+                    response_headers["X-Process-Time"] = str(round(process_time * 1000, 2))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_context)
+            except Exception as e:
+                duration = time.perf_counter() - start_time
+                if not response_started:
+                    # Not counted at response start, since there was none
+                    observe_request(method, route_template(scope), 500, duration)
+                await logger.aerror(
+                    "request_failed",
+                    method=method,
+                    path=scope["path"],
+                    error=str(e),
+                    duration_ms=round(duration * 1000, 2),
+                )
+                raise
+            finally:
+                # Name the span after the route template once routing has run
+                route = route_template(scope)
+                span.name = f"{method} {route}"
+                span.set_attribute("http.route", route)
+                span.set_attribute("http.status_code", status_code)
 
-            # Log response
             await logger.ainfo(
                 "request_completed",
-                request_id=request_id,
-                method=request.method,
-                path=request.url.path,
-                status_code=response.status_code,
-                duration_ms=round(process_time * 1000, 2),
-            )
-
-            response.headers["X-Process-Time"] = str(round(process_time * 1000, 2))
-            return response
-
-        except Exception as e:
-            process_time = time.perf_counter() - start_time
-            await logger.aerror(
-                "request_failed",
-                request_id=request_id,
-                method=request.method,
-                path=request.url.path,
-                error=str(e),
-                duration_ms=round(process_time * 1000, 2),
+                method=method,
+                path=scope["path"],
+                status_code=status_code,
+                client_ip=scope["client"][0] if scope.get("client") else "unknown",
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
             )
-            raise
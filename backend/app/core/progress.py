@@ -0,0 +1,138 @@
+"""Workflow progress events published over Redis pub/sub and fanned out per process."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import structlog
+from redis.asyncio.client import PubSub
+
+from app.config import settings
+from app.core.events import get_or_create_redis
+
+logger = structlog.get_logger()
+
+# Statuses after which no further progress events are published for a workflow
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+
+def progress_channel(workflow_id: str) -> str:
+    """Redis channel carrying progress events for a workflow."""
+    return f"workflow:{workflow_id}:events"
+
+
+async def publish_progress(workflow_id: str, event: str, data: dict[str, Any]) -> None:
+    """
+    Publish a progress event for a workflow.
+
+    Publishing is fire-and-forget: Redis errors are logged and never fail the
+    caller, and events published while nobody listens are simply dropped.
+    """
+    message = json.dumps({"event": event, "data": data}, default=str)
+    try:
+        await get_or_create_redis().publish(progress_channel(workflow_id), message)
+    except Exception as e:
+        await logger.awarning("progress_publish_failed", workflow_id=workflow_id, error=str(e))
+
+
+class ProgressBroker:
+    """
+    Per-process fan-out of workflow progress events to connected clients.
+
+    A single Redis pub/sub connection is shared by every subscriber in the
+    process. Channels are subscribed when the first client for a workflow
+    connects and unsubscribed when the last one leaves. A reader task
+    dispatches each message to the subscribers' bounded queues; a client that
+    falls behind loses its oldest events instead of slowing down the others.
+    """
+
+    def __init__(self, queue_size: int | None = None) -> None:
+        """Initialize the broker without connecting."""
+        self.queue_size = queue_size or settings.workflow_events_queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._pubsub: PubSub | None = None
+        self._reader: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def subscribe(self, workflow_id: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        Receive progress events for a workflow while the context is open.
+
+        Usage:
+            async with progress_broker.subscribe(workflow_id) as queue:
+                message = await queue.get()
+        """
+        channel = progress_channel(workflow_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        async with self._lock:
+            if self._pubsub is None:
+                self._pubsub = get_or_create_redis().pubsub()
+            if channel not in self._subscribers:
+                await self._pubsub.subscribe(channel)
+                self._subscribers[channel] = set()
+            self._subscribers[channel].add(queue)
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read())
+
+        try:
+            yield queue
+        finally:
+            async with self._lock:
+                queues = self._subscribers.get(channel)
+                if queues is not None:
+                    queues.discard(queue)
+                    if not queues:
+                        del self._subscribers[channel]
+                        try:
+                            await self._pubsub.unsubscribe(channel)
+                        except Exception as e:
+                            await logger.awarning(
+                                "progress_unsubscribe_failed", channel=channel, error=str(e)
+                            )
+
+    async def _read(self) -> None:
+        """Dispatch pub/sub messages to subscriber queues until no channels remain."""
+        while self._subscribers:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+            except Exception as e:
+                await logger.awarning("progress_read_failed", error=str(e))
+                await asyncio.sleep(1.0)
+                continue
+
+            if message is None or message.get("type") != "message":
+                continue
+
+            try:
+                payload = json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+
+            for queue in list(self._subscribers.get(message["channel"], ())):
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(payload)
+
+    async def close(self) -> None:
+        """Stop the reader task and close the pub/sub connection."""
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.close()
+            self._pubsub = None
+        self._subscribers.clear()
+
+
+# Process-wide broker shared by all SSE connections in this API instance
+progress_broker = ProgressBroker()
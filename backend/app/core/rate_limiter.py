@@ -0,0 +1,180 @@
+"""Token-bucket rate limits for outbound integration calls, shared through Redis."""
+
+import asyncio
+import hashlib
+
+import structlog
+
+from app.config import settings
+from app.core.deadline import remaining_time
+from app.core.events import get_or_create_redis
+from app.core.exceptions import RateLimitExceededError
+from app.core.metrics import register_metric
+from app.orchestrator.instrumentation import LatencyHistogram
+
+logger = structlog.get_logger()
+
+# Redis hash holding rate-limit counters summed across all workers
+RATE_LIMIT_WAIT_KEY = "metrics:rate_limit_wait"
+
+# Settings holding the credential each integration authenticates with
+_CREDENTIAL_SETTINGS = {
+    "salesforce": "salesforce_client_id",
+    "docusign": "docusign_integration_key",
+    "sendgrid": "sendgrid_api_key",
+    "twilio": "twilio_account_sid",
+}
+
+# Reserve one token and return {granted, wait}. The bucket refills at ARGV[1]
+# tokens per second up to ARGV[2]. A caller that finds it empty still takes a
+# token, driving the balance negative, and is told how long to wait for it;
+# later callers queue behind it. A reservation whose wait would exceed ARGV[3]
+# is refused and takes nothing. Redis' clock is used so workers agree on time.
+_ACQUIRE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or burst
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / rate
+end
+if wait > max_wait then
+    redis.call('HINCRBY', KEYS[2], ARGV[4] .. ':rejected', 1)
+    return {0, tostring(wait)}
+end
+tokens = tokens - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((burst - tokens) / rate) + 1)
+redis.call('HINCRBY', KEYS[2], ARGV[4] .. ':calls', 1)
+if wait > 0 then
+    redis.call('HINCRBY', KEYS[2], ARGV[4] .. ':throttled', 1)
+    redis.call('HINCRBYFLOAT', KEYS[2], ARGV[4] .. ':wait_sum', tostring(wait))
+end
+return {1, tostring(wait)}
+"""
+
+
+def _credential_id(integration: str) -> str:
+    """Short, non-reversible id of the credential an integration uses."""
+    credential = getattr(settings, _CREDENTIAL_SETTINGS.get(integration, ""), "") or "default"
+    return hashlib.sha256(credential.encode()).hexdigest()[:12]
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limit for one integration credential.
+
+    The bucket lives in Redis, so all worker processes share the provider
+    quota of ``rate`` requests per second with bursts of up to ``burst``.
+    Callers reserve a token and sleep until it is due instead of calling,
+    being rejected with a 429 and retrying. If the wait would outlast
+    ``RATE_LIMIT_MAX_WAIT`` or the workflow deadline the call is refused
+    without taking a token. If Redis is unavailable the limiter fails open.
+    """
+
+    def __init__(self, integration: str, rate: float, burst: int | None = None) -> None:
+        """Initialize a limiter for an integration."""
+        self.integration = integration
+        self.rate = rate
+        self.burst = burst or max(1, round(rate))
+        self.key = f"ratelimit:{integration}:{_credential_id(integration)}"
+
+    async def acquire(self) -> float:
+        """
+        Wait for a token and return the seconds spent waiting.
+
+        Raises:
+            RateLimitExceededError: If the token would not be due in time
+        """
+        max_wait = settings.rate_limit_max_wait
+        remaining = remaining_time()
+        if remaining is not None:
+            max_wait = min(max_wait, remaining)
+
+        try:
+            granted, wait = await get_or_create_redis().eval(
+                _ACQUIRE_SCRIPT,
+                2,
+                self.key,
+                RATE_LIMIT_WAIT_KEY,
+                self.rate,
+                self.burst,
+                max_wait,
+                self.integration,
+            )
+        except Exception as e:
+            await logger.awarning(
+                "rate_limiter_unavailable", integration=self.integration, error=str(e)
+            )
+            return 0.0
+
+        wait = float(wait)
+        if not granted:
+            raise RateLimitExceededError(self.integration, retry_after=wait)
+
+        observe_rate_limit_wait(self.integration, wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+# In-process rate-limit wait histograms, keyed by integration
+rate_limit_wait: dict[str, LatencyHistogram] = {}
+
+
+def observe_rate_limit_wait(integration: str, seconds: float) -> None:
+    """Record how long a call waited for its rate-limit token."""
+    histogram = rate_limit_wait.get(integration)
+    if histogram is None:
+        histogram = rate_limit_wait[integration] = LatencyHistogram()
+    histogram.observe(seconds)
+
+
+async def rate_limit_summary() -> dict[str, dict[str, float]]:
+    """Call, throttle and rejection counts and average wait per integration across all workers."""
+    counters = await get_or_create_redis().hgetall(RATE_LIMIT_WAIT_KEY)
+    summary = {}
+    for integration in settings.integration_rate_limits:
+        calls = int(counters.get(f"{integration}:calls", 0))
+        throttled = int(counters.get(f"{integration}:throttled", 0))
+        wait_sum = float(counters.get(f"{integration}:wait_sum", 0.0))
+        summary[integration] = {
+            "calls": calls,
+            "throttled": throttled,
+            "rejected": int(counters.get(f"{integration}:rejected", 0)),
+            "avg_wait_seconds": round(wait_sum / calls, 3) if calls else 0.0,
+            "total_wait_seconds": round(wait_sum, 3),
+        }
+    return summary
+
+
+# Per-process limiter instances, keyed by integration name
+_limiters: dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(integration: str) -> RateLimiter | None:
+    """Get the limiter for an integration, or None if it has no configured limit."""
+    limiter = _limiters.get(integration)
+    if limiter is None:
+        rate = settings.integration_rate_limits.get(integration)
+        if not rate:
+            return None
+        limiter = _limiters[integration] = RateLimiter(
+            integration, rate, settings.integration_rate_burst.get(integration)
+        )
+    return limiter
+
+
+register_metric(
+    "integration_rate_limit_wait_seconds",
+    "histogram",
+    "Time outbound integration calls waited for a rate-limit token.",
+    ("integration",),
+    rate_limit_wait,
+)
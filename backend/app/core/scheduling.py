@@ -0,0 +1,194 @@
+"""Priority routing, weighted admission and queue-wait metrics for workflow tasks."""
+
+import asyncio
+from collections import deque
+
+import structlog
+from redis.asyncio import Redis
+
+from app.config import settings
+from app.core.events import get_or_create_redis
+from app.core.metrics import register_metric
+from app.models.database.onboarding_workflow import WorkflowPriority
+from app.orchestrator.instrumentation import LatencyHistogram
+
+logger = structlog.get_logger()
+
+# Redis hash holding queue-wait counters summed across all workers
+QUEUE_WAIT_KEY = "metrics:queue_wait"
+
+
+def priority_queue(priority: WorkflowPriority | str) -> str:
+    """Celery queue carrying workflow tasks of a priority."""
+    return f"onboarding.{WorkflowPriority(priority).value}"
+
+
+# Queues in descending priority, as consumed by workflow workers
+PRIORITY_QUEUES = [
+    priority_queue(priority)
+    for priority in (
+        WorkflowPriority.URGENT,
+        WorkflowPriority.HIGH,
+        WorkflowPriority.NORMAL,
+        WorkflowPriority.LOW,
+    )
+]
+
+# Weight of a priority class missing from WORKFLOW_PRIORITY_WEIGHTS
+DEFAULT_PRIORITY_WEIGHT = 1
+
+
+class WeightedSlots:
+    """
+    Concurrency slots shared by priority classes with stride scheduling.
+
+    When every slot is taken, waiters queue per priority. Each freed slot
+    goes to the waiting class with the lowest virtual "pass"; serving a class
+    advances its pass by ``1 / weight``. Over time a class with weight 8 gets
+    eight slots for every one a class with weight 1 gets, but no waiting
+    class is ever starved. A class that has been idle restarts at the current
+    virtual time, so it cannot bank credit and burst past the others.
+
+    Priorities missing from ``weights`` get ``DEFAULT_PRIORITY_WEIGHT``.
+    """
+
+    def __init__(self, capacity: int, weights: dict[str, int]) -> None:
+        """Initialize with ``capacity`` free slots."""
+        invalid = [p for p, weight in weights.items() if weight <= 0]
+        if invalid:
+            raise ValueError(f"Priority weights must be positive: {', '.join(invalid)}")
+        self.capacity = capacity
+        self.weights = weights
+        self._free = capacity
+        self._waiters: dict[str, deque[asyncio.Future]] = {p: deque() for p in weights}
+        self._pass: dict[str, float] = {p: 0.0 for p in weights}
+        self._virtual_time = 0.0
+
+    def _weight(self, priority: str) -> int:
+        return self.weights.get(priority, DEFAULT_PRIORITY_WEIGHT)
+
+    def _has_waiters(self) -> bool:
+        return any(self._waiters.values())
+
+    async def acquire(self, priority: str) -> None:
+        """Take a slot, waiting behind higher-share classes if none is free."""
+        if self._free > 0 and not self._has_waiters():
+            self._free -= 1
+            return
+
+        waiters = self._waiters.setdefault(priority, deque())
+        if not waiters:
+            self._pass[priority] = max(self._pass.get(priority, 0.0), self._virtual_time)
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled
+                self.release()
+            else:
+                waiters.remove(future)
+            raise
+
+    def release(self) -> None:
+        """Free a slot, handing it to the next waiting class if there is one."""
+        waiting = [p for p, waiters in self._waiters.items() if waiters]
+        if not waiting:
+            self._free += 1
+            return
+
+        priority = min(waiting, key=lambda p: self._pass[p])
+        self._virtual_time = self._pass[priority]
+        self._pass[priority] += 1 / self._weight(priority)
+        self._waiters[priority].popleft().set_result(None)
+
+    def waiting(self) -> dict[str, int]:
+        """Number of waiters per priority class."""
+        return {p: len(waiters) for p, waiters in self._waiters.items()}
+
+
+# In-process queue-wait histograms, keyed by priority
+queue_wait: dict[str, LatencyHistogram] = {}
+
+
+async def record_queue_wait(priority: str, seconds: float) -> None:
+    """
+    Record how long a workflow task waited before it started running.
+
+    The wait covers the broker queue and the worker's admission queue. It
+    is kept in an in-process histogram and added to Redis counters shared by
+    all workers.
+    """
+    histogram = queue_wait.get(priority)
+    if histogram is None:
+        histogram = queue_wait[priority] = LatencyHistogram()
+    histogram.observe(seconds)
+
+    try:
+        async with get_or_create_redis().pipeline(transaction=False) as pipe:
+            pipe.hincrby(QUEUE_WAIT_KEY, f"{priority}:count", 1)
+            pipe.hincrbyfloat(QUEUE_WAIT_KEY, f"{priority}:sum", seconds)
+            await pipe.execute()
+    except Exception as e:
+        await logger.awarning("queue_wait_record_failed", priority=priority, error=str(e))
+
+
+async def queue_wait_summary() -> dict[str, dict[str, float]]:
+    """Task counts and average queue wait per priority across all workers."""
+    counters = await get_or_create_redis().hgetall(QUEUE_WAIT_KEY)
+    summary = {}
+    for priority in WorkflowPriority:
+        count = int(counters.get(f"{priority.value}:count", 0))
+        total = float(counters.get(f"{priority.value}:sum", 0.0))
+        summary[priority.value] = {
+            "count": count,
+            "avg_wait_seconds": round(total / count, 3) if count else 0.0,
+        }
+    return summary
+
+
+# Tasks waiting in each priority queue, as of the last ``refresh_queue_depth``
+queue_depth: dict[str, int] = {}
+
+_broker_redis: Redis | None = None
+
+
+async def refresh_queue_depth() -> dict[str, int]:
+    """
+    Read the number of tasks waiting in each workflow queue from the broker.
+
+    The queues are Redis lists on the Celery broker, so this is one LLEN per
+    queue. The last known depths are kept if the broker cannot be reached.
+    """
+    global _broker_redis
+
+    if _broker_redis is None:
+        _broker_redis = Redis.from_url(settings.celery_broker_url, decode_responses=True)
+    try:
+        async with _broker_redis.pipeline(transaction=False) as pipe:
+            for queue in PRIORITY_QUEUES:
+                pipe.llen(queue)
+            depths = await pipe.execute()
+    except Exception as e:
+        await logger.awarning("queue_depth_refresh_failed", error=str(e))
+        return queue_depth
+
+    queue_depth.update(zip(PRIORITY_QUEUES, depths))
+    return queue_depth
+
+
+register_metric(
+    "workflow_task_queue_wait_seconds",
+    "histogram",
+    "Time workflow tasks waited in the broker and admission queues before running.",
+    ("priority",),
+    queue_wait,
+)
+register_metric(
+    "celery_queue_depth",
+    "gauge",
+    "Workflow tasks waiting in each Celery queue.",
+    ("queue",),
+    queue_depth,
+)
@@ -0,0 +1,218 @@
+"""
+Request-to-agent tracing with spans carried in context variables.
+
+A span covers one unit of work: an API request, a Celery task, a graph node,
+an agent run or a tool call. Spans started inside another span become its
+children, and the trace crosses process boundaries as a W3C ``traceparent``
+string (sent with Celery tasks and accepted on API requests). Finished spans
+go to the configured exporter; ``TRACING_EXPORTER=file`` appends them as JSON
+lines to ``TRACING_FILE`` for offline analysis.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Literal
+
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+@dataclass
+class Span:
+    """A timed unit of work within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_time: float  # epoch seconds
+    attributes: dict[str, Any] = field(default_factory=dict)
+    duration_ms: float | None = None
+    status: Literal["ok", "error"] = "ok"
+    error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach a value to the span, e.g. a workflow id or status code."""
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        """W3C trace context header value identifying this span."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the span for exporters."""
+        data = asdict(self)
+        data["start_time"] = datetime.fromtimestamp(self.start_time, timezone.utc).isoformat()
+        return data
+
+
+class SpanExporter(ABC):
+    """Destination for finished spans."""
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        """Send one finished span. Must not raise."""
+
+    def shutdown(self) -> None:
+        """Flush and release resources."""
+
+
+class JsonFileExporter(SpanExporter):
+    """Append spans as JSON lines to a local file."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize the exporter; the file is opened on the first span."""
+        self.path = path
+        self._file = None
+        # Spans finish on the API event loop, worker loop and Celery threads
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        try:
+            with self._lock:
+                if self._file is None:
+                    self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+                self._file.write(line)
+        except OSError as e:
+            logger.warning("span_export_failed", path=self.path, error=str(e))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_exporter: SpanExporter | None = None
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def get_exporter() -> SpanExporter | None:
+    """Get the span exporter, creating it from settings on first use."""
+    global _exporter
+
+    if _exporter is None and settings.tracing_exporter == "file":
+        _exporter = JsonFileExporter(settings.tracing_file)
+    return _exporter
+
+
+def set_exporter(exporter: SpanExporter | None) -> None:
+    """Replace the span exporter, e.g. to send spans to a collector."""
+    global _exporter
+
+    if _exporter is not None:
+        _exporter.shutdown()
+    _exporter = exporter
+
+
+def _new_id(num_bytes: int) -> str:
+    return os.urandom(num_bytes).hex()
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str] | None:
+    """Trace id and parent span id from a ``traceparent`` value, or None if invalid."""
+    if not value:
+        return None
+    match = _TRACEPARENT.match(value.strip().lower())
+    if match is None:
+        return None
+    return match.group(1), match.group(2)
+
+
+def current_span() -> Span | None:
+    """The span active in this context, if any."""
+    return _current_span.get()
+
+
+def current_traceparent() -> str | None:
+    """``traceparent`` of the active span, to hand the trace to another process."""
+    span = _current_span.get()
+    return span.traceparent if span is not None else None
+
+
+def _export(span: Span) -> None:
+    exporter = get_exporter()
+    if exporter is not None:
+        exporter.export(span)
+
+
+@contextmanager
+def start_span(name: str, traceparent: str | None = None, **attributes: Any) -> Iterator[Span]:
+    """
+    Time the block as a span, child of the active span.
+
+    ``traceparent`` continues a trace started in another process instead.
+    Exceptions escaping the block mark the span as failed and propagate.
+    """
+    remote = parse_traceparent(traceparent)
+    parent = _current_span.get()
+    if remote is not None:
+        trace_id, parent_id = remote
+    elif parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    else:
+        trace_id, parent_id = _new_id(16), None
+
+    span = Span(name, trace_id, _new_id(8), parent_id, time.time(), attributes)
+    token = _current_span.set(span)
+    start = time.perf_counter()
+    try:
+        yield span
+    except BaseException as e:
+        span.status = "error"
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+        _current_span.reset(token)
+        _export(span)
+
+
+def record_span(name: str, start_time: float, duration: float, **attributes: Any) -> None:
+    """
+    Export an already finished span as a child of the active span.
+
+    For intervals measured elsewhere, such as the time a task spent queued
+    before this process picked it up.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return
+    span = Span(
+        name,
+        parent.trace_id,
+        _new_id(8),
+        parent.span_id,
+        start_time,
+        attributes,
+        duration_ms=round(duration * 1000, 3),
+    )
+    _export(span)
+
+
+def add_trace_context(
+    logger: Any, method_name: str, event_dict: dict[str, Any]
+) -> dict[str, Any]:
+    """Structlog processor adding the active trace and span ids to every log line."""
+    span = _current_span.get()
+    if span is not None:
+        event_dict.setdefault("trace_id", span.trace_id)
+        event_dict.setdefault("span_id", span.span_id)
+    return event_dict
@@ -0,0 +1,109 @@
+"""Long-lived asyncio event loop for running async work from Celery workers."""
+
+import asyncio
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+import structlog
+
+from app.config import settings
+from app.core.scheduling import WeightedSlots
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+class WorkerEventLoop:
+    """
+    A single asyncio event loop that lives for the whole worker process.
+
+    The loop runs in a daemon thread. Synchronous Celery tasks submit
+    coroutines with ``run()`` and block until they finish. Pool threads
+    submit concurrently, so several workflows share the loop and their awaits
+    interleave. ``max_concurrency`` caps how many coroutines run at the same
+    time; when all slots are busy, waiting coroutines are admitted by weighted
+    fair share of their priority (see ``WeightedSlots``). Objects that are
+    bound to a loop, such as the SQLAlchemy async engine pool, the Redis
+    client and the LLM HTTP clients, stay valid across tasks because the loop
+    is never replaced.
+    """
+
+    def __init__(self, max_concurrency: int, weights: dict[str, int]) -> None:
+        """Initialize the runner without starting it."""
+        self.max_concurrency = max_concurrency
+        self.weights = weights
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._slots: WeightedSlots | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """Check whether the loop thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the loop thread if it is not running yet."""
+        with self._lock:
+            if self.is_running:
+                return
+
+            self._loop = asyncio.new_event_loop()
+            self._slots = WeightedSlots(self.max_concurrency, self.weights)
+            self._thread = threading.Thread(
+                target=self._run_forever, name="worker-event-loop", daemon=True
+            )
+            self._thread.start()
+            logger.info("worker_loop_started", max_concurrency=self.max_concurrency)
+
+    def _run_forever(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def _bounded(self, coro: Coroutine[Any, Any, T], priority: str) -> T:
+        try:
+            await self._slots.acquire(priority)
+        except BaseException:
+            coro.close()
+            raise
+        try:
+            return await coro
+        finally:
+            self._slots.release()
+
+    def run(
+        self,
+        coro: Coroutine[Any, Any, T],
+        timeout: float | None = None,
+        priority: str = "normal",
+    ) -> T:
+        """Run a coroutine on the shared loop and block until it completes."""
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(self._bounded(coro, priority), self._loop)
+        return future.result(timeout)
+
+    def stop(self, cleanup: Coroutine[Any, Any, Any] | None = None) -> None:
+        """Optionally run a cleanup coroutine, then stop and close the loop."""
+        with self._lock:
+            if not self.is_running:
+                if cleanup is not None:
+                    cleanup.close()
+                return
+
+            if cleanup is not None:
+                asyncio.run_coroutine_threadsafe(cleanup, self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._thread = None
+            self._loop = None
+            logger.info("worker_loop_stopped")
+
+
+# Process-wide loop shared by all Celery tasks in this worker
+worker_loop = WorkerEventLoop(
+    max_concurrency=settings.workflow_worker_concurrency,
+    weights=settings.workflow_priority_weights,
+)
@@ -1,22 +1,60 @@
 """Database session factory and engine configuration."""
 
+import time
 from collections.abc import AsyncGenerator
+from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from app.config import settings
+from app.core.metrics import observe_pool_checkout, register_metric
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each connection checkout waits."""
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            observe_pool_checkout(time.perf_counter() - start)
+
 
 # Create async engine
 engine_kwargs = {"echo": settings.debug}
 if settings.debug:
     engine_kwargs["poolclass"] = NullPool
 else:
+    engine_kwargs["poolclass"] = TimedAsyncQueuePool
     engine_kwargs["pool_size"] = settings.database_pool_size
     engine_kwargs["max_overflow"] = settings.database_max_overflow
 
 engine = create_async_engine(str(settings.database_url), **engine_kwargs)
 
+
+def pool_stats() -> dict[str, int]:
+    """Connections in use, idle and opened beyond ``pool_size``, or {} without a pool."""
+    pool = engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return {}
+    return {
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        # Negative until pool_size connections have been opened
+        "overflow": max(0, pool.overflow()),
+    }
+
+
+register_metric(
+    "db_pool_connections",
+    "gauge",
+    "Database pool connections by state.",
+    ("state",),
+    pool_stats,
+)
+
 # Session factory
 async_session_factory = async_sessionmaker(
     engine,
@@ -0,0 +1 @@
+"""Bulk data imports."""
@@ -0,0 +1,367 @@
+"""Streaming bulk import of onboarding workflows from CSV or NDJSON uploads."""
+
+import asyncio
+import csv
+import json
+import os
+import tempfile
+import uuid
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any
+
+import structlog
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.analytics.rollups import record_created_workflows
+from app.config import settings
+from app.core.cache import ANALYTICS_NAMESPACE, invalidate_cache
+from app.database.session import async_session_factory
+from app.models.database.customer import Customer, CustomerStatus, CustomerType
+from app.models.database.import_job import ImportFormat, ImportJob, ImportJobStatus
+from app.models.database.onboarding_workflow import OnboardingWorkflow, WorkflowStatus
+from app.models.schemas.onboarding import OnboardingWizardCreate
+from app.orchestrator.graphs import DEFAULT_TEMPLATE_VERSION
+from app.orchestrator.workflow_engine import create_initial_state, workflow_engine
+from app.tasks import enqueue_workflow_tasks, run_onboarding_workflow
+
+logger = structlog.get_logger()
+
+# Accepted upload content types
+IMPORT_CONTENT_TYPES = {
+    "text/csv": ImportFormat.CSV,
+    "application/x-ndjson": ImportFormat.NDJSON,
+    "application/ndjson": ImportFormat.NDJSON,
+}
+
+# A parsed row, or an error message if the row could not be parsed
+Row = tuple[int, dict[str, Any] | str]
+
+
+async def spool_upload(chunks: AsyncIterator[bytes]) -> str:
+    """
+    Write a streamed request body to a temporary file and return its path.
+
+    The upload is never held in memory as a whole; the caller owns the file
+    and must delete it.
+    """
+    fd, path = tempfile.mkstemp(prefix="onboarding-import-", suffix=".upload")
+    try:
+        with os.fdopen(fd, "wb") as upload:
+            async for chunk in chunks:
+                upload.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def iter_rows(path: str, import_format: ImportFormat) -> Iterator[Row]:
+    """
+    Yield ``(row number, row)`` pairs from an upload, one row at a time.
+
+    Empty CSV cells are dropped so schema defaults apply, and a CSV
+    ``context`` column is parsed as JSON.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as upload:
+        if import_format == ImportFormat.CSV:
+            for number, record in enumerate(csv.DictReader(upload), start=1):
+                row = {k: v for k, v in record.items() if k is not None and v not in (None, "")}
+                if "context" in row:
+                    try:
+                        row["context"] = json.loads(row["context"])
+                    except ValueError:
+                        yield number, "context: invalid JSON"
+                        continue
+                yield number, row
+            return
+
+        for number, line in enumerate(upload, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield number, "invalid JSON"
+                continue
+            if not isinstance(row, dict):
+                yield number, "row must be a JSON object"
+                continue
+            yield number, row
+
+
+def _chunks(rows: Iterable[Row], size: int) -> Iterator[list[Row]]:
+    """Group rows into lists of at most ``size``."""
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _validate_chunk(
+    rows: list[Row],
+) -> tuple[list[tuple[int, OnboardingWizardCreate]], list[dict[str, Any]]]:
+    """Validate a chunk against the wizard schema, returning valid rows and row errors."""
+    valid: list[tuple[int, OnboardingWizardCreate]] = []
+    errors: list[dict[str, Any]] = []
+    emails: set[str] = set()
+
+    for number, row in rows:
+        if isinstance(row, str):
+            errors.append({"row": number, "error": row})
+            continue
+
+        try:
+            data = OnboardingWizardCreate.model_validate(row)
+        except PydanticValidationError as e:
+            message = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                for error in e.errors()
+            )
+            errors.append({"row": number, "error": message})
+            continue
+
+        if not workflow_engine.has_graph(data.workflow_type, DEFAULT_TEMPLATE_VERSION):
+            errors.append({"row": number, "error": f"Unknown workflow type '{data.workflow_type}'"})
+        elif data.email in emails:
+            errors.append({"row": number, "error": "Duplicate email in upload"})
+        else:
+            emails.add(data.email)
+            valid.append((number, data))
+
+    return valid, errors
+
+
+def _next_chunk(
+    chunks: Iterator[list[Row]],
+) -> tuple[int, list[tuple[int, OnboardingWizardCreate]], list[dict[str, Any]]] | None:
+    """
+    Read and validate the next chunk, or return None at the end of the upload.
+
+    Returns the chunk's row count, valid rows and row errors. This reads the
+    spooled file and runs the schema validation, so it blocks; ``run_import``
+    calls it in a worker thread to keep the event loop free.
+    """
+    chunk = next(chunks, None)
+    if chunk is None:
+        return None
+    return len(chunk), *_validate_chunk(chunk)
+
+
+async def _insert_chunk(
+    session: AsyncSession, valid: list[tuple[int, OnboardingWizardCreate]]
+) -> tuple[dict[str, list[tuple]], list[dict[str, Any]]]:
+    """
+    Insert customers and workflows for a validated chunk.
+
+    Rows whose email already belongs to a customer are skipped and reported.
+    Returns the task arguments to enqueue, grouped by priority, and the
+    row errors.
+    """
+    if not valid:
+        return {}, []
+
+    now = datetime.now(timezone.utc)
+    customer_rows = []
+    for _, data in valid:
+        first_name, _, last_name = data.contact_name.partition(" ")
+        customer_rows.append(
+            {
+                "id": uuid.uuid4(),
+                "email": data.email,
+                "first_name": first_name,
+                "last_name": last_name,
+                "company_name": data.company_name,
+                "customer_type": CustomerType.BUSINESS,
+                "status": CustomerStatus.ONBOARDING,
+                "additional_metadata": {"tax_id": data.tax_id},
+                "source": "bulk_import",
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+
+    # One multi-row statement; existing emails are skipped instead of failing the chunk
+    result = await session.execute(
+        pg_insert(Customer.__table__)
+        .on_conflict_do_nothing(index_elements=["email"])
+        .returning(Customer.__table__.c.email),
+        customer_rows,
+    )
+    inserted = set(result.scalars())
+
+    errors = []
+    workflow_rows = []
+    tasks: dict[str, list[tuple]] = defaultdict(list)
+    for (number, data), customer in zip(valid, customer_rows):
+        if data.email not in inserted:
+            errors.append({"row": number, "error": f"Customer '{data.email}' already exists"})
+            continue
+
+        workflow = {
+            "id": uuid.uuid4(),
+            "customer_id": customer["id"],
+            "workflow_type": data.workflow_type,
+            "template_version": DEFAULT_TEMPLATE_VERSION,
+            "priority": data.priority,
+            "context": data.context,
+            "status": WorkflowStatus.PENDING,
+            "total_steps": 6,
+            "created_at": now,
+            "updated_at": now,
+        }
+        workflow_rows.append(workflow)
+
+        initial_state = create_initial_state(
+            customer_id=str(customer["id"]),
+            workflow_id=str(workflow["id"]),
+            customer_data={
+                "email": customer["email"],
+                "first_name": customer["first_name"],
+                "last_name": customer["last_name"],
+                "company_name": customer["company_name"],
+                "tax_id": data.tax_id,
+            },
+            workflow_type=data.workflow_type,
+            template_version=DEFAULT_TEMPLATE_VERSION,
+        )
+        tasks[data.priority.value].append((initial_state,))
+
+    if workflow_rows:
+        await session.execute(insert(OnboardingWorkflow.__table__), workflow_rows)
+        await record_created_workflows(session, workflow_rows)
+
+    return tasks, errors
+
+
+async def _update_job(
+    session_factory: async_sessionmaker[AsyncSession], job_id: uuid.UUID, **values: Any
+) -> None:
+    """Update an import job in its own transaction."""
+    async with session_factory() as session:
+        await session.execute(update(ImportJob).where(ImportJob.id == job_id).values(**values))
+        await session.commit()
+
+
+async def run_import(
+    job_id: uuid.UUID,
+    path: str,
+    import_format: ImportFormat,
+    session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+) -> None:
+    """
+    Import a spooled upload in chunks of ``settings.bulk_import_chunk_size`` rows.
+
+    Each chunk is validated, inserted with multi-row statements and committed
+    together with the job's progress counters, then its workflows are
+    enqueued. A failure stops the import but keeps the chunks already
+    committed. The spooled file is deleted when the import ends.
+    """
+    processed = imported = failed = 0
+    errors: list[dict[str, Any]] = []
+    chunks = _chunks(iter_rows(path, import_format), settings.bulk_import_chunk_size)
+
+    try:
+        await _update_job(
+            session_factory,
+            job_id,
+            status=ImportJobStatus.RUNNING,
+            started_at=datetime.now(timezone.utc),
+        )
+
+        while (next_chunk := await asyncio.to_thread(_next_chunk, chunks)) is not None:
+            size, valid, chunk_errors = next_chunk
+
+            async with session_factory() as session:
+                tasks, insert_errors = await _insert_chunk(session, valid)
+                chunk_errors.extend(insert_errors)
+
+                processed += size
+                failed += len(chunk_errors)
+                imported += size - len(chunk_errors)
+                errors.extend(chunk_errors[: max(0, settings.bulk_import_max_errors - len(errors))])
+
+                await session.execute(
+                    update(ImportJob)
+                    .where(ImportJob.id == job_id)
+                    .values(
+                        processed_rows=processed,
+                        imported_rows=imported,
+                        failed_rows=failed,
+                        errors=errors,
+                    )
+                )
+                await session.commit()
+
+            # Publish after the commit so workers never pick up uncommitted workflows
+            for priority, args_list in tasks.items():
+                await asyncio.to_thread(
+                    enqueue_workflow_tasks, run_onboarding_workflow, args_list, priority
+                )
+            if tasks:
+                await invalidate_cache(ANALYTICS_NAMESPACE)
+
+        await _update_job(
+            session_factory,
+            job_id,
+            status=ImportJobStatus.COMPLETED,
+            completed_at=datetime.now(timezone.utc),
+        )
+        await logger.ainfo(
+            "bulk_import_completed",
+            job_id=str(job_id),
+            processed=processed,
+            imported=imported,
+            failed=failed,
+        )
+
+    except Exception as e:
+        await logger.aerror("bulk_import_failed", job_id=str(job_id), error=str(e))
+        await _update_job(
+            session_factory,
+            job_id,
+            status=ImportJobStatus.FAILED,
+            error_message=str(e),
+            completed_at=datetime.now(timezone.utc),
+        )
+
+    finally:
+        chunks.close()
+        os.unlink(path)
+
+
+async def fail_orphaned_imports(
+    session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+) -> int:
+    """
+    Mark unfinished imports that stopped making progress as failed.
+
+    Imports run in the API process that received the upload, so a restart
+    abandons them along with their spooled file. Called on startup; a job
+    counts as orphaned once it has not been updated for
+    ``settings.bulk_import_stale_after`` seconds, which leaves imports still
+    running on other API instances alone. Returns the number of jobs failed.
+    """
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        result = await session.execute(
+            update(ImportJob)
+            .where(
+                ImportJob.status.in_([ImportJobStatus.PENDING, ImportJobStatus.RUNNING]),
+                ImportJob.updated_at < now - timedelta(seconds=settings.bulk_import_stale_after),
+            )
+            .values(
+                status=ImportJobStatus.FAILED,
+                error_message="Import interrupted by a server restart",
+                completed_at=now,
+            )
+        )
+        await session.commit()
+
+    if result.rowcount:
+        await logger.awarning("bulk_imports_orphaned", count=result.rowcount)
+    return result.rowcount
@@ -3,14 +3,17 @@
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 
 from app.api.v1.router import api_router
 from app.config import settings
 from app.core.events import create_start_handler, create_stop_handler
-from app.core.middleware import LoggingMiddleware, RequestIdMiddleware
+from app.core.metrics import CONTENT_TYPE, render_metrics
+from app.core.middleware import RequestContextMiddleware
+from app.core.scheduling import refresh_queue_depth
+from app.imports.bulk_onboarding import fail_orphaned_imports
 
 
 @asynccontextmanager
@@ -18,6 +21,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager for startup and shutdown events."""
     # Startup
     await create_start_handler()
+    await fail_orphaned_imports()
     yield
     # Shutdown
     await create_stop_handler()
@@ -35,7 +39,7 @@ def create_application() -> FastAPI:
         lifespan=lifespan,
     )
 
-    # Add middleware (order matters - first added is outermost)
+    # Add middleware (order matters - last added is outermost)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_origins,
@@ -44,8 +48,8 @@ def create_application() -> FastAPI:
         allow_headers=settings.cors_allow_headers,
     )
     app.add_middleware(GZipMiddleware, minimum_size=1000)
-    app.add_middleware(RequestIdMiddleware)
-    app.add_middleware(LoggingMiddleware)
+    # Outermost, so timing and the access log cover the whole stack
+    app.add_middleware(RequestContextMiddleware)
 
     # Include API router
     app.include_router(api_router, prefix=settings.api_prefix)
@@ -65,3 +69,10 @@ async def root() -> dict[str, str]:
         "environment": settings.environment,
         "docs": "/docs" if settings.debug else "disabled",
     }
+
+
+@app.get("/metrics", tags=["Root"], include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus metrics for this API process, plus the Celery queue depths."""
+    await refresh_queue_depth()
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
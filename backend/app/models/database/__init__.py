@@ -1,17 +1,26 @@
 """Database models module initialization."""
 
+from app.models.database.analytics_rollup import StepRollup, WorkflowRollup
 from app.models.database.base import Base
 from app.models.database.customer import Customer
 from app.models.database.document import Document
+from app.models.database.import_job import ImportJob
 from app.models.database.onboarding_workflow import OnboardingWorkflow
 from app.models.database.user import User
+from app.models.database.workflow_checkpoint import WorkflowCheckpoint
+from app.models.database.workflow_state_delta import WorkflowStateDelta
 from app.models.database.workflow_step import WorkflowStep
 
 __all__ = [
     "Base",
     "Customer",
     "Document",
+    "ImportJob",
     "OnboardingWorkflow",
+    "StepRollup",
     "User",
+    "WorkflowCheckpoint",
+    "WorkflowRollup",
+    "WorkflowStateDelta",
     "WorkflowStep",
 ]
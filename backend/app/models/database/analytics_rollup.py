@@ -0,0 +1,45 @@
+"""Pre-aggregated analytics rollup database models."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, Float, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.database.base import BaseModel
+from app.models.database.onboarding_workflow import WorkflowStatus
+from app.models.database.workflow_step import StepStatus
+
+
+class WorkflowRollup(BaseModel):
+    """
+    Hourly workflow counters per workflow type and status.
+
+    ``bucket`` is the hour the workflows were created in. A workflow is counted
+    under its current status, so a status change moves one count between rows.
+    """
+
+    __tablename__ = "workflow_rollups"
+    __table_args__ = (UniqueConstraint("bucket", "workflow_type", "status"),)
+
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    workflow_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    status: Mapped[WorkflowStatus] = mapped_column(Enum(WorkflowStatus), nullable=False)
+
+    workflow_count: Mapped[int] = mapped_column(Integer, default=0)
+    duration_seconds_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    duration_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class StepRollup(BaseModel):
+    """Hourly workflow step counters per step name and status."""
+
+    __tablename__ = "step_rollups"
+    __table_args__ = (UniqueConstraint("bucket", "step_name", "status"),)
+
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    step_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    status: Mapped[StepStatus] = mapped_column(Enum(StepStatus), nullable=False)
+
+    execution_count: Mapped[int] = mapped_column(Integer, default=0)
+    duration_seconds_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    duration_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -0,0 +1,55 @@
+"""Bulk import job database model."""
+
+import enum
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, Integer, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.database.base import BaseModel
+
+
+class ImportFormat(str, enum.Enum):
+    """Format of an uploaded import file."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ImportJobStatus(str, enum.Enum):
+    """Bulk import job lifecycle status."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ImportJob(BaseModel):
+    """Progress of a bulk onboarding import."""
+
+    __tablename__ = "import_jobs"
+
+    format: Mapped[ImportFormat] = mapped_column(Enum(ImportFormat), nullable=False)
+    status: Mapped[ImportJobStatus] = mapped_column(
+        Enum(ImportJobStatus), default=ImportJobStatus.PENDING, index=True
+    )
+
+    # Progress counters, updated after every chunk
+    processed_rows: Mapped[int] = mapped_column(Integer, default=0)
+    imported_rows: Mapped[int] = mapped_column(Integer, default=0)
+    failed_rows: Mapped[int] = mapped_column(Integer, default=0)
+
+    # First row-level errors ({"row": n, "error": "..."}), capped in size
+    errors: Mapped[list] = mapped_column(JSONB, default=list)
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Timing
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def is_finished(self) -> bool:
+        """Check if the import has stopped processing rows."""
+        return self.status in [ImportJobStatus.COMPLETED, ImportJobStatus.FAILED]
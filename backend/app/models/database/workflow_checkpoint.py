@@ -0,0 +1,23 @@
+"""LangGraph checkpoint database model."""
+
+from sqlalchemy import String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.database.base import BaseModel
+
+
+class WorkflowCheckpoint(BaseModel):
+    """Serialized LangGraph checkpoint taken after a graph step."""
+
+    __tablename__ = "workflow_checkpoints"
+    __table_args__ = (UniqueConstraint("thread_id", "thread_ts"),)
+
+    # LangGraph thread (the workflow id) and checkpoint timestamp
+    thread_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    thread_ts: Mapped[str] = mapped_column(String(64), nullable=False)
+    parent_ts: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+    # Checkpoint payload as produced by the saver's serializer
+    checkpoint: Mapped[str] = mapped_column(Text, nullable=False)
+    checkpoint_metadata: Mapped[dict] = mapped_column(JSONB, default=dict)
@@ -0,0 +1,38 @@
+"""Append-only workflow state delta database model."""
+
+import uuid
+
+from sqlalchemy import ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.database.base import BaseModel
+
+
+class WorkflowStateDelta(BaseModel):
+    """
+    Changes to a workflow's LangGraph state at one point in time.
+
+    The full state is ``OnboardingWorkflow.state`` with every delta applied in
+    ``sequence`` order, so node transitions append a small row instead of
+    rewriting the whole JSONB document. Lists and dicts that only grow, such
+    as ``messages`` and ``step_metrics``, store just what was added.
+    """
+
+    __tablename__ = "workflow_state_deltas"
+    __table_args__ = (UniqueConstraint("workflow_id", "sequence"),)
+
+    # Indexed through the (workflow_id, sequence) unique constraint; deleted with the workflow
+    workflow_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("onboarding_workflows.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    sequence: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Top-level state keys that changed, mapped to their new values
+    changes: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # List keys that only grew, mapped to the items added at the end
+    appended: Mapped[dict] = mapped_column(JSONB, default=dict)
+    # Dict keys that only gained or changed entries, mapped to those entries
+    merged: Mapped[dict] = mapped_column(JSONB, default=dict)
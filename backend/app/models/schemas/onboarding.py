@@ -6,6 +6,7 @@ from uuid import UUID
 
 from pydantic import Field
 
+from app.models.database.import_job import ImportFormat, ImportJobStatus
 from app.models.database.onboarding_workflow import WorkflowPriority, WorkflowStatus
 from app.models.database.workflow_step import StepStatus, StepType
 from app.models.schemas.common import BaseSchema, IDSchema, TimestampSchema
@@ -112,3 +113,17 @@ class OnboardingStats(BaseSchema):
     avg_completion_time_minutes: float
     success_rate: float
     pending_approvals: int
+
+
+class ImportJobResponse(IDSchema, TimestampSchema):
+    """Bulk onboarding import progress schema."""
+
+    format: ImportFormat
+    status: ImportJobStatus
+    processed_rows: int
+    imported_rows: int
+    failed_rows: int
+    errors: list[dict[str, Any]] = []
+    error_message: str | None
+    started_at: datetime | None
+    completed_at: datetime | None
@@ -0,0 +1,330 @@
+"""Durable LangGraph checkpoint saver backed by Postgres with a Redis write-through layer."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Coroutine, Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Protocol, TypeVar
+
+import structlog
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.core.events import get_or_create_redis
+from app.core.worker_loop import worker_loop
+from app.database.session import async_session_factory
+from app.models.database.workflow_checkpoint import WorkflowCheckpoint
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+@dataclass
+class PendingCheckpoint:
+    """A serialized checkpoint waiting to be written."""
+
+    thread_id: str
+    thread_ts: str
+    parent_ts: str | None
+    payload: str
+    metadata: dict[str, Any]
+
+
+class CheckpointBuffer(Protocol):
+    """Receives the checkpoints of a run so they commit with the run's other writes."""
+
+    workflow_id: str
+
+    def buffer_checkpoint(
+        self, saver: "PostgresCheckpointSaver", checkpoint: PendingCheckpoint
+    ) -> None: ...
+
+
+# Buffer of the run executing in this context, if any (see WorkflowPersistenceWriter)
+_checkpoint_buffer: ContextVar[CheckpointBuffer | None] = ContextVar(
+    "checkpoint_buffer", default=None
+)
+
+
+def set_checkpoint_buffer(buffer: CheckpointBuffer | None) -> Any:
+    """Route checkpoints taken in this context to ``buffer``; returns a reset token."""
+    return _checkpoint_buffer.set(buffer)
+
+
+def reset_checkpoint_buffer(token: Any) -> None:
+    """Undo ``set_checkpoint_buffer``."""
+    _checkpoint_buffer.reset(token)
+
+
+def _cache_key(thread_id: str) -> str:
+    return f"checkpoint:{thread_id}:latest"
+
+
+async def delete_checkpoints(session: AsyncSession, thread_id: str) -> None:
+    """Delete every checkpoint of a thread in the caller's transaction."""
+    await session.execute(
+        delete(WorkflowCheckpoint).where(WorkflowCheckpoint.thread_id == thread_id)
+    )
+
+
+async def evict_cached_checkpoint(thread_id: str) -> None:
+    """Drop a thread's cached checkpoint; call after the delete has committed."""
+    try:
+        await get_or_create_redis().delete(_cache_key(thread_id))
+    except Exception as e:
+        await logger.awarning("checkpoint_cache_evict_failed", error=str(e), thread_id=thread_id)
+
+
+class PostgresCheckpointSaver(BaseCheckpointSaver):
+    """
+    Checkpoint saver that persists the checkpoints taken after graph steps.
+
+    Postgres (``workflow_checkpoints``) is the source of truth. When enabled,
+    the latest checkpoint of each thread is also written through to Redis so
+    resuming a workflow usually costs a single cache read. Redis failures are
+    logged and never fail the workflow.
+
+    While a workflow run is in progress, checkpoints are not written on their
+    own: they are handed to the run's ``WorkflowPersistenceWriter``, which
+    upserts the latest one in the same transaction as the step rows and
+    status, on its next flush. Checkpoints taken outside a run (such as the
+    state update recorded when a workflow is approved) are written directly.
+    A workflow's checkpoints are deleted once it reaches a terminal status.
+
+    The thread id is the workflow id, which lets the approval endpoint resume
+    a workflow exactly where it stopped.
+
+    The synchronous methods run their async counterparts on the worker event
+    loop, where the database engine and Redis client live, so they can be
+    called from Celery threads but not from code running inside an event loop.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+        use_redis: bool | None = None,
+        redis_ttl: int | None = None,
+    ) -> None:
+        """Initialize the saver."""
+        super().__init__()
+        self._session_factory = session_factory
+        self._use_redis = settings.workflow_checkpoint_redis if use_redis is None else use_redis
+        self._redis_ttl = redis_ttl or settings.workflow_checkpoint_ttl
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Load a specific checkpoint, or the latest one for the thread."""
+        return self._run_sync(self.aget_tuple(config))
+
+    def list(
+        self,
+        config: RunnableConfig,
+        *,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints for a thread, newest first."""
+
+        async def collect() -> list[CheckpointTuple]:
+            return [item async for item in self.alist(config, before=before, limit=limit)]
+
+        return iter(self._run_sync(collect()))
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+    ) -> RunnableConfig:
+        """Persist a checkpoint."""
+        return self._run_sync(self.aput(config, checkpoint, metadata))
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Load a specific checkpoint, or the latest one for the thread."""
+        thread_id = config["configurable"]["thread_id"]
+        thread_ts = config["configurable"].get("thread_ts")
+
+        if thread_ts is None:
+            cached = await self._cache_get(thread_id)
+            if cached is not None:
+                return cached
+
+        async with self._session_factory() as session:
+            query = select(WorkflowCheckpoint).where(WorkflowCheckpoint.thread_id == thread_id)
+            if thread_ts is not None:
+                query = query.where(WorkflowCheckpoint.thread_ts == thread_ts)
+            else:
+                query = query.order_by(WorkflowCheckpoint.thread_ts.desc()).limit(1)
+            row = await session.scalar(query)
+
+        if row is None:
+            return None
+        return self._row_to_tuple(row)
+
+    async def alist(
+        self,
+        config: RunnableConfig,
+        *,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """List checkpoints for a thread, newest first, optionally older than ``before``."""
+        thread_id = config["configurable"]["thread_id"]
+
+        query = (
+            select(WorkflowCheckpoint)
+            .where(WorkflowCheckpoint.thread_id == thread_id)
+            .order_by(WorkflowCheckpoint.thread_ts.desc())
+        )
+        if before is not None:
+            query = query.where(WorkflowCheckpoint.thread_ts < before["configurable"]["thread_ts"])
+        if limit is not None:
+            query = query.limit(limit)
+
+        async with self._session_factory() as session:
+            rows = (await session.scalars(query)).all()
+
+        for row in rows:
+            yield self._row_to_tuple(row)
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+    ) -> RunnableConfig:
+        """Hand a checkpoint to the running workflow's writer, or persist it directly."""
+        thread_id = config["configurable"]["thread_id"]
+        pending = PendingCheckpoint(
+            thread_id=thread_id,
+            thread_ts=checkpoint["id"],
+            parent_ts=config["configurable"].get("thread_ts"),
+            payload=self._dumps(checkpoint),
+            # Round-tripped through the serializer so it fits the JSONB column
+            metadata=json.loads(self._dumps(metadata)),
+        )
+
+        buffer = _checkpoint_buffer.get()
+        if buffer is not None and buffer.workflow_id == thread_id:
+            buffer.buffer_checkpoint(self, pending)
+        else:
+            async with self._session_factory() as session:
+                await self.write(session, pending)
+                await session.commit()
+            await self.cache(pending)
+
+        return {"configurable": {"thread_id": thread_id, "thread_ts": pending.thread_ts}}
+
+    async def write(self, session: AsyncSession, pending: PendingCheckpoint) -> None:
+        """Upsert a checkpoint in the caller's transaction."""
+        statement = insert(WorkflowCheckpoint).values(
+            thread_id=pending.thread_id,
+            thread_ts=pending.thread_ts,
+            parent_ts=pending.parent_ts,
+            checkpoint=pending.payload,
+            checkpoint_metadata=pending.metadata,
+        )
+        await session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["thread_id", "thread_ts"],
+                set_={
+                    "checkpoint": pending.payload,
+                    "parent_ts": pending.parent_ts,
+                    "checkpoint_metadata": pending.metadata,
+                },
+            )
+        )
+
+    async def cache(self, pending: PendingCheckpoint) -> None:
+        """Write a committed checkpoint through to Redis as the thread's latest."""
+        if not self._use_redis:
+            return
+        value = json.dumps(
+            {
+                "thread_ts": pending.thread_ts,
+                "parent_ts": pending.parent_ts,
+                "payload": pending.payload,
+                "metadata": pending.metadata,
+            }
+        )
+        try:
+            await get_or_create_redis().set(
+                _cache_key(pending.thread_id), value, ex=self._redis_ttl
+            )
+        except Exception as e:
+            await logger.awarning(
+                "checkpoint_cache_write_failed", error=str(e), thread_id=pending.thread_id
+            )
+
+    def _run_sync(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run one of the async methods to completion from synchronous code."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return worker_loop.run(coro)
+        coro.close()
+        raise RuntimeError(
+            "PostgresCheckpointSaver's synchronous methods cannot be called from a running "
+            "event loop; use the async methods instead"
+        )
+
+    def _dumps(self, value: Any) -> str:
+        """Serialize a checkpoint or its metadata to text."""
+        data = self.serde.dumps(value)
+        return data.decode("utf-8") if isinstance(data, bytes) else data
+
+    def _row_to_tuple(self, row: WorkflowCheckpoint) -> CheckpointTuple:
+        return self._to_tuple(
+            PendingCheckpoint(
+                thread_id=row.thread_id,
+                thread_ts=row.thread_ts,
+                parent_ts=row.parent_ts,
+                payload=row.checkpoint,
+                metadata=row.checkpoint_metadata or {},
+            )
+        )
+
+    def _to_tuple(self, stored: PendingCheckpoint) -> CheckpointTuple:
+        """Build a CheckpointTuple from stored fields."""
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": stored.thread_id, "thread_ts": stored.thread_ts}},
+            checkpoint=self.serde.loads(stored.payload),
+            metadata=self.serde.loads(json.dumps(stored.metadata)),
+            parent_config=(
+                {"configurable": {"thread_id": stored.thread_id, "thread_ts": stored.parent_ts}}
+                if stored.parent_ts
+                else None
+            ),
+        )
+
+    async def _cache_get(self, thread_id: str) -> CheckpointTuple | None:
+        """Read the latest checkpoint for a thread from Redis, if cached."""
+        if not self._use_redis:
+            return None
+        try:
+            raw = await get_or_create_redis().get(_cache_key(thread_id))
+        except Exception as e:
+            await logger.awarning("checkpoint_cache_read_failed", error=str(e), thread_id=thread_id)
+            return None
+        if raw is None:
+            return None
+        cached = json.loads(raw)
+        return self._to_tuple(
+            PendingCheckpoint(
+                thread_id=thread_id,
+                thread_ts=cached["thread_ts"],
+                parent_ts=cached["parent_ts"],
+                payload=cached["payload"],
+                metadata=cached.get("metadata") or {},
+            )
+        )
@@ -1 +1,9 @@
 """Graphs module initialization."""
+
+from app.orchestrator.graphs.registry import (
+    DEFAULT_TEMPLATE_VERSION,
+    DEFAULT_WORKFLOW_TYPE,
+    GraphRegistry,
+)
+
+__all__ = ["DEFAULT_TEMPLATE_VERSION", "DEFAULT_WORKFLOW_TYPE", "GraphRegistry"]
@@ -4,6 +4,8 @@ import structlog
 from langgraph.graph import END, StateGraph
 
 from app.agents.agent_registry import AgentRegistry
+from app.orchestrator.graphs.registry import GraphRegistry
+from app.orchestrator.instrumentation import InstrumentedStateGraph
 from app.orchestrator.workflow_engine import OnboardingState
 
 logger = structlog.get_logger()
@@ -38,7 +40,7 @@ async def intake_node(state: OnboardingState) -> dict[str, Any]:
             "validated_data": validated_data,
         },
         "current_phase": "parallel_processing",
-        "completed_phases": state["completed_phases"] + ["intake"],
+        "completed_phases": ["intake"],
     }
 
 
@@ -47,19 +49,16 @@ async def identity_verification_node(state: OnboardingState) -> dict[str, Any]:
     workflow_id = state["workflow_id"]
     await logger.ainfo("identity_verification_started", workflow_id=workflow_id)
 
-    agent = AgentRegistry.create("identity")
-    if not agent:
-        raise ValueError("Identity Agent not found in registry")
-
     # Prepare task for agent
     intake_data = state.get("intake_result", {}).get("validated_data", {})
     task = {"type": "verify_identity", "customer_data": intake_data, "workflow_id": workflow_id}
 
     # Execute agent
-    result = await agent.run(task)
+    async with AgentRegistry.acquire("identity") as agent:
+        result = await agent.run(task)
 
     return {
-        "identity_verification_result": {
+        "identity_result": {
             "status": "completed" if result.success else "failed",
             "verified": result.success,
             "confidence_score": result.confidence_score,
@@ -74,10 +73,6 @@ async def legal_documents_node(state: OnboardingState) -> dict[str, Any]:
     workflow_id = state["workflow_id"]
     await logger.ainfo("legal_documents_started", workflow_id=workflow_id)
 
-    agent = AgentRegistry.create("legal")
-    if not agent:
-        raise ValueError("Legal Agent not found in registry")
-
     # Prepare task
     intake_data = state.get("intake_result", {}).get("validated_data", {})
     task = {
@@ -87,10 +82,11 @@ async def legal_documents_node(state: OnboardingState) -> dict[str, Any]:
     }
 
     # Execute agent
-    result = await agent.run(task)
+    async with AgentRegistry.acquire("legal") as agent:
+        result = await agent.run(task)
 
     return {
-        "legal_documents_result": {
+        "legal_result": {
             "status": "completed" if result.success else "failed",
             "contract_generated": result.success,
             "esign_status": "sent" if result.success else "failed",
@@ -109,17 +105,14 @@ async def crm_setup_node(state: OnboardingState) -> dict[str, Any]:
     workflow_id = state["workflow_id"]
     await logger.ainfo("crm_setup_started", workflow_id=workflow_id)
 
-    agent = AgentRegistry.create("crm")
-    if not agent:
-        raise ValueError("CRM Agent not found in registry")
-
     intake_data = state.get("intake_result", {}).get("validated_data", {})
     task = {"action": "create_account", "customer_data": intake_data, "platform": "salesforce"}
 
-    result = await agent.run(task)
+    async with AgentRegistry.acquire("crm") as agent:
+        result = await agent.run(task)
 
     return {
-        "crm_setup_result": {
+        "crm_result": {
             "status": "completed" if result.success else "failed",
             "record_created": result.success,
             "details": result.data,
@@ -131,34 +124,22 @@ async def parallel_processing_node(state: OnboardingState) -> dict[str, Any]:
     """
     Coordinate parallel execution of identity, legal, and CRM tasks.
 
-    This is a synchronization point that triggers parallel agent execution.
+    This is the fan-out point: the graph routes from here to all three agent
+    nodes in the same step, and they are joined again before human review.
+    The agent nodes only write their own ``*_result`` keys, so their updates
+    never conflict.
     """
     await logger.ainfo("parallel_processing_started", workflow_id=state["workflow_id"])
 
-    # In actual implementation, this would trigger parallel execution
-    # For now, we'll call each sequentially but mark them as parallel-capable
     return {
-        "current_phase": "human_review_check",
-        "completed_phases": state["completed_phases"] + ["parallel_processing"],
+        "current_phase": "parallel_processing",
+        "completed_phases": ["parallel_processing"],
     }
 
 
-async def human_review_check_node(state: OnboardingState) -> dict[str, Any]:
-    """Check if human review is required."""
-    await logger.ainfo("human_review_check", workflow_id=state["workflow_id"])
-
-    identity_result = state.get("identity_result", {})
-    confidence = identity_result.get("confidence_score", 1.0)
-
-    # Check for errors in any previous steps
-    errors = []
-    if not identity_result.get("verified"):
-        errors.append("Identity verification failed")
-    if not state.get("legal_result", {}).get("contract_generated"):
-        errors.append("Contract generation failed")
-    if not state.get("crm_result", {}).get("record_created"):
-        errors.append("CRM setup failed")
-
+def _review_outcome(state: OnboardingState, errors: list[str]) -> dict[str, Any]:
+    """Decide whether a workflow needs human review from its identity confidence and errors."""
+    confidence = state.get("identity_result", {}).get("confidence_score", 1.0)
     requires_review = confidence < 0.8 or len(errors) > 0
 
     if requires_review:
@@ -174,26 +155,50 @@ async def human_review_check_node(state: OnboardingState) -> dict[str, Any]:
     return {
         "requires_human_review": False,
         "current_phase": "provisioning",
-        "completed_phases": state["completed_phases"] + ["human_review_check"],
+        "completed_phases": ["human_review_check"],
     }
 
 
+async def human_review_check_node(state: OnboardingState) -> dict[str, Any]:
+    """Check if human review is required."""
+    await logger.ainfo("human_review_check", workflow_id=state["workflow_id"])
+
+    # Check for errors in any previous steps
+    errors = []
+    if not state.get("identity_result", {}).get("verified"):
+        errors.append("Identity verification failed")
+    if not state.get("legal_result", {}).get("contract_generated"):
+        errors.append("Contract generation failed")
+    if not state.get("crm_result", {}).get("record_created"):
+        errors.append("CRM setup failed")
+
+    return _review_outcome(state, errors)
+
+
+async def express_review_check_node(state: OnboardingState) -> dict[str, Any]:
+    """Check if human review is required when only identity verification ran."""
+    await logger.ainfo("human_review_check", workflow_id=state["workflow_id"])
+
+    errors = []
+    if not state.get("identity_result", {}).get("verified"):
+        errors.append("Identity verification failed")
+
+    return _review_outcome(state, errors)
+
+
 async def provisioning_node(state: OnboardingState) -> dict[str, Any]:
     """Provision IT resources using IT Agent."""
     workflow_id = state["workflow_id"]
     await logger.ainfo("provisioning_started", workflow_id=workflow_id)
 
-    agent = AgentRegistry.create("it")
-    if not agent:
-        raise ValueError("IT Agent not found in registry")
-
     intake_data = state.get("intake_result", {}).get("validated_data", {})
     task = {
         "customer_id": state["customer_id"],
         "customer_data": intake_data,
     }
 
-    result = await agent.run(task)
+    async with AgentRegistry.acquire("it") as agent:
+        result = await agent.run(task)
 
     return {
         "provisioning_result": {
@@ -206,7 +211,7 @@ async def provisioning_node(state: OnboardingState) -> dict[str, Any]:
             "courses_assigned": ["onboarding_101", "security_basics"],
         },
         "current_phase": "notification",
-        "completed_phases": state["completed_phases"] + ["provisioning"],
+        "completed_phases": ["provisioning"],
     }
 
 
@@ -215,10 +220,6 @@ async def notification_node(state: OnboardingState) -> dict[str, Any]:
     workflow_id = state["workflow_id"]
     await logger.ainfo("notification_started", workflow_id=workflow_id)
 
-    agent = AgentRegistry.create("communication")
-    if not agent:
-        raise ValueError("Communication Agent not found in registry")
-
     intake_data = state.get("intake_result", {}).get("validated_data", {})
     task = {
         "type": "all",
@@ -227,15 +228,13 @@ async def notification_node(state: OnboardingState) -> dict[str, Any]:
         "message": f"Welcome aboard, {intake_data.get('name')}! Your account setup is complete.",
     }
 
-    result = await agent.run(task)
+    async with AgentRegistry.acquire("communication") as agent:
+        result = await agent.run(task)
 
     return {
         "current_phase": "completed",
-        "completed_phases": state["completed_phases"] + ["notification"],
-        "context": {
-            **state.get("context", {}),
-            "notifications_sent": result.success,
-        },
+        "completed_phases": ["notification"],
+        "context": {"notifications_sent": result.success},
     }
 
 
@@ -248,14 +247,20 @@ def should_continue_to_provisioning(
     return "provisioning"
 
 
+@GraphRegistry.register("standard_onboarding", "1.0.0")
+@GraphRegistry.register("enterprise_onboarding", "1.0.0")
 def build_onboarding_graph() -> StateGraph:
     """
     Build the complete onboarding workflow graph.
 
-    Returns a StateGraph with all nodes and conditional edges.
+    Returns a StateGraph with all nodes and conditional edges. Every node is
+    timed and its agent metadata captured via InstrumentedStateGraph.
+
+    Also registered as ``enterprise_onboarding``, which the onboarding wizard
+    sends for the enterprise tier and which has always run the full graph.
     """
     # Create the graph with OnboardingState
-    graph = StateGraph(OnboardingState)
+    graph = InstrumentedStateGraph(OnboardingState)
 
     # Add nodes
     graph.add_node("intake", intake_node)
@@ -273,12 +278,13 @@ def build_onboarding_graph() -> StateGraph:
     # Add edges
     graph.add_edge("intake", "parallel_processing")
 
-    # Parallel processing triggers multiple nodes
-    # In production, these would run in parallel
-    graph.add_edge("parallel_processing", "identity_verification")
-    graph.add_edge("identity_verification", "legal_documents")
-    graph.add_edge("legal_documents", "crm_setup")
-    graph.add_edge("crm_setup", "human_review_check")
+    # Fan out: identity, legal and CRM run concurrently in the same superstep
+    parallel_nodes = ["identity_verification", "legal_documents", "crm_setup"]
+    for node_name in parallel_nodes:
+        graph.add_edge("parallel_processing", node_name)
+
+    # Fan in: human review waits until all three branches have finished
+    graph.add_edge(parallel_nodes, "human_review_check")
 
     # Conditional routing after human review check
     graph.add_conditional_edges(
@@ -294,3 +300,39 @@ def build_onboarding_graph() -> StateGraph:
     graph.add_edge("notification", END)
 
     return graph
+
+
+@GraphRegistry.register("express_onboarding", "1.0.0")
+def build_express_onboarding_graph() -> StateGraph:
+    """
+    Build a lighter onboarding graph for simple customers.
+
+    Runs intake, identity verification, provisioning and notification only,
+    skipping legal documents and CRM setup. The review node keeps the name
+    ``human_review_check`` so approved workflows resume the same way as the
+    standard graph.
+    """
+    graph = InstrumentedStateGraph(OnboardingState)
+
+    graph.add_node("intake", intake_node)
+    graph.add_node("identity_verification", identity_verification_node)
+    graph.add_node("human_review_check", express_review_check_node)
+    graph.add_node("provisioning", provisioning_node)
+    graph.add_node("notification", notification_node)
+
+    graph.set_entry_point("intake")
+
+    graph.add_edge("intake", "identity_verification")
+    graph.add_edge("identity_verification", "human_review_check")
+    graph.add_conditional_edges(
+        "human_review_check",
+        should_continue_to_provisioning,
+        {
+            "provisioning": "provisioning",
+            "await_approval": END,  # Pause for human approval
+        },
+    )
+    graph.add_edge("provisioning", "notification")
+    graph.add_edge("notification", END)
+
+    return graph
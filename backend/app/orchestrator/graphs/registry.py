@@ -0,0 +1,63 @@
+"""Registry of workflow graph builders keyed by workflow type and template version."""
+
+from collections.abc import Callable
+
+from langgraph.graph import StateGraph
+
+GraphBuilder = Callable[[], StateGraph]
+
+DEFAULT_WORKFLOW_TYPE = "standard_onboarding"
+DEFAULT_TEMPLATE_VERSION = "1.0.0"
+
+
+class GraphRegistry:
+    """
+    Registry for workflow graph builders.
+
+    Each builder is registered under a ``(workflow_type, template_version)``
+    key. Builders can be registered at any time; the workflow engine notices
+    a replaced builder on the next lookup and recompiles that key only.
+    """
+
+    _builders: dict[tuple[str, str], GraphBuilder] = {}
+
+    @classmethod
+    def register(
+        cls,
+        workflow_type: str,
+        template_version: str = DEFAULT_TEMPLATE_VERSION,
+    ) -> Callable[[GraphBuilder], GraphBuilder]:
+        """
+        Decorator to register a graph builder.
+
+        Usage:
+            @GraphRegistry.register("standard_onboarding", "1.0.0")
+            def build_onboarding_graph() -> StateGraph:
+                ...
+        """
+
+        def decorator(builder: GraphBuilder) -> GraphBuilder:
+            cls._builders[(workflow_type, template_version)] = builder
+            return builder
+
+        return decorator
+
+    @classmethod
+    def get(cls, workflow_type: str, template_version: str) -> GraphBuilder | None:
+        """Get the builder for a workflow type and template version."""
+        return cls._builders.get((workflow_type, template_version))
+
+    @classmethod
+    def is_registered(cls, workflow_type: str, template_version: str) -> bool:
+        """Check whether a builder exists for a workflow type and template version."""
+        return (workflow_type, template_version) in cls._builders
+
+    @classmethod
+    def list_graphs(cls) -> list[tuple[str, str]]:
+        """List all registered ``(workflow_type, template_version)`` keys."""
+        return list(cls._builders.keys())
+
+    @classmethod
+    def get_all(cls) -> dict[tuple[str, str], GraphBuilder]:
+        """Get all registered builders."""
+        return cls._builders.copy()
@@ -0,0 +1,187 @@
+"""Per-node timing and agent metrics for workflow graphs."""
+
+import bisect
+import functools
+import time
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from langgraph.graph import StateGraph
+
+from app.core.idempotency import idempotency_scope
+from app.core.tracing import start_span
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+# Upper bounds of the agent confidence score histogram buckets
+CONFIDENCE_BUCKETS: tuple[float, ...] = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 1.0)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Observations only increment integers, so recording is cheap enough to
+    leave on for every node execution.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one observation."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def summary(self) -> dict[str, float]:
+        """Summarize the histogram for logs and reports."""
+        return {
+            "count": self.count,
+            "avg": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+# In-process node latency histograms, keyed by node name
+node_latency: dict[str, LatencyHistogram] = {}
+
+
+def observe_node_latency(node_name: str, seconds: float) -> None:
+    """Record a node execution time in its histogram."""
+    histogram = node_latency.get(node_name)
+    if histogram is None:
+        histogram = node_latency[node_name] = LatencyHistogram()
+    histogram.observe(seconds)
+
+
+def node_latency_summary() -> dict[str, dict[str, float]]:
+    """Summaries of every node's latency histogram in this process."""
+    return {name: histogram.summary() for name, histogram in node_latency.items()}
+
+
+# In-process agent run counts, keyed by (agent name, "success" or "failure")
+agent_results: dict[tuple[str, str], int] = {}
+
+# In-process confidence score histograms of successful agent runs, keyed by agent name
+agent_confidence: dict[str, LatencyHistogram] = {}
+
+
+def observe_agent_result(agent_name: str, success: bool, confidence: float | None) -> None:
+    """Count an agent run and record its confidence score."""
+    key = (agent_name, "success" if success else "failure")
+    agent_results[key] = agent_results.get(key, 0) + 1
+    if success and confidence is not None:
+        histogram = agent_confidence.get(agent_name)
+        if histogram is None:
+            histogram = agent_confidence[agent_name] = LatencyHistogram(CONFIDENCE_BUCKETS)
+        histogram.observe(confidence)
+
+
+@dataclass
+class StepMetrics:
+    """Timing and agent metadata captured while a graph node runs."""
+
+    started_at: str
+    duration_seconds: float = 0.0
+    agent_name: str | None = None
+    llm_model: str | None = None
+    tokens_used: int = 0
+    confidence_score: float | None = None
+    tool_calls: list[str] = field(default_factory=list)
+    attempts: int = 0
+    timeouts: int = 0
+    error: str | None = None
+
+
+_current_step: ContextVar[StepMetrics | None] = ContextVar("current_step", default=None)
+
+
+def record_agent_result(agent: Any, result: Any) -> None:
+    """
+    Attach an agent's result metadata to the node currently being timed.
+
+    Called by ``BaseAgent.run``. The run is always counted in the process-wide
+    agent metrics; the step metadata is only filled inside an instrumented node.
+    """
+    observe_agent_result(agent.name, result.success, result.confidence_score)
+
+    metrics = _current_step.get()
+    if metrics is None:
+        return
+
+    metrics.agent_name = agent.name
+    metrics.llm_model = getattr(agent.llm, "model_name", None) or getattr(
+        agent.llm, "model", None
+    )
+    metrics.tokens_used += result.tokens_used
+    metrics.confidence_score = result.confidence_score
+    metrics.tool_calls.extend(result.tool_calls)
+    metrics.attempts += result.attempts
+    metrics.timeouts += result.timeouts
+    metrics.error = result.error
+
+
+def instrument_node(
+    node_name: str, func: Callable[[Any], Awaitable[dict[str, Any]]]
+) -> Callable[[Any], Awaitable[dict[str, Any]]]:
+    """
+    Wrap a node so its duration and agent metadata are captured.
+
+    The node also runs in its own tracing span, and in an idempotency scope
+    of its workflow and node name, so its side-effecting tool calls carry
+    the same keys whenever the node runs again. The measurements are
+    returned under ``step_metrics[node_name]`` in the node's update, so they
+    reach the engine through the normal event stream.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(state: Any) -> dict[str, Any]:
+        metrics = StepMetrics(started_at=datetime.now(timezone.utc).isoformat())
+        token = _current_step.set(metrics)
+        start = time.perf_counter()
+        try:
+            with (
+                start_span(f"node {node_name}", node=node_name),
+                idempotency_scope(f"{state.get('workflow_id')}:{node_name}"),
+            ):
+                update = await func(state)
+        finally:
+            metrics.duration_seconds = time.perf_counter() - start
+            _current_step.reset(token)
+            observe_node_latency(node_name, metrics.duration_seconds)
+
+        return {**(update or {}), "step_metrics": {node_name: asdict(metrics)}}
+
+    return wrapper
+
+
+class InstrumentedStateGraph(StateGraph):
+    """StateGraph that wraps every added node with ``instrument_node``."""
+
+    def add_node(self, key: str, action: Any, *args: Any, **kwargs: Any) -> Any:
+        return super().add_node(key, instrument_node(key, action), *args, **kwargs)
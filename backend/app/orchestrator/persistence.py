@@ -0,0 +1,307 @@
+"""Batched persistence of workflow progress during graph execution."""
+
+import enum
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.analytics.rollups import record_steps, set_workflow_status
+from app.config import settings
+from app.core.cache import ANALYTICS_NAMESPACE, invalidate_cache
+from app.core.exceptions import CircuitOpenError
+from app.core.progress import publish_progress
+from app.database.session import async_session_factory
+from app.models.database.onboarding_workflow import OnboardingWorkflow, WorkflowStatus
+from app.models.database.workflow_step import StepStatus, StepType, WorkflowStep
+from app.orchestrator.checkpointer import (
+    PendingCheckpoint,
+    PostgresCheckpointSaver,
+    delete_checkpoints,
+    evict_cached_checkpoint,
+    reset_checkpoint_buffer,
+    set_checkpoint_buffer,
+)
+from app.orchestrator.state_store import WorkflowStateStore
+
+logger = structlog.get_logger()
+
+# Number of phases used for the progress percentage
+TOTAL_PHASES = 6
+
+
+class FlushPolicy(str, enum.Enum):
+    """When buffered workflow progress is written to the database."""
+
+    EVERY_NODE = "every_node"
+    EVERY_N = "every_n"
+    PHASE_BOUNDARY = "phase_boundary"
+
+
+class WorkflowPersistenceWriter:
+    """
+    Persists workflow progress for a single run through one session.
+
+    Step rows and workflow updates are buffered in memory and written in a
+    single transaction whenever the flush policy says so:
+
+    - ``every_node``: flush after each node event
+    - ``every_n``: flush once ``flush_every`` steps are buffered
+    - ``phase_boundary``: flush when ``current_phase`` changes, so nodes running
+      inside the same phase (e.g. the parallel agents) share one round trip
+
+    Anything still buffered is always flushed on ``finalize()`` and on exit.
+    State is written as a delta of the keys changed since the previous flush
+    (see ``WorkflowStateStore``) rather than as a full JSONB rewrite.
+
+    Inside the ``async with`` block, LangGraph checkpoints of this workflow
+    are buffered here too (see ``PostgresCheckpointSaver``). Each flush
+    upserts the latest one, so a superstep costs no transaction of its own.
+    When the workflow reaches a terminal status its checkpoints are deleted
+    instead, since there is nothing left to resume.
+
+    Each node and the final status are also published as small progress
+    events (see ``app.core.progress``) as soon as they are recorded, so live
+    clients do not wait for the next flush.
+
+    Usage:
+        async with WorkflowPersistenceWriter(workflow_id) as writer:
+            await writer.record_step(node_name, state, update)
+            await writer.finalize(final_state)
+    """
+
+    def __init__(
+        self,
+        workflow_id: str,
+        policy: FlushPolicy | str | None = None,
+        flush_every: int | None = None,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+    ) -> None:
+        """Initialize the writer for a workflow run."""
+        self.workflow_id = workflow_id
+        self.policy = FlushPolicy(policy or settings.workflow_flush_policy)
+        self.flush_every = max(1, flush_every or settings.workflow_flush_every)
+        self._session_factory = session_factory
+        self._session: AsyncSession | None = None
+        self._workflow: OnboardingWorkflow | None = None
+        self._state_store: WorkflowStateStore | None = None
+        self._latest_state: dict[str, Any] | None = None
+        self._pending_steps: list[WorkflowStep] = []
+        self._pending_changes: dict[str, Any] = {}
+        self._pending_checkpoint: tuple[PostgresCheckpointSaver, PendingCheckpoint] | None = None
+        self._checkpoint_token: Any = None
+        self._last_flushed_phase: str | None = None
+        self.flush_count = 0
+
+    async def __aenter__(self) -> "WorkflowPersistenceWriter":
+        self._session = self._session_factory()
+        self._checkpoint_token = set_checkpoint_buffer(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            await self.flush()
+        except Exception:
+            # Don't replace the error that ended the run; flush() has logged its own
+            if exc_type is None:
+                raise
+        finally:
+            reset_checkpoint_buffer(self._checkpoint_token)
+            await self._session.close()
+            self._session = None
+
+    def buffer_checkpoint(
+        self, saver: PostgresCheckpointSaver, checkpoint: PendingCheckpoint
+    ) -> None:
+        """Keep the latest checkpoint of the run, written with the next flush."""
+        self._pending_checkpoint = (saver, checkpoint)
+
+    async def record_step(
+        self,
+        node_name: str,
+        state: dict[str, Any],
+        update: dict[str, Any],
+    ) -> None:
+        """Buffer a completed node and flush if the policy requires it."""
+        completed_count = len(state.get("completed_phases", []))
+        progress_percentage = int((completed_count / TOTAL_PHASES) * 100)
+        metrics = update.get("step_metrics", {}).get(node_name, {})
+        tool_calls = metrics.get("tool_calls") or []
+
+        self._latest_state = dict(state)
+        self._pending_changes.update(
+            current_step=node_name,
+            completed_steps=completed_count,
+            progress_percentage=progress_percentage,
+        )
+        self._pending_steps.append(
+            WorkflowStep(
+                workflow_id=UUID(self.workflow_id),
+                step_name=node_name,
+                step_type=StepType.AGENT if node_name != "intake" else StepType.INTEGRATION,
+                sequence_order=completed_count,
+                status=StepStatus.COMPLETED,
+                started_at=(
+                    datetime.fromisoformat(metrics["started_at"]) if metrics else None
+                ),
+                completed_at=datetime.now(timezone.utc),
+                duration_seconds=metrics.get("duration_seconds"),
+                agent_name=metrics.get("agent_name"),
+                tool_name=",".join(tool_calls)[:100] or None,
+                tokens_used=metrics.get("tokens_used") if metrics.get("agent_name") else None,
+                llm_model=metrics.get("llm_model"),
+                confidence_score=metrics.get("confidence_score"),
+                retry_count=max(metrics.get("attempts", 0) - 1, 0),
+                error_message=metrics.get("error"),
+                error_code="timeout" if metrics.get("error") and metrics.get("timeouts") else None,
+                output_data={k: v for k, v in update.items() if k.endswith("_result")},
+            )
+        )
+
+        await publish_progress(
+            self.workflow_id,
+            "step",
+            {
+                "step_name": node_name,
+                "current_phase": state.get("current_phase"),
+                "completed_steps": completed_count,
+                "progress_percentage": progress_percentage,
+                "duration_seconds": metrics.get("duration_seconds"),
+                "results": {
+                    key: value.get("status")
+                    for key, value in update.items()
+                    if key.endswith("_result") and isinstance(value, dict)
+                },
+            },
+        )
+
+        if self._should_flush(state):
+            try:
+                await self.flush()
+            except Exception:
+                # Still buffered; the next flush retries it and finalize() raises
+                pass
+
+    def mark_status(self, status: WorkflowStatus) -> None:
+        """Buffer a status change, written with the next flush."""
+        self._pending_changes.update(status=status, error_message=None)
+
+    async def park(self, error: CircuitOpenError) -> None:
+        """Flush what is buffered and park the workflow until the integration recovers."""
+        self._pending_changes.update(
+            status=WorkflowStatus.AWAITING_INPUT,
+            error_message=f"Waiting for {error.integration_name} to recover",
+        )
+        await self.flush()
+        await publish_progress(
+            self.workflow_id,
+            "status",
+            {
+                "status": WorkflowStatus.AWAITING_INPUT.value,
+                "integration": error.integration_name,
+                "retry_after": round(error.retry_after, 3),
+            },
+        )
+
+    async def finalize(self, final_state: dict[str, Any]) -> None:
+        """Record the terminal status of the run and flush everything buffered."""
+        if final_state.get("requires_human_review"):
+            self._pending_changes["status"] = WorkflowStatus.AWAITING_APPROVAL
+        else:
+            self._pending_changes.update(
+                status=WorkflowStatus.COMPLETED,
+                completed_at=datetime.now(timezone.utc),
+                progress_percentage=100,
+            )
+
+        event = {
+            "status": self._pending_changes["status"].value,
+            "progress_percentage": self._pending_changes.get("progress_percentage"),
+            "human_review_reason": final_state.get("human_review_reason"),
+        }
+        await self.flush()
+        # Published after the commit so clients reloading the workflow see the new status
+        await publish_progress(self.workflow_id, "status", event)
+
+    async def flush(self) -> None:
+        """
+        Write buffered step rows and workflow changes in one transaction.
+
+        If the transaction fails, the batch is put back in front of anything
+        buffered since, so nothing is lost and the next flush retries it, and
+        the error is re-raised.
+        """
+        if not self._pending_steps and not self._pending_changes and not self._pending_checkpoint:
+            return
+
+        steps, self._pending_steps = self._pending_steps, []
+        changes, self._pending_changes = self._pending_changes, {}
+        state, self._latest_state = self._latest_state, None
+        checkpoint, self._pending_checkpoint = self._pending_checkpoint, None
+
+        try:
+            workflow = await self._get_workflow()
+            if workflow is None:
+                return
+
+            for field, value in changes.items():
+                if field != "status":
+                    setattr(workflow, field, value)
+            self._session.add_all(steps)
+
+            # Keep the analytics rollups in step with this transaction
+            await record_steps(self._session, steps)
+            if "status" in changes:
+                await set_workflow_status(self._session, workflow, changes["status"])
+            if state is not None:
+                await self._state_store.append(self._session, state)
+            if workflow.is_terminal:
+                await delete_checkpoints(self._session, self.workflow_id)
+            elif checkpoint is not None:
+                await checkpoint[0].write(self._session, checkpoint[1])
+
+            await self._session.commit()
+        except Exception as e:
+            logger.error("persistence_update_failed", error=str(e), workflow_id=self.workflow_id)
+            await self._session.rollback()
+            # The rollback expired the cached instance; reload it on next flush
+            self._workflow = None
+            self._state_store = None
+
+            # Restore the batch; anything recorded since is newer and wins
+            self._pending_steps = steps + self._pending_steps
+            self._pending_changes = {**changes, **self._pending_changes}
+            if self._latest_state is None:
+                self._latest_state = state
+            if self._pending_checkpoint is None:
+                self._pending_checkpoint = checkpoint
+            raise
+
+        self.flush_count += 1
+        if workflow.is_terminal:
+            await evict_cached_checkpoint(self.workflow_id)
+        elif checkpoint is not None:
+            await checkpoint[0].cache(checkpoint[1])
+        if "status" in changes:
+            await invalidate_cache(ANALYTICS_NAMESPACE)
+        if state is not None:
+            self._last_flushed_phase = state.get("current_phase")
+
+    async def _get_workflow(self) -> OnboardingWorkflow | None:
+        """Load the workflow once and keep it in the session's identity map."""
+        if self._workflow is None:
+            self._workflow = await self._session.get(OnboardingWorkflow, UUID(self.workflow_id))
+            if self._workflow is not None:
+                # Diff against the persisted state, which includes earlier runs' deltas
+                self._state_store = await WorkflowStateStore.load(self._session, self._workflow)
+        return self._workflow
+
+    def _should_flush(self, state: dict[str, Any]) -> bool:
+        """Decide whether buffered progress should be written now."""
+        if self.policy == FlushPolicy.EVERY_NODE:
+            return True
+        if self.policy == FlushPolicy.EVERY_N:
+            return len(self._pending_steps) >= self.flush_every
+        return state.get("current_phase") != self._last_flushed_phase
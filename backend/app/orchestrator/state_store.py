@@ -0,0 +1,167 @@
+"""Delta-based storage of workflow state."""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.database.onboarding_workflow import OnboardingWorkflow
+from app.models.database.workflow_state_delta import WorkflowStateDelta
+
+
+@dataclass
+class StateDiff:
+    """Changes between two states, in the form stored on a ``WorkflowStateDelta``."""
+
+    # Keys whose new value replaces the old one
+    changes: dict[str, Any] = field(default_factory=dict)
+    # List keys that only grew, mapped to the items added at the end
+    appended: dict[str, list[Any]] = field(default_factory=dict)
+    # Dict keys that only gained or changed entries, mapped to those entries
+    merged: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes or self.appended or self.merged)
+
+
+def diff_state(previous: dict[str, Any], current: dict[str, Any]) -> StateDiff:
+    """
+    Diff the top-level keys of two states.
+
+    Keys accumulated by a reducer (``messages``, ``completed_phases``,
+    ``step_metrics``...) only ever grow, so for them just the added part is
+    kept rather than the whole value, which keeps each delta proportional to
+    what a node did instead of to the length of the run. Any other change
+    replaces the value.
+    """
+    diff = StateDiff()
+    for key, value in current.items():
+        if key not in previous:
+            diff.changes[key] = value
+            continue
+
+        old = previous[key]
+        if old == value:
+            continue
+        if isinstance(old, list) and isinstance(value, list) and value[: len(old)] == old:
+            diff.appended[key] = value[len(old) :]
+        elif isinstance(old, dict) and isinstance(value, dict) and old.keys() <= value.keys():
+            diff.merged[key] = {k: v for k, v in value.items() if k not in old or old[k] != v}
+        else:
+            diff.changes[key] = value
+    return diff
+
+
+def apply_diff(
+    state: dict[str, Any],
+    changes: dict[str, Any],
+    appended: dict[str, list[Any]],
+    merged: dict[str, dict[str, Any]],
+) -> dict[str, Any]:
+    """Return ``state`` with a delta's changes applied."""
+    state = {**state, **changes}
+    for key, items in appended.items():
+        state[key] = [*state.get(key, []), *items]
+    for key, entries in merged.items():
+        state[key] = {**state.get(key, {}), **entries}
+    return state
+
+
+async def _replay(
+    session: AsyncSession, workflow: OnboardingWorkflow
+) -> tuple[dict[str, Any], int]:
+    """Rebuild a workflow's state, returning it with the sequence of its last delta."""
+    result = await session.execute(
+        select(
+            WorkflowStateDelta.sequence,
+            WorkflowStateDelta.changes,
+            WorkflowStateDelta.appended,
+            WorkflowStateDelta.merged,
+        )
+        .where(WorkflowStateDelta.workflow_id == workflow.id)
+        .order_by(WorkflowStateDelta.sequence)
+    )
+    state = dict(workflow.state or {})
+    last_sequence = 0
+    for sequence, changes, appended, merged in result:
+        state = apply_diff(state, changes, appended or {}, merged or {})
+        last_sequence = sequence
+    return state, last_sequence
+
+
+class WorkflowStateStore:
+    """
+    Stores workflow state as a base snapshot plus append-only deltas.
+
+    ``OnboardingWorkflow.state`` acts as the base snapshot and is no longer
+    rewritten on every node transition. Each write appends a
+    ``WorkflowStateDelta`` row holding only what changed since the previous
+    write (see ``diff_state``); readers rebuild the full state on demand.
+    """
+
+    def __init__(
+        self,
+        workflow: OnboardingWorkflow,
+        state: dict[str, Any] | None = None,
+        last_sequence: int | None = None,
+    ) -> None:
+        """
+        Initialize the store for a loaded workflow.
+
+        ``state`` and ``last_sequence`` describe what is already persisted;
+        without them the store assumes the base snapshot and no deltas. Use
+        ``load()`` for a workflow that may already have deltas.
+        """
+        self.workflow = workflow
+        self._persisted: dict[str, Any] = dict(workflow.state or {}) if state is None else state
+        self._next_sequence: int | None = None if last_sequence is None else last_sequence + 1
+
+    @classmethod
+    async def load(
+        cls, session: AsyncSession, workflow: OnboardingWorkflow
+    ) -> "WorkflowStateStore":
+        """Create a store that diffs against the workflow's latest persisted state."""
+        state, last_sequence = await _replay(session, workflow)
+        return cls(workflow, state, last_sequence)
+
+    async def append(
+        self, session: AsyncSession, state: dict[str, Any]
+    ) -> WorkflowStateDelta | None:
+        """
+        Add a delta for ``state`` to the session.
+
+        Returns None when nothing changed since the last append. The caller
+        owns the transaction.
+        """
+        diff = diff_state(self._persisted, state)
+        if not diff:
+            return None
+
+        if self._next_sequence is None:
+            last = await session.scalar(
+                select(func.max(WorkflowStateDelta.sequence)).where(
+                    WorkflowStateDelta.workflow_id == self.workflow.id
+                )
+            )
+            self._next_sequence = (last or 0) + 1
+
+        delta = WorkflowStateDelta(
+            workflow_id=self.workflow.id,
+            sequence=self._next_sequence,
+            changes=diff.changes,
+            appended=diff.appended,
+            merged=diff.merged,
+        )
+        session.add(delta)
+        self._next_sequence += 1
+        self._persisted = apply_diff(self._persisted, diff.changes, diff.appended, diff.merged)
+        return delta
+
+
+async def load_workflow_state(
+    session: AsyncSession, workflow: OnboardingWorkflow
+) -> dict[str, Any]:
+    """Rebuild the full state of a workflow from its base snapshot and deltas."""
+    state, _ = await _replay(session, workflow)
+    return state
@@ -1,18 +1,40 @@
-from datetime import datetime, timezone
-from typing import Any, TypedDict
-from uuid import UUID
+import operator
+from collections.abc import Callable
+from typing import Annotated, Any, TypedDict, get_type_hints
 
 import structlog
-from langgraph.graph import StateGraph, END
-
-from app.database.session import async_session_factory
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+from app.config import settings
+from app.core.deadline import deadline_scope
+from app.core.exceptions import CircuitOpenError, WorkflowError
+from app.core.tracing import start_span
+from app.models.database.onboarding_workflow import WorkflowStatus
+from app.orchestrator.checkpointer import PostgresCheckpointSaver
+from app.orchestrator.graphs.registry import (
+    DEFAULT_TEMPLATE_VERSION,
+    DEFAULT_WORKFLOW_TYPE,
+    GraphBuilder,
+    GraphRegistry,
+)
+from app.orchestrator.persistence import WorkflowPersistenceWriter
 
 logger = structlog.get_logger()
 
 
+def merge_dicts(left: dict[str, Any] | None, right: dict[str, Any] | None) -> dict[str, Any]:
+    """Reducer that shallow-merges dict updates so parallel nodes don't clobber each other."""
+    return {**(left or {}), **(right or {})}
+
+
 class OnboardingState(TypedDict):
     """
     State structure for the onboarding workflow.
+
+    Keys annotated with a reducer accumulate partial updates instead of being
+    overwritten, which lets the identity, legal and CRM nodes run concurrently
+    and return only the keys they own. Nodes must return deltas for these keys
+    (e.g. ``{"completed_phases": ["intake"]}``), never the full accumulated value.
     """
 
     # Customer information
@@ -21,8 +43,10 @@ class OnboardingState(TypedDict):
 
     # Workflow tracking
     workflow_id: str
+    workflow_type: str
+    template_version: str
     current_phase: str
-    completed_phases: list[str]
+    completed_phases: Annotated[list[str], operator.add]
 
     # Results from each phase
     intake_result: dict[str, Any]
@@ -33,25 +57,62 @@ class OnboardingState(TypedDict):
     provisioning_result: dict[str, Any]
 
     # Error handling
-    errors: list[dict[str, Any]]
+    errors: Annotated[list[dict[str, Any]], operator.add]
     requires_human_review: bool
     human_review_reason: str | None
 
     # Metadata
-    messages: list[dict[str, Any]]
-    context: dict[str, Any]
+    messages: Annotated[list[dict[str, Any]], operator.add]
+    context: Annotated[dict[str, Any], merge_dicts]
+
+    # Per-node timing and agent metadata, keyed by node name
+    step_metrics: Annotated[dict[str, dict[str, Any]], merge_dicts]
+
+
+def _state_reducers() -> dict[str, Any]:
+    """Collect the reducer functions declared on OnboardingState annotations."""
+    reducers = {}
+    for key, hint in get_type_hints(OnboardingState, include_extras=True).items():
+        metadata = getattr(hint, "__metadata__", ())
+        if metadata and callable(metadata[0]):
+            reducers[key] = metadata[0]
+    return reducers
+
+
+_STATE_REDUCERS = _state_reducers()
+
+
+def apply_state_update(state: OnboardingState, update: dict[str, Any]) -> OnboardingState:
+    """
+    Apply a node's partial update to a state snapshot.
+
+    Mirrors how LangGraph merges node outputs into its channels so the engine's
+    view of the state matches the graph's, including for reducer-backed keys.
+    """
+    merged = dict(state)
+    for key, value in update.items():
+        reducer = _STATE_REDUCERS.get(key)
+        if reducer is not None and key in merged:
+            merged[key] = reducer(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
 
 
 def create_initial_state(
     customer_id: str,
     workflow_id: str,
     customer_data: dict[str, Any],
+    workflow_type: str = DEFAULT_WORKFLOW_TYPE,
+    template_version: str = DEFAULT_TEMPLATE_VERSION,
 ) -> OnboardingState:
     """Create initial state for a new onboarding workflow."""
     return OnboardingState(
         customer_id=customer_id,
         customer_data=customer_data,
         workflow_id=workflow_id,
+        workflow_type=workflow_type,
+        template_version=template_version,
         current_phase="intake",
         completed_phases=[],
         intake_result={},
@@ -65,94 +126,154 @@ def create_initial_state(
         human_review_reason=None,
         messages=[],
         context={},
+        step_metrics={},
     )
 
 
+def _load_builtin_graphs() -> None:
+    """Import the bundled graph modules so their builders are registered."""
+    import app.orchestrator.graphs.onboarding_graph  # noqa: F401
+
+
 class WorkflowEngine:
     """
     LangGraph-based workflow engine for orchestrating onboarding.
+
+    Compiled graphs are cached per ``(workflow_type, template_version)``, so
+    each graph is compiled once per process and looked up with a dict access
+    per task. Call ``warm()`` at worker start to compile every registered
+    graph before the first task arrives.
+
+    ``writer_factory`` builds the persistence writer of each run; benchmarks
+    swap in an in-memory writer to run without a database.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        checkpointer: BaseCheckpointSaver | None = None,
+        writer_factory: Callable[[str], WorkflowPersistenceWriter] = WorkflowPersistenceWriter,
+    ) -> None:
         """Initialize the workflow engine."""
-        self.graph: StateGraph | None = None
-        self._compiled = None
-
-    def build_graph(self) -> StateGraph:
-        """Build the onboarding workflow graph."""
-        from app.orchestrator.graphs.onboarding_graph import build_onboarding_graph
-
-        self.graph = build_onboarding_graph()
-        return self.graph
-
-    def compile(self) -> Any:
-        """Compile the graph for execution."""
-        if self.graph is None:
-            self.build_graph()
-        self._compiled = self.graph.compile()
-        return self._compiled
-
-    async def _update_persistence(self, workflow_id: str, node_name: str, state: OnboardingState):
-        """Update database with current workflow state and step info."""
-        from app.models.database.onboarding_workflow import OnboardingWorkflow, WorkflowStatus
-        from app.models.database.workflow_step import WorkflowStep, StepStatus, StepType
-
-        async with async_session_factory() as session:
-            try:
-                # Get workflow
-                workflow_uuid = UUID(workflow_id)
-                workflow = await session.get(OnboardingWorkflow, workflow_uuid)
-                if not workflow:
-                    return
-
-                # Update workflow main status
-                workflow.current_step = node_name
-                workflow.state = dict(state)
-
-                # Simple progress calculation
-                total_phases = 6
-                completed_count = len(state.get("completed_phases", []))
-                workflow.completed_steps = completed_count
-                workflow.progress_percentage = int((completed_count / total_phases) * 100)
-
-                # Create or update step record
-                # Note: This is an simplified version. In production, you'd want to track durations etc.
-                step = WorkflowStep(
-                    workflow_id=workflow_uuid,
-                    step_name=node_name,
-                    step_type=StepType.AGENT if node_name != "intake" else StepType.INTEGRATION,
-                    sequence_order=completed_count,
-                    status=StepStatus.COMPLETED,
-                    completed_at=datetime.now(timezone.utc),
-                    output_data=state.get(f"{node_name}_result", {}),
+        self.checkpointer = checkpointer
+        self.writer_factory = writer_factory
+        self._compiled: dict[tuple[str, str], tuple[GraphBuilder, Any]] = {}
+
+    def has_graph(self, workflow_type: str, template_version: str) -> bool:
+        """Check whether a graph is registered for a workflow type and template version."""
+        _load_builtin_graphs()
+        return GraphRegistry.is_registered(workflow_type, template_version)
+
+    def get_graph(
+        self,
+        workflow_type: str = DEFAULT_WORKFLOW_TYPE,
+        template_version: str = DEFAULT_TEMPLATE_VERSION,
+    ) -> Any:
+        """
+        Get the compiled graph for a workflow type and template version.
+
+        Compiles on first use, and again if the builder registered under the
+        key has been replaced since it was compiled.
+        """
+        key = (workflow_type, template_version)
+        builder = GraphRegistry.get(*key)
+        if builder is None:
+            _load_builtin_graphs()
+            builder = GraphRegistry.get(*key)
+            if builder is None:
+                raise ValueError(
+                    f"No graph registered for '{workflow_type}' version '{template_version}'"
                 )
-                session.add(step)
-
-                await session.commit()
-            except Exception as e:
-                logger.error("persistence_update_failed", error=str(e), workflow_id=workflow_id)
-                await session.rollback()
-
-    async def _finalize_workflow(self, workflow_id: str, final_state: OnboardingState):
-        """Mark workflow as completed in database."""
-        from app.models.database.onboarding_workflow import OnboardingWorkflow, WorkflowStatus
-
-        async with async_session_factory() as session:
-            try:
-                workflow_uuid = UUID(workflow_id)
-                workflow = await session.get(OnboardingWorkflow, workflow_uuid)
-                if workflow:
-                    if final_state.get("requires_human_review"):
-                        workflow.status = WorkflowStatus.AWAITING_APPROVAL
-                    else:
-                        workflow.status = WorkflowStatus.COMPLETED
-                        workflow.completed_at = datetime.now(timezone.utc)
-                        workflow.progress_percentage = 100
-
-                    await session.commit()
-            except Exception as e:
-                logger.error("workflow_finalization_failed", error=str(e), workflow_id=workflow_id)
-                await session.rollback()
+
+        cached = self._compiled.get(key)
+        if cached is not None and cached[0] is builder:
+            return cached[1]
+
+        if self.checkpointer is None:
+            self.checkpointer = PostgresCheckpointSaver()
+        compiled = builder().compile(checkpointer=self.checkpointer)
+        self._compiled[key] = (builder, compiled)
+        logger.info(
+            "workflow_graph_compiled",
+            workflow_type=workflow_type,
+            template_version=template_version,
+        )
+        return compiled
+
+    def warm(self) -> list[tuple[str, str]]:
+        """Compile every registered graph and return the cached keys."""
+        _load_builtin_graphs()
+        for workflow_type, template_version in GraphRegistry.list_graphs():
+            self.get_graph(workflow_type, template_version)
+        return list(self._compiled.keys())
+
+    def _graph_for(self, workflow_id: str, workflow_type: str, template_version: str) -> Any:
+        """Look up the compiled graph for a workflow, raising WorkflowError if unknown."""
+        try:
+            return self.get_graph(workflow_type, template_version)
+        except ValueError as e:
+            raise WorkflowError(str(e), workflow_id=workflow_id) from e
+
+    @staticmethod
+    def _thread_config(workflow_id: str, config: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Bind a run config to the workflow's checkpoint thread."""
+        config = dict(config or {})
+        config["configurable"] = {**config.get("configurable", {}), "thread_id": workflow_id}
+        return config
+
+    async def _run(
+        self,
+        compiled: Any,
+        graph_input: OnboardingState | None,
+        last_state: OnboardingState,
+        config: dict[str, Any],
+        status: WorkflowStatus | None = None,
+    ) -> OnboardingState:
+        """
+        Stream the graph, persisting each node's progress and the final status.
+
+        Agents see the run's remaining time budget through ``deadline_scope``;
+        a resumed run gets a fresh budget. The run is traced as one span, parent
+        of the node spans. If an integration's circuit breaker is open, the
+        workflow is parked in AWAITING_INPUT and the ``CircuitOpenError`` is
+        re-raised for the caller to schedule a resume.
+        """
+        workflow_id = last_state.get("workflow_id")
+
+        with (
+            deadline_scope(settings.workflow_deadline_seconds),
+            start_span("workflow", workflow_id=workflow_id),
+        ):
+            async with self.writer_factory(workflow_id) as writer:
+                if status is not None:
+                    writer.mark_status(status)
+                try:
+                    async for event in compiled.astream(graph_input, config=config):
+                        for node_name, state_update in event.items():
+                            if node_name != "__metadata__":
+                                # Fold the update into our snapshot using the state reducers
+                                last_state = apply_state_update(last_state, state_update)
+                                await writer.record_step(node_name, last_state, state_update)
+                except CircuitOpenError as e:
+                    await logger.awarning(
+                        "workflow_parked",
+                        workflow_id=workflow_id,
+                        integration=e.integration_name,
+                        retry_after=e.retry_after,
+                    )
+                    await writer.park(e)
+                    raise
+
+                await writer.finalize(last_state)
+
+        await logger.ainfo(
+            "workflow_node_timings",
+            workflow_id=workflow_id,
+            durations={
+                name: round(metrics["duration_seconds"], 4)
+                for name, metrics in last_state.get("step_metrics", {}).items()
+            },
+        )
+        return last_state
 
     async def execute(
         self,
@@ -160,21 +281,82 @@ class WorkflowEngine:
         config: dict[str, Any] | None = None,
     ) -> OnboardingState:
         """Execute the workflow and persist progress."""
-        if self._compiled is None:
-            self.compile()
-
-        workflow_id = initial_state.get("workflow_id")
-        last_state = initial_state
+        workflow_id = initial_state["workflow_id"]
+        compiled = self._graph_for(
+            workflow_id,
+            initial_state.get("workflow_type", DEFAULT_WORKFLOW_TYPE),
+            initial_state.get("template_version", DEFAULT_TEMPLATE_VERSION),
+        )
 
-        async for event in self._compiled.astream(initial_state, config=config or {}):
-            for node_name, state_update in event.items():
-                if node_name != "__metadata__":
-                    # Combine existing state with update for persistence
-                    last_state = {**last_state, **state_update}
-                    await self._update_persistence(workflow_id, node_name, last_state)
+        config = self._thread_config(workflow_id, config)
+        return await self._run(compiled, initial_state, initial_state, config)
 
-        await self._finalize_workflow(workflow_id, last_state)
-        return last_state
+    async def resume_after_approval(
+        self,
+        workflow_id: str,
+        workflow_type: str = DEFAULT_WORKFLOW_TYPE,
+        template_version: str = DEFAULT_TEMPLATE_VERSION,
+        config: dict[str, Any] | None = None,
+    ) -> OnboardingState:
+        """
+        Resume a workflow that stopped for human review.
+
+        Loads the last checkpoint, records the approval as if it were the
+        output of ``human_review_check`` and continues from there, so the
+        graph routes straight to provisioning without re-running intake or
+        the identity, legal and CRM agents.
+        """
+        compiled = self._graph_for(workflow_id, workflow_type, template_version)
+
+        config = self._thread_config(workflow_id, config)
+        snapshot = await compiled.aget_state(config)
+        if not snapshot or not snapshot.values:
+            raise WorkflowError("No checkpoint found to resume from", workflow_id=workflow_id)
+
+        await compiled.aupdate_state(
+            config,
+            {
+                "requires_human_review": False,
+                "human_review_reason": None,
+                "current_phase": "provisioning",
+                "completed_phases": ["human_review_check"],
+            },
+            as_node="human_review_check",
+        )
+        snapshot = await compiled.aget_state(config)
+
+        await logger.ainfo("workflow_resuming", workflow_id=workflow_id, next=snapshot.next)
+        return await self._run(compiled, None, snapshot.values, config)
+
+    async def resume(
+        self,
+        workflow_id: str,
+        workflow_type: str = DEFAULT_WORKFLOW_TYPE,
+        template_version: str = DEFAULT_TEMPLATE_VERSION,
+        config: dict[str, Any] | None = None,
+    ) -> OnboardingState:
+        """
+        Resume a parked workflow from its last checkpoint.
+
+        Everything before the superstep that hit an open circuit breaker is
+        restored from the checkpoint. That superstep never completed, so all
+        of its nodes run again, including parallel branches that had already
+        finished or were cancelled when the breaker opened. Their
+        side-effecting tool calls are not repeated: the same calls get the
+        same idempotency keys, and completed ones are replayed from the
+        record kept by ``BaseAgent.invoke_tool``.
+        """
+        compiled = self._graph_for(workflow_id, workflow_type, template_version)
+
+        config = self._thread_config(workflow_id, config)
+        snapshot = await compiled.aget_state(config)
+        if not snapshot or not snapshot.values:
+            raise WorkflowError("No checkpoint found to resume from", workflow_id=workflow_id)
+
+        await logger.ainfo("workflow_resuming", workflow_id=workflow_id, next=snapshot.next)
+        return await self._run(
+            compiled, None, snapshot.values, config, status=WorkflowStatus.IN_PROGRESS
+        )
 
     async def stream(
         self,
@@ -182,10 +364,15 @@ class WorkflowEngine:
         config: dict[str, Any] | None = None,
     ):
         """Stream workflow execution for real-time updates."""
-        if self._compiled is None:
-            self.compile()
-
-        async for state in self._compiled.astream(initial_state, config=config or {}):
+        workflow_id = initial_state["workflow_id"]
+        compiled = self._graph_for(
+            workflow_id,
+            initial_state.get("workflow_type", DEFAULT_WORKFLOW_TYPE),
+            initial_state.get("template_version", DEFAULT_TEMPLATE_VERSION),
+        )
+
+        config = self._thread_config(workflow_id, config)
+        async for state in compiled.astream(initial_state, config=config):
             yield state
 
 
@@ -1,10 +1,38 @@
 """Celery task definitions for background processing."""
 
-import asyncio
+import math
+import random
+import time
+from collections.abc import Coroutine
+from typing import Any
+from uuid import UUID
+
 import structlog
-from celery import Celery
+from celery import Celery, Task
+from celery.concurrency import get_implementation
+from celery.concurrency.thread import TaskPool as ThreadTaskPool
+from celery.signals import (
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+from sqlalchemy import select
 
 from app.config import settings
+from app.core.events import get_redis
+from app.core.exceptions import CircuitOpenError
+from app.core.metrics import start_metrics_server, stop_metrics_server
+from app.core.scheduling import priority_queue, record_queue_wait
+from app.core.tracing import current_traceparent, record_span, start_span
+from app.core.worker_loop import worker_loop
+from app.database.session import async_session_factory, engine
+from app.models.database.onboarding_workflow import (
+    OnboardingWorkflow,
+    WorkflowPriority,
+    WorkflowStatus,
+)
+from app.orchestrator.graphs import DEFAULT_TEMPLATE_VERSION, DEFAULT_WORKFLOW_TYPE
 from app.orchestrator.workflow_engine import workflow_engine
 
 logger = structlog.get_logger()
@@ -25,32 +53,307 @@ celery_app.conf.update(
     enable_utc=True,
     task_track_started=True,
     task_time_limit=3600,  # 1 hour
+    # Workflow tasks go to one queue per WorkflowPriority (see enqueue_workflow_task)
+    task_default_queue=priority_queue(WorkflowPriority.NORMAL),
+    # Take one task per pool thread, so the backlog stays in the broker where
+    # the per-priority queues are polled round-robin
+    worker_prefetch_multiplier=1,
 )
 
 
+def enqueue_workflow_task(
+    task: Task,
+    args: tuple,
+    priority: WorkflowPriority | str = WorkflowPriority.NORMAL,
+    countdown: float | None = None,
+    traceparent: str | None = None,
+) -> None:
+    """
+    Send a workflow task to the queue of its priority.
+
+    Workers consume the per-priority queues round-robin, so a backlog in one
+    queue never blocks the others, and admit tasks to the event loop by
+    weighted fair share (see ``WeightedSlots``). The enqueue time travels
+    with the task so the worker can record how long it waited, and so does
+    the trace context (``traceparent``, by default the active span's) so the
+    worker's spans join the caller's trace.
+    """
+    priority = WorkflowPriority(priority)
+    task.apply_async(
+        args,
+        kwargs=_task_kwargs(priority, time.time() + (countdown or 0), traceparent),
+        queue=priority_queue(priority),
+        countdown=countdown,
+    )
+
+
+def _task_kwargs(
+    priority: WorkflowPriority, enqueued_at: float, traceparent: str | None = None
+) -> dict[str, Any]:
+    """Scheduling and trace metadata sent with every workflow task."""
+    kwargs: dict[str, Any] = {"priority": priority.value, "enqueued_at": enqueued_at}
+    traceparent = traceparent or current_traceparent()
+    if traceparent:
+        kwargs["traceparent"] = traceparent
+    return kwargs
+
+
+def enqueue_workflow_tasks(
+    task: Task,
+    args_list: list[tuple],
+    priority: WorkflowPriority | str = WorkflowPriority.NORMAL,
+) -> None:
+    """
+    Send many workflow tasks of one priority over a single broker connection.
+
+    Bulk imports use this instead of one ``enqueue_workflow_task`` per row so
+    a batch costs one connection checkout rather than one per message.
+    """
+    priority = WorkflowPriority(priority)
+    kwargs = _task_kwargs(priority, time.time())
+    with celery_app.producer_or_acquire() as producer:
+        for args in args_list:
+            task.apply_async(
+                args, kwargs=kwargs, queue=priority_queue(priority), producer=producer
+            )
+
+
+async def _admitted(
+    name: str,
+    coro: Coroutine,
+    priority: str,
+    enqueued_at: float | None,
+    traceparent: str | None,
+) -> Any:
+    """Record the task's queue wait once it is admitted, then run it in the task's span."""
+    with start_span(f"task {name}", traceparent=traceparent, priority=priority):
+        if enqueued_at is not None:
+            wait = max(0.0, time.time() - enqueued_at)
+            record_span("queue_wait", enqueued_at, wait, priority=priority)
+            await record_queue_wait(priority, wait)
+            await logger.ainfo(
+                "workflow_task_admitted", priority=priority, queue_wait=round(wait, 3)
+            )
+        return await coro
+
+
+def _run_workflow(
+    name: str,
+    coro: Coroutine,
+    priority: str,
+    enqueued_at: float | None,
+    traceparent: str | None,
+) -> Any:
+    """Run a workflow coroutine on the worker loop in its priority class."""
+    return worker_loop.run(
+        _admitted(name, coro, priority, enqueued_at, traceparent), priority=priority
+    )
+
+
+async def _dispose_worker_resources() -> None:
+    """Close connections owned by the worker event loop."""
+    redis = get_redis()
+    if redis:
+        await redis.close()
+    await engine.dispose()
+
+
+@worker_process_init.connect
+def _warm_workflow_graphs(**kwargs) -> None:
+    """Compile every registered workflow graph in the process that will run the tasks."""
+    graphs = workflow_engine.warm()
+    logger.info("workflow_graphs_warmed", graphs=[f"{t}@{v}" for t, v in graphs])
+
+
+@worker_init.connect
+def _warm_thread_pool_graphs(sender, **kwargs) -> None:
+    """
+    Warm the graphs in the main worker process when it runs the tasks itself.
+
+    The threads pool starts no pool processes, so ``worker_process_init``
+    is never sent; other pools warm each of their processes instead.
+    """
+    if get_implementation(sender.pool_cls) is ThreadTaskPool:
+        _warm_workflow_graphs()
+
+
+@worker_init.connect
+def _start_metrics_exporter(**kwargs) -> None:
+    """
+    Export this worker's metrics for Prometheus.
+
+    Only the main worker process binds the port: with the threads pool that
+    is the process running the tasks. Prefork children would each need their
+    own port, so they are not exported.
+    """
+    if settings.worker_metrics_port:
+        start_metrics_server(settings.worker_metrics_port)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _stop_worker_loop(**kwargs) -> None:
+    """Dispose pooled connections, then stop the shared event loop and metrics exporter."""
+    worker_loop.stop(cleanup=_dispose_worker_resources())
+    stop_metrics_server()
+
+
+def _schedule_parked_resume(
+    workflow_id: str,
+    workflow_type: str,
+    template_version: str,
+    priority: str,
+    error: CircuitOpenError,
+    traceparent: str | None = None,
+) -> dict:
+    """Schedule a parked workflow to resume once its circuit breaker admits probes."""
+    # Jitter spreads parked workflows out instead of waking them all at once
+    countdown = math.ceil(error.retry_after) + random.randint(0, 5)
+    enqueue_workflow_task(
+        resume_parked_workflow,
+        (workflow_id, workflow_type, template_version),
+        priority=priority,
+        countdown=countdown,
+        traceparent=traceparent,
+    )
+    logger.info(
+        "onboarding_task_parked",
+        workflow_id=workflow_id,
+        integration=error.integration_name,
+        resume_in=countdown,
+    )
+    return {
+        "workflow_id": workflow_id,
+        "status": WorkflowStatus.AWAITING_INPUT.value,
+        "integration": error.integration_name,
+    }
+
+
+async def _is_parked(workflow_id: str) -> bool:
+    """Check that a workflow is still waiting on an integration."""
+    async with async_session_factory() as session:
+        status = await session.scalar(
+            select(OnboardingWorkflow.status).where(OnboardingWorkflow.id == UUID(workflow_id))
+        )
+    return status == WorkflowStatus.AWAITING_INPUT
+
+
 @celery_app.task(name="app.tasks.run_onboarding_workflow")
-def run_onboarding_workflow(initial_state: dict) -> dict:
+def run_onboarding_workflow(
+    initial_state: dict,
+    priority: str = WorkflowPriority.NORMAL.value,
+    enqueued_at: float | None = None,
+    traceparent: str | None = None,
+) -> dict:
     """
     Celery task to execute the onboarding workflow LangGraph.
 
-    This task runs the async workflow engine in a synchronous Celery worker.
+    The workflow runs on the worker's long-lived event loop. Start workers with
+    ``--pool threads --concurrency N`` to run up to N workflows concurrently on
+    that loop, capped by ``WORKFLOW_WORKER_CONCURRENCY``. Use N larger than that
+    cap so waiting tasks can be admitted by priority rather than arrival order.
+    Enqueue with ``enqueue_workflow_task``.
     """
     logger.info("starting_onboarding_task", workflow_id=initial_state.get("workflow_id"))
 
     try:
-        # Run the async workflow execution
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If for some reason a loop is already running, use a different approach
-            # but usually in a celery worker process it won't be.
-            result = loop.run_until_complete(workflow_engine.execute(initial_state))
-        else:
-            result = asyncio.run(workflow_engine.execute(initial_state))
+        result = _run_workflow(
+            "run_onboarding_workflow",
+            workflow_engine.execute(initial_state),
+            priority,
+            enqueued_at,
+            traceparent,
+        )
 
         logger.info("onboarding_task_completed", workflow_id=initial_state.get("workflow_id"))
         return result
+    except CircuitOpenError as e:
+        return _schedule_parked_resume(
+            initial_state["workflow_id"],
+            initial_state.get("workflow_type", DEFAULT_WORKFLOW_TYPE),
+            initial_state.get("template_version", DEFAULT_TEMPLATE_VERSION),
+            priority,
+            e,
+            traceparent,
+        )
     except Exception as e:
         logger.error(
             "onboarding_task_failed", workflow_id=initial_state.get("workflow_id"), error=str(e)
         )
         raise
+
+
+@celery_app.task(name="app.tasks.resume_onboarding_workflow")
+def resume_onboarding_workflow(
+    workflow_id: str,
+    workflow_type: str = DEFAULT_WORKFLOW_TYPE,
+    template_version: str = DEFAULT_TEMPLATE_VERSION,
+    priority: str = WorkflowPriority.NORMAL.value,
+    enqueued_at: float | None = None,
+    traceparent: str | None = None,
+) -> dict:
+    """
+    Celery task to resume an approved onboarding workflow from its checkpoint.
+
+    Continues at provisioning without re-running the earlier agent phases.
+    """
+    logger.info("resuming_onboarding_task", workflow_id=workflow_id)
+
+    try:
+        result = _run_workflow(
+            "resume_onboarding_workflow",
+            workflow_engine.resume_after_approval(workflow_id, workflow_type, template_version),
+            priority,
+            enqueued_at,
+            traceparent,
+        )
+        logger.info("onboarding_task_completed", workflow_id=workflow_id)
+        return result
+    except CircuitOpenError as e:
+        return _schedule_parked_resume(
+            workflow_id, workflow_type, template_version, priority, e, traceparent
+        )
+    except Exception as e:
+        logger.error("onboarding_resume_failed", workflow_id=workflow_id, error=str(e))
+        raise
+
+
+@celery_app.task(name="app.tasks.resume_parked_workflow")
+def resume_parked_workflow(
+    workflow_id: str,
+    workflow_type: str = DEFAULT_WORKFLOW_TYPE,
+    template_version: str = DEFAULT_TEMPLATE_VERSION,
+    priority: str = WorkflowPriority.NORMAL.value,
+    enqueued_at: float | None = None,
+    traceparent: str | None = None,
+) -> dict:
+    """
+    Celery task to resume a workflow parked behind an open circuit breaker.
+
+    The interrupted step runs again as a half-open probe. If the breaker is
+    still open the workflow is parked again and another resume is scheduled.
+    Workflows cancelled while parked are left alone.
+    """
+    if not worker_loop.run(_is_parked(workflow_id)):
+        logger.info("parked_resume_skipped", workflow_id=workflow_id)
+        return {"workflow_id": workflow_id, "skipped": True}
+
+    logger.info("resuming_parked_workflow", workflow_id=workflow_id)
+
+    try:
+        result = _run_workflow(
+            "resume_parked_workflow",
+            workflow_engine.resume(workflow_id, workflow_type, template_version),
+            priority,
+            enqueued_at,
+            traceparent,
+        )
+        logger.info("onboarding_task_completed", workflow_id=workflow_id)
+        return result
+    except CircuitOpenError as e:
+        return _schedule_parked_resume(
+            workflow_id, workflow_type, template_version, priority, e, traceparent
+        )
+    except Exception as e:
+        logger.error("onboarding_resume_failed", workflow_id=workflow_id, error=str(e))
+        raise
@@ -0,0 +1,16 @@
+"""
+Performance benchmarks for the onboarding backend.
+
+Run from the backend directory, for example:
+
+    python -m benchmarks.workflow_throughput --workflows 500 --concurrency 32
+
+Every benchmark prints or writes a JSON report (see ``benchmarks.common``)
+so runs can be compared across commits.
+"""
+
+import os
+
+# Benchmark with pooled connections and without SQL echo unless told otherwise.
+# Set before any benchmark module imports the application settings.
+os.environ.setdefault("DEBUG", "false")
@@ -0,0 +1,269 @@
+"""
+API latency benchmark for the analytics and list endpoints.
+
+Times every ``/analytics/*`` endpoint, customer search and deep pages of the
+onboarding list against the database (seed it first with
+``benchmarks.seed_dataset``). Requests are served in-process through the
+ASGI app, and each case is then replayed once with its SQL captured and
+explained with ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)``, so the report has
+both latency percentiles and the query plans behind them.
+
+Usage:
+    python -m benchmarks.api_latency --iterations 20 --output baseline.json
+    python -m benchmarks.api_latency --base-url http://localhost:8000 --no-explain
+
+With ``--base-url`` the requests go to a running server instead, and plans
+cannot be captured. Analytics responses are cached in Redis; by default the
+cache is invalidated before every request so database time is measured
+(``--cache warm`` measures cache hits instead).
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+from sqlalchemy import event
+
+from app.config import settings
+from app.core.cache import ANALYTICS_NAMESPACE, invalidate_cache
+from app.core.logging_config import configure_logging
+from app.database.session import engine
+from app.main import app
+from benchmarks.common import build_report, latency_summary, peak_rss_mb, write_report
+
+
+@dataclass
+class Case:
+    """One request to benchmark."""
+
+    name: str
+    path: str
+    params: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def cached(self) -> bool:
+        """Whether the endpoint serves responses from the analytics cache."""
+        return self.path.startswith("/analytics/")
+
+
+def analytics_cases() -> list[Case]:
+    """Every GET analytics endpoint with default parameters, plus wider windows."""
+    prefix = f"{settings.api_prefix}/analytics/"
+    paths = [
+        route.path[len(settings.api_prefix) :]
+        for route in app.routes
+        if getattr(route, "path", "").startswith(prefix) and "GET" in getattr(route, "methods", ())
+    ]
+    cases = [
+        Case(f"analytics_{path.removeprefix('/analytics/').replace('-', '_')}", path)
+        for path in paths
+    ]
+    cases += [
+        Case("analytics_summary_365d", "/analytics/summary", {"days": 365}),
+        Case(
+            "analytics_trends_hourly_7d",
+            "/analytics/trends",
+            {"days": 7, "granularity": "hourly"},
+        ),
+        Case(
+            "analytics_trends_weekly_365d",
+            "/analytics/trends",
+            {"days": 365, "granularity": "weekly"},
+        ),
+        Case("analytics_step_analytics_365d", "/analytics/step-analytics", {"days": 365}),
+        Case(
+            "analytics_customer_analytics_365d",
+            "/analytics/customer-analytics",
+            {"days": 365, "limit": 100},
+        ),
+    ]
+    return cases
+
+
+def list_cases(deep_pages: list[int], page_size: int) -> list[Case]:
+    """Customer search and onboarding list pages, from the first page to deep offsets."""
+    cases = [
+        Case("customers_first_page", "/customers"),
+        Case("customers_search_common_name", "/customers", {"search": "smith"}),
+        Case("customers_search_email", "/customers", {"search": "john.lee"}),
+        Case("customers_search_company", "/customers", {"search": "Harbor"}),
+        Case("customers_search_no_match", "/customers", {"search": "zzqxv"}),
+    ]
+    for page in deep_pages:
+        cases.append(
+            Case(f"onboarding_page_{page}", "/onboarding", {"page": page, "page_size": page_size})
+        )
+        cases.append(
+            Case(
+                f"onboarding_completed_page_{page}",
+                "/onboarding",
+                {"page": page, "page_size": page_size, "status": "completed"},
+            )
+        )
+    return cases
+
+
+class StatementCapture:
+    """Collect the SELECT statements executed on the engine while active."""
+
+    def __init__(self) -> None:
+        """Initialize an empty capture."""
+        self.statements: list[tuple[str, Any]] = []
+        self._active = False
+        event.listen(engine.sync_engine, "before_cursor_execute", self._capture)
+
+    def _capture(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self._active and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self) -> "StatementCapture":
+        self.statements = []
+        self._active = True
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._active = False
+
+    def close(self) -> None:
+        """Stop listening on the engine."""
+        event.remove(engine.sync_engine, "before_cursor_execute", self._capture)
+
+
+async def explain(statement: str, parameters: Any) -> dict[str, Any]:
+    """Run EXPLAIN ANALYZE for a captured statement and summarize its plan."""
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters
+        )
+        output = result.scalar()
+        await conn.rollback()
+
+    plan = (json.loads(output) if isinstance(output, str) else output)[0]
+    return {
+        "sql": " ".join(statement.split()),
+        "planning_ms": plan.get("Planning Time"),
+        "execution_ms": plan.get("Execution Time"),
+        "plan": plan["Plan"],
+    }
+
+
+async def run_case(
+    client: httpx.AsyncClient,
+    case: Case,
+    iterations: int,
+    warmup: int,
+    cold_cache: bool,
+) -> dict[str, Any]:
+    """Time one case and return its latency summary and response details."""
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    size = 0
+    url = f"{settings.api_prefix}{case.path}"
+
+    for iteration in range(warmup + iterations):
+        if case.cached and cold_cache:
+            await invalidate_cache(ANALYTICS_NAMESPACE)
+        start = time.perf_counter()
+        response = await client.get(url, params=case.params)
+        elapsed = time.perf_counter() - start
+        if iteration >= warmup:
+            latencies.append(elapsed)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            size = len(response.content)
+
+    return {
+        "path": case.path,
+        "params": case.params,
+        "status_codes": statuses,
+        "response_bytes": size,
+        "latency": latency_summary(latencies),
+    }
+
+
+async def benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every case and collect latencies and plans."""
+    cases = analytics_cases() + list_cases(args.deep_pages, args.page_size)
+    if args.only:
+        cases = [case for case in cases if any(part in case.name for part in args.only)]
+
+    results: dict[str, Any] = {}
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+            for case in cases:
+                results[case.name] = await run_case(
+                    client, case, args.iterations, args.warmup, args.cache == "cold"
+                )
+        return {"cases": results, "peak_rss_mb": peak_rss_mb()}
+
+    capture = StatementCapture()
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://benchmark", timeout=args.timeout
+            ) as client:
+                for case in cases:
+                    result = await run_case(
+                        client, case, args.iterations, args.warmup, args.cache == "cold"
+                    )
+                    if args.explain:
+                        # Replay once with a cold cache so the queries actually run
+                        if case.cached:
+                            await invalidate_cache(ANALYTICS_NAMESPACE)
+                        with capture:
+                            await client.get(
+                                f"{settings.api_prefix}{case.path}", params=case.params
+                            )
+                        result["queries"] = [
+                            await explain(statement, parameters)
+                            for statement, parameters in capture.statements
+                        ]
+                    results[case.name] = result
+    finally:
+        capture.close()
+
+    return {"cases": results, "peak_rss_mb": peak_rss_mb()}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20, help="timed requests per case")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed requests per case")
+    parser.add_argument(
+        "--deep-pages",
+        type=lambda value: [int(page) for page in value.split(",")],
+        default=[1, 100, 1000, 10000],
+        help="comma-separated onboarding list pages",
+    )
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--cache", choices=["cold", "warm"], default="cold")
+    parser.add_argument("--no-explain", dest="explain", action="store_false")
+    parser.add_argument(
+        "--only", nargs="*", help="only run cases whose name contains one of these"
+    )
+    parser.add_argument("--base-url", help="benchmark a running server instead of in-process")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+    if args.base_url:
+        args.explain = False
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark and emit its report."""
+    args = parse_args(argv)
+    configure_logging(log_level="ERROR")
+
+    results = asyncio.run(benchmark(args))
+    parameters = {k: v for k, v in vars(args).items() if k != "output"}
+    write_report(build_report("api_latency", parameters, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
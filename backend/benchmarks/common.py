@@ -0,0 +1,110 @@
+"""Helpers shared by the benchmarks: percentiles, process stats and JSON reports."""
+
+import json
+import math
+import platform
+import resource
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Exact ``q`` quantile (0-1) of ``values`` using the nearest-rank method."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_summary(values: list[float]) -> dict[str, float]:
+    """Count, mean and p50/p95/p99/max of a list of durations in seconds."""
+    return {
+        "count": len(values),
+        "avg": round(sum(values) / len(values), 6) if values else 0.0,
+        "p50": round(percentile(values, 0.50), 6),
+        "p95": round(percentile(values, 0.95), 6),
+        "p99": round(percentile(values, 0.99), 6),
+        "max": round(max(values), 6) if values else 0.0,
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def git_commit() -> str | None:
+    """Commit the benchmark runs against, or None outside a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+class RoundTripCounter:
+    """
+    Count database round trips made through an engine.
+
+    Every statement execution and every transaction BEGIN, COMMIT and
+    ROLLBACK counts as one round trip.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        """Start counting on ``engine``."""
+        self.count = 0
+        self._engine = engine.sync_engine
+        for name in ("before_cursor_execute", "begin", "commit", "rollback"):
+            event.listen(self._engine, name, self._increment)
+
+    def _increment(self, *args: Any, **kwargs: Any) -> None:
+        self.count += 1
+
+    def reset(self) -> None:
+        """Restart counting from zero."""
+        self.count = 0
+
+    def close(self) -> None:
+        """Stop counting."""
+        for name in ("before_cursor_execute", "begin", "commit", "rollback"):
+            event.remove(self._engine, name, self._increment)
+
+
+def build_report(
+    benchmark: str, parameters: dict[str, Any], results: dict[str, Any]
+) -> dict[str, Any]:
+    """Wrap benchmark results with the metadata needed to compare runs."""
+    return {
+        "benchmark": benchmark,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters,
+        "results": results,
+    }
+
+
+def write_report(report: dict[str, Any], output: str | None) -> None:
+    """Write a report as JSON to ``output``, or to stdout when it is None or "-"."""
+    text = json.dumps(report, indent=2, default=str)
+    if output and output != "-":
+        Path(output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
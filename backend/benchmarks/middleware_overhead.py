@@ -0,0 +1,242 @@
+"""
+Per-request overhead of the request middleware.
+
+Calls a minimal FastAPI app directly through its ASGI interface, without a
+server or HTTP client, so the timings are dominated by the middleware
+stack. Three stacks are compared on the same routes:
+
+- ``none``: no middleware
+- ``base_http``: the previous ``RequestIdMiddleware`` + ``LoggingMiddleware``
+  pair built on ``BaseHTTPMiddleware``, reproduced here doing the same work
+  (request ID, trace span, latency metric, access log)
+- ``asgi``: ``RequestContextMiddleware``
+
+The routes are a small JSON response, a path-parameter route and a
+streaming response of many chunks. Logging is filtered at ERROR by default,
+so the comparison covers the middleware mechanics rather than log output.
+
+Usage:
+    python -m benchmarks.middleware_overhead --requests 20000
+    python -m benchmarks.middleware_overhead --chunks 500 --output overhead.json
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+import structlog
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message
+
+from app.core.logging_config import configure_logging
+from app.core.metrics import observe_request
+from app.core.middleware import RequestContextMiddleware, route_template
+from app.core.tracing import start_span
+from benchmarks.common import build_report, latency_summary, peak_rss_mb, write_report
+
+logger = structlog.get_logger()
+
+
+class LegacyRequestIdMiddleware(BaseHTTPMiddleware):
+    """The request ID and tracing half of the previous stack."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        """Add the request ID and run the request in a span."""
+        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        request.state.request_id = request_id
+
+        with start_span(
+            f"{request.method} {request.url.path}",
+            traceparent=request.headers.get("traceparent"),
+            request_id=request_id,
+        ) as span:
+            response = await call_next(request)
+            route = route_template(request.scope)
+            span.name = f"{request.method} {route}"
+            span.set_attribute("http.route", route)
+            span.set_attribute("http.status_code", response.status_code)
+
+        response.headers["X-Request-ID"] = request_id
+        response.headers["X-Trace-ID"] = span.trace_id
+        return response
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """The timing, metrics and logging half of the previous stack."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        """Log, time and record the request."""
+        start_time = time.perf_counter()
+        request_id = getattr(request.state, "request_id", "unknown")
+        await logger.ainfo(
+            "request_started",
+            request_id=request_id,
+            method=request.method,
+            path=request.url.path,
+            client_ip=request.client.host if request.client else "unknown",
+        )
+
+        response = await call_next(request)
+        process_time = time.perf_counter() - start_time
+        observe_request(
+            request.method, route_template(request.scope), response.status_code, process_time
+        )
+        await logger.ainfo(
+            "request_completed",
+            request_id=request_id,
+            method=request.method,
+            path=request.url.path,
+            status_code=response.status_code,
+            duration_ms=round(process_time * 1000, 2),
+        )
+        response.headers["X-Process-Time"] = str(round(process_time * 1000, 2))
+        return response
+
+
+def build_app(stack: str, chunks: int) -> FastAPI:
+    """Benchmark app with the routes under test and the given middleware stack."""
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int) -> dict[str, int]:
+        return {"id": item_id}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def body():
+            for _ in range(chunks):
+                yield b"data: x\n\n"
+
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    if stack == "base_http":
+        app.add_middleware(LegacyRequestIdMiddleware)
+        app.add_middleware(LegacyLoggingMiddleware)
+    elif stack == "asgi":
+        app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+def http_scope(path: str) -> dict[str, Any]:
+    """A minimal ASGI HTTP scope for a GET request."""
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"benchmark"), (b"accept", b"*/*")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+
+
+async def call(app: ASGIApp, path: str) -> int:
+    """Run one request through ``app`` and return the number of body bytes sent."""
+    sent = 0
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive() -> Message:
+        # Like a server: the empty body once, then a disconnect after the response
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        nonlocal sent
+        if message["type"] == "http.response.body":
+            sent += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    await app(http_scope(path), receive, send)
+    return sent
+
+
+async def measure(app: ASGIApp, path: str, requests: int, warmup: int) -> list[float]:
+    """Time ``requests`` sequential calls after ``warmup`` untimed ones."""
+    for _ in range(warmup):
+        await call(app, path)
+
+    durations = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await call(app, path)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+async def benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    """Measure every route under every middleware stack."""
+    paths = {"json": "/ping", "path_param": "/items/42", "streaming": "/stream"}
+    results: dict[str, Any] = {}
+    for name, path in paths.items():
+        timings = {}
+        for stack in args.stacks:
+            # The warm-up requests also build the app's middleware stack
+            app = build_app(stack, args.chunks)
+            timings[stack] = latency_summary(await measure(app, path, args.requests, args.warmup))
+
+        route = {"stacks": timings}
+        if "none" in timings:
+            baseline = timings["none"]
+            route["overhead_us"] = {
+                stack: {
+                    "avg": round((summary["avg"] - baseline["avg"]) * 1e6, 1),
+                    "p50": round((summary["p50"] - baseline["p50"]) * 1e6, 1),
+                    "p99": round((summary["p99"] - baseline["p99"]) * 1e6, 1),
+                }
+                for stack, summary in timings.items()
+                if stack != "none"
+            }
+        results[name] = route
+
+    return {"routes": results, "peak_rss_mb": peak_rss_mb()}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=10000, help="timed requests per case")
+    parser.add_argument("--warmup", type=int, default=500, help="untimed requests per case")
+    parser.add_argument("--chunks", type=int, default=100, help="chunks per streaming response")
+    parser.add_argument(
+        "--stacks",
+        nargs="+",
+        choices=["none", "base_http", "asgi"],
+        default=["none", "base_http", "asgi"],
+    )
+    parser.add_argument("--log-level", default="ERROR", help="structlog level during the run")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark and emit its report."""
+    args = parse_args(argv)
+    configure_logging(log_level=args.log_level)
+
+    results = asyncio.run(benchmark(args))
+    parameters = {k: v for k, v in vars(args).items() if k != "output"}
+    write_report(build_report("middleware_overhead", parameters, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
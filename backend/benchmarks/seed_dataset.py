@@ -0,0 +1,408 @@
+"""
+Seed a large, realistic dataset for API latency benchmarks.
+
+Generates customers, their onboarding workflows and the workflows' steps
+with realistic type, status, priority and time distributions, loads them
+with COPY in batches, rebuilds the analytics rollups and refreshes planner
+statistics. Generation is seeded, so the same options always produce the
+same data.
+
+Usage:
+    python -m benchmarks.seed_dataset --customers 1000000 --truncate
+
+Only run it against a scratch database: ``--truncate`` empties every
+customer, workflow and step table first.
+"""
+
+import argparse
+import asyncio
+import enum
+import json
+import math
+import random
+import sys
+import time
+import uuid
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import asyncpg
+from sqlalchemy import Table
+
+from app.analytics.rollups import rebuild_rollups
+from app.config import settings
+from app.database.session import async_session_factory
+from app.models.database.customer import Customer, CustomerStatus, CustomerType
+from app.models.database.onboarding_workflow import (
+    OnboardingWorkflow,
+    WorkflowPriority,
+    WorkflowStatus,
+)
+from app.models.database.workflow_step import StepStatus, StepType, WorkflowStep
+from benchmarks.common import build_report, peak_rss_mb, write_report
+
+FIRST_NAMES = (
+    "James Mary Robert Patricia John Jennifer Michael Linda David Elizabeth William "
+    "Barbara Richard Susan Joseph Jessica Thomas Sarah Carlos Maria Wei Priya Ahmed Yuki"
+).split()
+LAST_NAMES = (
+    "Smith Johnson Williams Brown Jones Garcia Miller Davis Rodriguez Martinez Hernandez "
+    "Lopez Gonzalez Wilson Anderson Thomas Taylor Moore Jackson Martin Lee Chen Patel Kim"
+).split()
+COMPANY_WORDS = (
+    "Acme Global Summit Apex Blue River Northwind Vertex Pioneer Harbor Quantum Evergreen "
+    "Atlas Nimbus Horizon Cobalt Falcon Granite Meridian Orbit"
+).split()
+COMPANY_SUFFIXES = ["Inc", "LLC", "Ltd", "Group", "Holdings", "Labs", "Systems", "Partners"]
+INDUSTRIES = ["software", "finance", "healthcare", "retail", "manufacturing", "logistics"]
+COMPANY_SIZES = ["1-10", "11-50", "51-200", "201-1000", "1000+"]
+SOURCES = ["website", "referral", "partner", "sales", "bulk_import"]
+
+# Weighted choices as (values, weights)
+CUSTOMER_TYPES = (
+    [CustomerType.INDIVIDUAL, CustomerType.BUSINESS, CustomerType.ENTERPRISE],
+    [30, 55, 15],
+)
+CUSTOMER_STATUSES = (
+    [
+        CustomerStatus.LEAD,
+        CustomerStatus.PROSPECT,
+        CustomerStatus.ONBOARDING,
+        CustomerStatus.ACTIVE,
+        CustomerStatus.CHURNED,
+    ],
+    [5, 5, 25, 60, 5],
+)
+WORKFLOW_TYPES = (["standard_onboarding", "express_onboarding"], [80, 20])
+PRIORITIES = (
+    [WorkflowPriority.LOW, WorkflowPriority.NORMAL, WorkflowPriority.HIGH, WorkflowPriority.URGENT],
+    [10, 70, 15, 5],
+)
+WORKFLOWS_PER_CUSTOMER = ([0, 1, 2, 3], [10, 75, 12, 3])
+
+# Workflow status mix by workflow age: younger workflows are still running
+STATUS_BY_AGE = [
+    (
+        timedelta(days=1),
+        [
+            WorkflowStatus.PENDING,
+            WorkflowStatus.IN_PROGRESS,
+            WorkflowStatus.AWAITING_INPUT,
+            WorkflowStatus.AWAITING_APPROVAL,
+            WorkflowStatus.COMPLETED,
+            WorkflowStatus.FAILED,
+        ],
+        [15, 45, 10, 15, 12, 3],
+    ),
+    (
+        timedelta(days=7),
+        [
+            WorkflowStatus.IN_PROGRESS,
+            WorkflowStatus.AWAITING_INPUT,
+            WorkflowStatus.AWAITING_APPROVAL,
+            WorkflowStatus.COMPLETED,
+            WorkflowStatus.FAILED,
+            WorkflowStatus.CANCELLED,
+        ],
+        [10, 5, 10, 65, 7, 3],
+    ),
+    (
+        timedelta.max,
+        [
+            WorkflowStatus.AWAITING_APPROVAL,
+            WorkflowStatus.COMPLETED,
+            WorkflowStatus.FAILED,
+            WorkflowStatus.CANCELLED,
+        ],
+        [2, 85, 8, 5],
+    ),
+]
+
+# Graph nodes per workflow type with their mean duration in seconds
+STEPS = {
+    "standard_onboarding": [
+        ("intake", 0.05),
+        ("parallel_processing", 0.01),
+        ("identity_verification", 8.0),
+        ("legal_documents", 12.0),
+        ("crm_setup", 4.0),
+        ("human_review_check", 0.02),
+        ("provisioning", 20.0),
+        ("notification", 2.0),
+    ],
+    "express_onboarding": [
+        ("intake", 0.05),
+        ("identity_verification", 8.0),
+        ("human_review_check", 0.02),
+        ("provisioning", 20.0),
+        ("notification", 2.0),
+    ],
+}
+
+# Hour-of-day weights (UTC): most onboardings start during business hours
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 3, 5, 8, 10, 10, 10, 9, 10, 10, 9, 8, 6, 4, 3, 2, 2, 1, 1]
+
+
+def _choice(rng: random.Random, options: tuple[list, list[int]]) -> Any:
+    values, weights = options
+    return rng.choices(values, weights)[0]
+
+
+def _duration(rng: random.Random, mean: float) -> float:
+    """Log-normal duration with the given mean and a long right tail."""
+    sigma = 0.8
+    return rng.lognormvariate(math.log(mean) - sigma**2 / 2, sigma)
+
+
+def _created_at(rng: random.Random, now: datetime, days: int) -> datetime:
+    """Creation time skewed towards recent days and business hours."""
+    age_days = int(days * rng.random() ** 2)
+    day = (now - timedelta(days=age_days)).replace(hour=0, minute=0, second=0, microsecond=0)
+    moment = day + timedelta(
+        hours=rng.choices(range(24), HOUR_WEIGHTS)[0], seconds=rng.randrange(3600)
+    )
+    return min(moment, now)
+
+
+class DatasetGenerator:
+    """Seeded generator of customer, workflow and step rows."""
+
+    def __init__(self, seed: int, days: int, now: datetime | None = None) -> None:
+        """Initialize the generator."""
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.days = days
+        self.now = now or datetime.now(timezone.utc)
+
+    def customers(self, start: int, count: int) -> Iterator[dict[str, Any]]:
+        """Generate ``count`` customers numbered from ``start``."""
+        rng = self.rng
+        for index in range(start, start + count):
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            customer_type = _choice(rng, CUSTOMER_TYPES)
+            company = None
+            if customer_type != CustomerType.INDIVIDUAL:
+                company = (
+                    f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)} "
+                    f"{rng.choice(COMPANY_SUFFIXES)}"
+                )
+            created_at = _created_at(rng, self.now, self.days)
+            yield {
+                "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+                "email": (
+                    f"{first_name.lower()}.{last_name.lower()}.{self.seed}.{index}@example.com"
+                ),
+                "first_name": first_name,
+                "last_name": last_name,
+                "company_name": company,
+                "company_size": rng.choice(COMPANY_SIZES) if company else None,
+                "industry": rng.choice(INDUSTRIES) if company else None,
+                "customer_type": customer_type,
+                "status": _choice(rng, CUSTOMER_STATUSES),
+                "source": rng.choice(SOURCES),
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+    def workflows(
+        self, customer: dict[str, Any]
+    ) -> Iterator[tuple[dict[str, Any], list[dict[str, Any]]]]:
+        """Generate a customer's workflows, each with its step rows."""
+        rng = self.rng
+        created_at = customer["created_at"]
+        for _ in range(_choice(rng, WORKFLOWS_PER_CUSTOMER)):
+            workflow_type = _choice(rng, WORKFLOW_TYPES)
+            nodes = STEPS[workflow_type]
+            age = self.now - created_at
+            for max_age, statuses, weights in STATUS_BY_AGE:
+                if age < max_age:
+                    status = rng.choices(statuses, weights)[0]
+                    break
+
+            # How far the workflow got through its graph
+            review_index = next(i for i, (n, _) in enumerate(nodes) if n == "human_review_check")
+            if status == WorkflowStatus.COMPLETED:
+                reached = len(nodes)
+            elif status == WorkflowStatus.AWAITING_APPROVAL:
+                reached = review_index + 1
+            elif status == WorkflowStatus.PENDING:
+                reached = 0
+            else:
+                reached = rng.randint(1, len(nodes) - 1)
+
+            workflow_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+            started_at = created_at + timedelta(seconds=_duration(rng, 5.0)) if reached else None
+            steps = []
+            moment = started_at
+            for order, (step_name, mean) in enumerate(nodes[:reached], start=1):
+                duration = _duration(rng, mean)
+                failed = status == WorkflowStatus.FAILED and order == reached
+                steps.append(
+                    {
+                        "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+                        "workflow_id": workflow_id,
+                        "step_name": step_name,
+                        "step_type": StepType.INTEGRATION
+                        if step_name == "intake"
+                        else StepType.AGENT,
+                        "sequence_order": order,
+                        "status": StepStatus.FAILED if failed else StepStatus.COMPLETED,
+                        "started_at": moment,
+                        "completed_at": moment + timedelta(seconds=duration),
+                        "duration_seconds": round(duration, 3),
+                        "error_message": "Simulated failure" if failed else None,
+                        "created_at": moment,
+                        "updated_at": moment + timedelta(seconds=duration),
+                    }
+                )
+                moment += timedelta(seconds=duration)
+
+            completed_at = moment if status == WorkflowStatus.COMPLETED else None
+            yield (
+                {
+                    "id": workflow_id,
+                    "customer_id": customer["id"],
+                    "workflow_type": workflow_type,
+                    "status": status,
+                    "priority": _choice(rng, PRIORITIES),
+                    "current_step": nodes[reached - 1][0] if reached else None,
+                    "completed_steps": reached,
+                    "total_steps": len(nodes),
+                    "progress_percentage": int(reached / len(nodes) * 100),
+                    "started_at": started_at,
+                    "completed_at": completed_at,
+                    "requires_approval": status == WorkflowStatus.AWAITING_APPROVAL,
+                    "error_message": "Simulated failure"
+                    if status == WorkflowStatus.FAILED
+                    else None,
+                    "created_at": created_at,
+                    "updated_at": completed_at or moment or created_at,
+                },
+                steps,
+            )
+
+
+def _copy_records(table: Table, rows: list[dict[str, Any]]) -> tuple[list[str], list[tuple]]:
+    """
+    Turn row dicts into COPY records covering every column of ``table``.
+
+    COPY bypasses SQLAlchemy, so missing columns get the model's Python
+    default, enums are stored by name like SQLAlchemy's Enum type does, and
+    JSONB values are serialized.
+    """
+    columns = list(table.columns)
+    fallbacks = {}
+    for column in columns:
+        default = column.default
+        if default is None:
+            fallbacks[column.name] = None
+        elif default.is_callable:
+            fallbacks[column.name] = default.arg(None)
+        else:
+            fallbacks[column.name] = default.arg
+
+    records = []
+    for row in rows:
+        record = []
+        for column in columns:
+            value = row.get(column.name, fallbacks[column.name])
+            if isinstance(value, enum.Enum):
+                value = value.name
+            elif isinstance(value, dict | list):
+                value = json.dumps(value)
+            record.append(value)
+        records.append(tuple(record))
+    return [column.name for column in columns], records
+
+
+async def _copy(connection: asyncpg.Connection, table: Table, rows: list[dict[str, Any]]) -> None:
+    """Load rows into a table with COPY."""
+    if not rows:
+        return
+    columns, records = _copy_records(table, rows)
+    await connection.copy_records_to_table(table.name, records=records, columns=columns)
+
+
+async def seed(args: argparse.Namespace) -> dict[str, Any]:
+    """Generate and load the dataset, returning row counts and timings."""
+    dsn = str(settings.database_url).replace("postgresql+asyncpg://", "postgresql://")
+    connection = await asyncpg.connect(dsn)
+    generator = DatasetGenerator(args.seed, args.days)
+    counts = {"customers": 0, "onboarding_workflows": 0, "workflow_steps": 0}
+    start = time.perf_counter()
+
+    try:
+        if args.truncate:
+            await connection.execute(
+                "TRUNCATE customers, onboarding_workflows, workflow_steps, "
+                "workflow_state_deltas, workflow_rollups, step_rollups CASCADE"
+            )
+
+        for batch_start in range(0, args.customers, args.batch_size):
+            size = min(args.batch_size, args.customers - batch_start)
+            customers = list(generator.customers(batch_start, size))
+            workflows, steps = [], []
+            for customer in customers:
+                for workflow, workflow_steps in generator.workflows(customer):
+                    workflows.append(workflow)
+                    steps.extend(workflow_steps)
+
+            async with connection.transaction():
+                await _copy(connection, Customer.__table__, customers)
+                await _copy(connection, OnboardingWorkflow.__table__, workflows)
+                await _copy(connection, WorkflowStep.__table__, steps)
+
+            counts["customers"] += len(customers)
+            counts["onboarding_workflows"] += len(workflows)
+            counts["workflow_steps"] += len(steps)
+            print(
+                f"seeded {counts['customers']}/{args.customers} customers",
+                file=sys.stderr,
+                flush=True,
+            )
+        load_seconds = time.perf_counter() - start
+
+        async with async_session_factory() as session:
+            await rebuild_rollups(session)
+            await session.commit()
+        await connection.execute(
+            "ANALYZE customers, onboarding_workflows, workflow_steps, "
+            "workflow_rollups, step_rollups"
+        )
+    finally:
+        await connection.close()
+
+    return {
+        "rows": counts,
+        "load_seconds": round(load_seconds, 2),
+        "total_seconds": round(time.perf_counter() - start, 2),
+        "rows_per_second": round(sum(counts.values()) / load_seconds, 1) if load_seconds else 0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--customers", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=365, help="history to spread rows over")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=20_000, help="customers per COPY")
+    parser.add_argument(
+        "--truncate", action="store_true", help="empty the customer and workflow tables first"
+    )
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Seed the database and emit a report."""
+    args = parse_args(argv)
+    results = asyncio.run(seed(args))
+    parameters = {k: v for k, v in vars(args).items() if k != "output"}
+    write_report(build_report("seed_dataset", parameters, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+End-to-end workflow throughput benchmark.
+
+Drives ``WorkflowEngine.execute`` over the real standard onboarding graph at
+a fixed concurrency. The agents are replaced by stand-ins that spend their
+time in the offline fake LLM, so agent latency is injectable and no network
+is needed. The report covers workflows/sec, end-to-end and per-node latency
+percentiles, database round trips per workflow and peak RSS.
+
+Usage:
+    python -m benchmarks.workflow_throughput --workflows 500 --concurrency 32
+    python -m benchmarks.workflow_throughput --backend postgres --output run.json
+
+The ``memory`` backend keeps workflow progress in a dict and checkpoints in
+LangGraph's in-memory saver; its round trips are the persistence flushes the
+run would have made. The ``postgres`` backend uses the real persistence
+writer and checkpointer against DATABASE_URL and counts every statement and
+transaction. Point it at a scratch database: the benchmark's customers and
+workflows are deleted afterwards, but analytics rollups are not. Progress
+events and cache invalidations still go to REDIS_URL; failures there are
+logged and ignored.
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+from langgraph.checkpoint.memory import MemorySaver
+from sqlalchemy import delete, insert
+
+from app.agents.agent_registry import AgentRegistry
+from app.agents.base_agent import AgentResult, AgentState, BaseAgent
+from app.agents.fake_llm import FakeChatModel, estimate_tokens
+from app.config import settings
+from app.core.logging_config import configure_logging
+from app.database.session import async_session_factory, engine
+from app.models.database.customer import Customer, CustomerStatus, CustomerType
+from app.models.database.onboarding_workflow import OnboardingWorkflow, WorkflowStatus
+from app.models.database.workflow_checkpoint import WorkflowCheckpoint
+from app.models.database.workflow_state_delta import WorkflowStateDelta
+from app.models.database.workflow_step import WorkflowStep
+from app.orchestrator.graphs import DEFAULT_TEMPLATE_VERSION, DEFAULT_WORKFLOW_TYPE
+from app.orchestrator.persistence import FlushPolicy, WorkflowPersistenceWriter
+from app.orchestrator.workflow_engine import (
+    OnboardingState,
+    WorkflowEngine,
+    create_initial_state,
+)
+from benchmarks.common import (
+    RoundTripCounter,
+    build_report,
+    latency_summary,
+    peak_rss_mb,
+    write_report,
+)
+
+# Agents called by the standard onboarding graph
+AGENT_NAMES = ("identity", "legal", "crm", "it", "communication")
+
+
+def mock_agent_class(name: str, llm: FakeChatModel) -> type[BaseAgent]:
+    """Build a stand-in agent that spends its time in the fake LLM and always succeeds."""
+
+    class MockAgent(BaseAgent):
+        def __init__(self) -> None:
+            super().__init__(
+                name=f"{name}_agent",
+                description=f"Benchmark stand-in for the {name} agent",
+                llm=llm,
+            )
+
+        async def initialize(self) -> None:
+            pass
+
+        def get_tools(self) -> list[Any]:
+            return []
+
+        async def execute(self, task: dict[str, Any], state: AgentState) -> AgentResult:
+            prompt = json.dumps(task, sort_keys=True, default=str)
+            response = await self.llm.ainvoke(prompt)
+            return AgentResult(
+                success=True,
+                data={"summary": str(response.content)[:200]},
+                confidence_score=0.95,
+                tokens_used=estimate_tokens(prompt) + estimate_tokens(str(response.content)),
+            )
+
+    MockAgent.__name__ = MockAgent.__qualname__ = f"Mock{name.title()}Agent"
+    return MockAgent
+
+
+def register_mock_agents(llm: FakeChatModel) -> None:
+    """Replace every agent used by the onboarding graph with a stand-in."""
+    for name in AGENT_NAMES:
+        AgentRegistry.register(name)(mock_agent_class(name, llm))
+
+
+class InMemoryPersistenceWriter(WorkflowPersistenceWriter):
+    """
+    Persistence writer that keeps workflow progress in a dict.
+
+    Buffering and the flush policy work exactly as in production, so
+    ``flush_count`` is the number of transactions the run would have cost.
+    """
+
+    def __init__(self, workflow_id: str, store: dict[str, dict[str, Any]]) -> None:
+        """Initialize the writer over a shared ``store``."""
+        super().__init__(workflow_id)
+        self.store = store
+
+    async def __aenter__(self) -> "InMemoryPersistenceWriter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Apply buffered steps and workflow changes to the store."""
+        if not self._pending_steps and not self._pending_changes:
+            return
+
+        record = self.store.setdefault(self.workflow_id, {"steps": 0, "flushes": 0})
+        record["steps"] += len(self._pending_steps)
+        record["flushes"] += 1
+        record.update(self._pending_changes)
+        if self._latest_state is not None:
+            self._last_flushed_phase = self._latest_state.get("current_phase")
+
+        self._pending_steps, self._pending_changes, self._latest_state = [], {}, None
+        self.flush_count += 1
+
+
+async def seed_workflows(workflow_ids: list[uuid.UUID]) -> list[uuid.UUID]:
+    """Insert one customer and one pending workflow per id and return the customer ids."""
+    now = datetime.now(timezone.utc)
+    customer_ids = [uuid.uuid4() for _ in workflow_ids]
+
+    async with async_session_factory() as session:
+        await session.execute(
+            insert(Customer.__table__),
+            [
+                {
+                    "id": customer_id,
+                    "email": f"bench-{customer_id}@example.com",
+                    "first_name": "Bench",
+                    "last_name": str(index),
+                    "company_name": f"Benchmark Co {index}",
+                    "customer_type": CustomerType.BUSINESS,
+                    "status": CustomerStatus.ONBOARDING,
+                    "source": "benchmark",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for index, customer_id in enumerate(customer_ids)
+            ],
+        )
+        await session.execute(
+            insert(OnboardingWorkflow.__table__),
+            [
+                {
+                    "id": workflow_id,
+                    "customer_id": customer_id,
+                    "workflow_type": DEFAULT_WORKFLOW_TYPE,
+                    "template_version": DEFAULT_TEMPLATE_VERSION,
+                    "status": WorkflowStatus.PENDING,
+                    "total_steps": 6,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for workflow_id, customer_id in zip(workflow_ids, customer_ids)
+            ],
+        )
+        await session.commit()
+    return customer_ids
+
+
+async def cleanup_workflows(
+    workflow_ids: list[uuid.UUID], customer_ids: list[uuid.UUID]
+) -> None:
+    """Delete everything the benchmark wrote for its workflows."""
+    async with async_session_factory() as session:
+        await session.execute(
+            delete(WorkflowStep).where(WorkflowStep.workflow_id.in_(workflow_ids))
+        )
+        await session.execute(
+            delete(WorkflowStateDelta).where(WorkflowStateDelta.workflow_id.in_(workflow_ids))
+        )
+        await session.execute(
+            delete(WorkflowCheckpoint).where(
+                WorkflowCheckpoint.thread_id.in_([str(w) for w in workflow_ids])
+            )
+        )
+        await session.execute(
+            delete(OnboardingWorkflow).where(OnboardingWorkflow.id.in_(workflow_ids))
+        )
+        await session.execute(delete(Customer).where(Customer.id.in_(customer_ids)))
+        await session.commit()
+
+
+def initial_state(workflow_id: uuid.UUID, index: int) -> OnboardingState:
+    """Initial state of a benchmark workflow."""
+    return create_initial_state(
+        customer_id=str(uuid.uuid4()),
+        workflow_id=str(workflow_id),
+        customer_data={
+            "email": f"bench-{workflow_id}@example.com",
+            "first_name": "Bench",
+            "last_name": str(index),
+            "company_name": f"Benchmark Co {index}",
+        },
+    )
+
+
+async def run_workflows(
+    workflow_engine: WorkflowEngine, workflow_ids: list[uuid.UUID], concurrency: int
+) -> tuple[list[OnboardingState], list[float], int, float]:
+    """
+    Execute the workflows with at most ``concurrency`` in flight.
+
+    Returns the final states, each workflow's end-to-end latency, the number
+    of failed runs and the wall-clock time.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    states: list[OnboardingState] = []
+    latencies: list[float] = []
+    failures = 0
+
+    async def run_one(index: int, workflow_id: uuid.UUID) -> None:
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                state = await workflow_engine.execute(initial_state(workflow_id, index))
+            except Exception:
+                failures += 1
+                return
+            latencies.append(time.perf_counter() - start)
+            states.append(state)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_one(i, w) for i, w in enumerate(workflow_ids)))
+    return states, latencies, failures, time.perf_counter() - start
+
+
+async def benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the warm-up and measured workflows and collect the results."""
+    settings.agent_pool_size = args.agent_pool_size or args.concurrency
+    settings.workflow_flush_policy = args.flush_policy
+
+    register_mock_agents(
+        FakeChatModel(
+            model="fake-benchmark",
+            latency=args.agent_latency,
+            latency_jitter=args.agent_jitter,
+            tokens_per_second=args.tokens_per_second,
+            completion_tokens=args.completion_tokens,
+            seed=args.seed,
+        )
+    )
+
+    store: dict[str, dict[str, Any]] = {}
+    if args.backend == "memory":
+        workflow_engine = WorkflowEngine(
+            checkpointer=MemorySaver(),
+            writer_factory=functools.partial(InMemoryPersistenceWriter, store=store),
+        )
+    else:
+        workflow_engine = WorkflowEngine()
+    workflow_engine.warm()
+
+    warmup_ids = [uuid.uuid4() for _ in range(args.warmup)]
+    measured_ids = [uuid.uuid4() for _ in range(args.workflows)]
+    customer_ids: list[uuid.UUID] = []
+    counter = RoundTripCounter(engine) if args.backend == "postgres" else None
+
+    try:
+        if args.backend == "postgres":
+            customer_ids = await seed_workflows(warmup_ids + measured_ids)
+
+        if warmup_ids:
+            await run_workflows(workflow_engine, warmup_ids, args.concurrency)
+        if counter is not None:
+            counter.reset()
+        store.clear()
+
+        states, latencies, failures, elapsed = await run_workflows(
+            workflow_engine, measured_ids, args.concurrency
+        )
+        round_trips = (
+            counter.count
+            if counter is not None
+            else sum(record["flushes"] for record in store.values())
+        )
+    finally:
+        if counter is not None:
+            counter.close()
+        if args.backend == "postgres" and customer_ids and not args.keep_data:
+            await cleanup_workflows(warmup_ids + measured_ids, customer_ids)
+
+    node_durations: dict[str, list[float]] = {}
+    for state in states:
+        for node_name, metrics in state.get("step_metrics", {}).items():
+            node_durations.setdefault(node_name, []).append(metrics["duration_seconds"])
+
+    completed = len(states)
+    return {
+        "workflows_completed": completed,
+        "workflows_failed": failures,
+        "awaiting_approval": sum(1 for s in states if s.get("requires_human_review")),
+        "elapsed_seconds": round(elapsed, 3),
+        "workflows_per_second": round(completed / elapsed, 3) if elapsed else 0.0,
+        "workflow_latency": latency_summary(latencies),
+        "node_latency": {
+            name: latency_summary(durations) for name, durations in sorted(node_durations.items())
+        },
+        "db_round_trips": round_trips,
+        "db_round_trips_per_workflow": round(round_trips / completed, 2) if completed else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", choices=["memory", "postgres"], default="memory")
+    parser.add_argument("--workflows", type=int, default=200, help="measured workflows")
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured warm-up workflows")
+    parser.add_argument("--concurrency", type=int, default=16, help="workflows in flight")
+    parser.add_argument(
+        "--agent-pool-size", type=int, default=0, help="agents per type (default: concurrency)"
+    )
+    parser.add_argument(
+        "--flush-policy",
+        choices=[p.value for p in FlushPolicy],
+        default=settings.workflow_flush_policy,
+    )
+    parser.add_argument(
+        "--agent-latency", type=float, default=0.05, help="mean seconds per LLM call"
+    )
+    parser.add_argument(
+        "--agent-jitter", type=float, default=0.02, help="std deviation of LLM call latency"
+    )
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--completion-tokens", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--keep-data", action="store_true", help="keep postgres rows for inspection"
+    )
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark and emit its report."""
+    args = parse_args(argv)
+    configure_logging(log_level="ERROR")
+
+    results = asyncio.run(benchmark(args))
+    parameters = {k: v for k, v in vars(args).items() if k not in ("output", "keep_data")}
+    write_report(build_report("workflow_throughput", parameters, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
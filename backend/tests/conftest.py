@@ -0,0 +1,108 @@
+"""Shared test fixtures."""
+
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterator
+from typing import Any
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.models.database.onboarding_workflow import OnboardingWorkflow, WorkflowStatus
+
+
+class FakeResult:
+    """Query result returning fixed rows."""
+
+    def __init__(self, rows: list[tuple]) -> None:
+        self._rows = rows
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self._rows)
+
+    def scalars(self) -> list[Any]:
+        return [row[0] for row in self._rows]
+
+
+class FakeSession:
+    """
+    In-memory stand-in for an ``AsyncSession``.
+
+    Added objects are pending until ``commit()`` moves them to ``committed``;
+    ``rollback()`` discards them. ``fail_commits`` makes that many commits
+    raise. ``results`` and ``scalar_results`` queue the results of
+    ``execute()`` and ``scalar()``, or ``on_execute`` can compute the rows
+    from the statement and parameters. ``executed`` keeps every statement.
+    """
+
+    def __init__(self, workflow: OnboardingWorkflow | None = None) -> None:
+        self.workflow = workflow
+        self.pending: list[Any] = []
+        self.committed: list[Any] = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.fail_commits = 0
+        self.results: list[list[tuple]] = []
+        self.scalar_results: list[Any] = []
+        self.executed: list[Any] = []
+        self.on_execute: Callable[[Any, Any], list[tuple]] | None = None
+        self.closed = False
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def get(self, model: type, ident: Any) -> Any:
+        return self.workflow
+
+    def add(self, instance: Any) -> None:
+        self.pending.append(instance)
+
+    def add_all(self, instances: list[Any]) -> None:
+        self.pending.extend(instances)
+
+    async def scalar(self, statement: Any) -> Any:
+        self.executed.append(statement)
+        return self.scalar_results.pop(0) if self.scalar_results else None
+
+    async def execute(self, statement: Any, parameters: Any = None) -> FakeResult:
+        self.executed.append(statement)
+        if self.on_execute is not None:
+            return FakeResult(self.on_execute(statement, parameters))
+        return FakeResult(self.results.pop(0) if self.results else [])
+
+    async def commit(self) -> None:
+        if self.fail_commits:
+            self.fail_commits -= 1
+            raise RuntimeError("connection lost")
+        self.committed.extend(self.pending)
+        self.pending.clear()
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        self.pending.clear()
+        self.rollbacks += 1
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def workflow() -> OnboardingWorkflow:
+    return OnboardingWorkflow(
+        id=uuid.uuid4(), status=WorkflowStatus.IN_PROGRESS, state={"workflow_type": "kyc"}
+    )
+
+
+@pytest.fixture
+def session(workflow: OnboardingWorkflow) -> FakeSession:
+    return FakeSession(workflow)
+
+
+@pytest.fixture
+async def redis() -> AsyncIterator[FakeAsyncRedis]:
+    """In-memory Redis that runs Lua scripts, like the shared client."""
+    client = FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.aclose()
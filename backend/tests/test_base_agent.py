@@ -0,0 +1,116 @@
+"""Tests for agent timeouts, retries and the workflow deadline."""
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from app.agents.base_agent import AgentResult, AgentState, BaseAgent
+from app.config import settings
+from app.core.deadline import deadline_scope
+from app.core.exceptions import CircuitOpenError
+
+
+class ScriptedAgent(BaseAgent):
+    """Agent whose attempts follow a script of exceptions, delays and results."""
+
+    def __init__(self, script: list[Any], **kwargs: Any) -> None:
+        super().__init__("scripted", "Test agent", llm=object(), **kwargs)
+        self.script = script
+        self.calls = 0
+
+    async def initialize(self) -> None:
+        pass
+
+    def get_tools(self) -> list[Any]:
+        return []
+
+    async def execute(self, task: dict[str, Any], state: AgentState) -> AgentResult:
+        step = self.script[min(self.calls, len(self.script) - 1)]
+        self.calls += 1
+        if isinstance(step, BaseException):
+            raise step
+        if isinstance(step, int | float):
+            await asyncio.sleep(step)
+            return AgentResult(success=True)
+        return step
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "agent_retry_base_delay", 0.001)
+    monkeypatch.setattr(settings, "agent_retry_max_delay", 0.001)
+    monkeypatch.setattr(settings, "agent_min_attempt_seconds", 0.5)
+
+
+async def test_errors_are_retried_until_an_attempt_succeeds():
+    agent = ScriptedAgent([ValueError("flaky"), ValueError("flaky"), AgentResult(success=True)])
+
+    result = await agent.run({"type": "check"})
+
+    assert result.success
+    assert result.attempts == 3
+    assert agent.calls == 3
+
+
+async def test_retries_stop_at_max_retries():
+    agent = ScriptedAgent([ValueError("down")], max_retries=2)
+
+    result = await agent.run({"type": "check"})
+
+    assert not result.success
+    assert result.error == "down"
+    assert result.attempts == 2
+
+
+async def test_failed_results_are_not_retried():
+    agent = ScriptedAgent([AgentResult(success=False, error="rejected")])
+
+    result = await agent.run({"type": "check"})
+
+    assert result.error == "rejected"
+    assert agent.calls == 1
+
+
+async def test_timed_out_attempts_are_counted_and_retried():
+    agent = ScriptedAgent([10, 10, AgentResult(success=True)], timeout_seconds=0.02)
+
+    result = await agent.run({"type": "check"})
+
+    assert result.success
+    assert result.timeouts == 2
+    assert result.attempts == 3
+
+
+async def test_deadline_caps_the_attempt_and_stops_retries():
+    agent = ScriptedAgent([10], timeout_seconds=300)
+
+    start = time.monotonic()
+    with deadline_scope(0.05):
+        result = await agent.run({"type": "check"})
+
+    assert time.monotonic() - start < 1
+    assert not result.success
+    assert result.timeouts == 1
+    # Less than agent_min_attempt_seconds was left, so no second attempt
+    assert result.attempts == 1
+
+
+async def test_open_circuit_propagates_when_workflows_park(monkeypatch):
+    monkeypatch.setattr(settings, "circuit_breaker_park_workflows", True)
+    agent = ScriptedAgent([CircuitOpenError("kyc_provider", retry_after=30)])
+
+    with pytest.raises(CircuitOpenError):
+        await agent.run({"type": "check"})
+    assert agent.calls == 1
+
+
+async def test_open_circuit_fails_fast_without_parking(monkeypatch):
+    monkeypatch.setattr(settings, "circuit_breaker_park_workflows", False)
+    agent = ScriptedAgent([CircuitOpenError("kyc_provider", retry_after=30)])
+
+    result = await agent.run({"type": "check"})
+
+    assert not result.success
+    assert result.attempts == 1
@@ -0,0 +1,189 @@
+"""Tests for the streaming bulk onboarding import."""
+
+import json
+import uuid
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy.sql.dml import Insert, Update
+
+from app.config import settings
+from app.imports import bulk_onboarding
+from app.imports.bulk_onboarding import run_import
+from app.models.database.import_job import ImportFormat, ImportJobStatus
+
+JOB_ID = uuid.UUID("6f1c1a34-1d1e-4c47-9a43-3f2f5cb2f6a1")
+
+
+def wizard_row(n: int, **overrides: Any) -> dict[str, Any]:
+    return {
+        "company_name": f"Company {n}",
+        "tax_id": f"TX-{n}",
+        "contact_name": f"Contact {n}",
+        "email": f"contact{n}@example.com",
+        **overrides,
+    }
+
+
+def write_ndjson(tmp_path: Path, lines: list[Any]) -> str:
+    path = tmp_path / "upload.ndjson"
+    path.write_text(
+        "\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines) + "\n"
+    )
+    return str(path)
+
+
+def job_updates(session: Any) -> list[dict[str, Any]]:
+    """Values written to the import job, in order."""
+    return [
+        {column.key: value.value for column, value in statement._values.items()}
+        for statement in session.executed
+        if isinstance(statement, Update) and statement.table.name == "import_jobs"
+    ]
+
+
+@pytest.fixture
+def import_env(monkeypatch, session) -> dict[str, Any]:
+    """
+    A session that knows which customer emails already exist, with enqueueing recorded.
+
+    Returns the session, the set of existing emails, and the enqueued task
+    arguments per priority.
+    """
+    existing: set[str] = set()
+    enqueued: dict[str, list[tuple]] = {}
+
+    def on_execute(statement: Any, parameters: Any) -> list[tuple]:
+        # The customer insert skips existing emails and returns the ones it inserted
+        if isinstance(statement, Insert) and statement.table.name == "customers":
+            inserted = [row["email"] for row in parameters if row["email"] not in existing]
+            existing.update(inserted)
+            return [(email,) for email in inserted]
+        return []
+
+    def enqueue(task: Any, args_list: list[tuple], priority: str) -> None:
+        enqueued.setdefault(priority, []).extend(args_list)
+
+    async def noop(*args: Any, **kwargs: Any) -> None:
+        pass
+
+    session.on_execute = on_execute
+    monkeypatch.setattr(bulk_onboarding, "enqueue_workflow_tasks", enqueue)
+    monkeypatch.setattr(bulk_onboarding, "record_created_workflows", noop)
+    monkeypatch.setattr(bulk_onboarding, "invalidate_cache", noop)
+    monkeypatch.setattr(settings, "bulk_import_chunk_size", 2)
+    return {"session": session, "existing": existing, "enqueued": enqueued}
+
+
+async def test_rows_are_imported_in_chunks(tmp_path, import_env):
+    session = import_env["session"]
+    path = write_ndjson(tmp_path, [wizard_row(n) for n in range(5)])
+
+    await run_import(JOB_ID, path, ImportFormat.NDJSON, session_factory=lambda: session)
+
+    updates = job_updates(session)
+    assert updates[0]["status"] == ImportJobStatus.RUNNING
+    # One progress update per chunk of two rows
+    assert [u["processed_rows"] for u in updates if "processed_rows" in u] == [2, 4, 5]
+    assert updates[-1]["status"] == ImportJobStatus.COMPLETED
+    assert session.commits == 5
+    assert len(import_env["enqueued"]["normal"]) == 5
+    assert not Path(path).exists()
+
+
+async def test_row_errors_are_counted_and_reported(tmp_path, import_env):
+    session = import_env["session"]
+    import_env["existing"].add("contact3@example.com")
+    path = write_ndjson(
+        tmp_path,
+        [
+            wizard_row(0),
+            "{not json",
+            wizard_row(1, email="contact0@example.com"),
+            wizard_row(2, workflow_type="unknown_flow"),
+            wizard_row(3),
+            {"company_name": "No email"},
+            wizard_row(4, priority="urgent"),
+        ],
+    )
+
+    await run_import(JOB_ID, path, ImportFormat.NDJSON, session_factory=lambda: session)
+
+    final = [u for u in job_updates(session) if "processed_rows" in u][-1]
+    assert final["processed_rows"] == 7
+    assert final["imported_rows"] == 2
+    assert final["failed_rows"] == 5
+    errors = {error["row"]: error["error"] for error in final["errors"]}
+    assert errors[2] == "invalid JSON"
+    assert errors[5] == "Customer 'contact3@example.com' already exists"
+    assert "email" in errors[6]
+    assert errors[4] == "Unknown workflow type 'unknown_flow'"
+    # A duplicate in a later chunk is caught by the insert
+    assert errors[3] == "Customer 'contact0@example.com' already exists"
+    assert set(import_env["enqueued"]) == {"normal", "urgent"}
+
+
+async def test_duplicate_emails_in_a_chunk_are_rejected(tmp_path, import_env, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_import_chunk_size", 10)
+    session = import_env["session"]
+    path = write_ndjson(tmp_path, [wizard_row(0), wizard_row(1, email="contact0@example.com")])
+
+    await run_import(JOB_ID, path, ImportFormat.NDJSON, session_factory=lambda: session)
+
+    final = [u for u in job_updates(session) if "processed_rows" in u][-1]
+    assert final["errors"] == [{"row": 2, "error": "Duplicate email in upload"}]
+    assert final["imported_rows"] == 1
+
+
+async def test_kept_errors_are_capped(tmp_path, import_env, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_import_max_errors", 3)
+    session = import_env["session"]
+    path = write_ndjson(tmp_path, ["{bad"] * 7)
+
+    await run_import(JOB_ID, path, ImportFormat.NDJSON, session_factory=lambda: session)
+
+    final = [u for u in job_updates(session) if "processed_rows" in u][-1]
+    assert final["failed_rows"] == 7
+    assert len(final["errors"]) == 3
+
+
+async def test_failure_marks_the_job_failed_and_keeps_committed_chunks(tmp_path, import_env):
+    session = import_env["session"]
+    path = write_ndjson(tmp_path, [wizard_row(n) for n in range(4)])
+    inserts = 0
+
+    def on_execute(statement: Any, parameters: Any) -> list[tuple]:
+        nonlocal inserts
+        if isinstance(statement, Insert) and statement.table.name == "customers":
+            inserts += 1
+            if inserts == 2:
+                raise RuntimeError("connection lost")
+            return [(row["email"],) for row in parameters]
+        return []
+
+    session.on_execute = on_execute
+
+    await run_import(JOB_ID, path, ImportFormat.NDJSON, session_factory=lambda: session)
+
+    updates = job_updates(session)
+    assert updates[-1]["status"] == ImportJobStatus.FAILED
+    assert updates[-1]["error_message"] == "connection lost"
+    assert len(import_env["enqueued"]["normal"]) == 2
+    assert not Path(path).exists()
+
+
+async def test_csv_rows_parse_context_json(tmp_path, import_env):
+    session = import_env["session"]
+    path = tmp_path / "upload.csv"
+    path.write_text(
+        "company_name,tax_id,contact_name,email,context\n"
+        'Acme,TX-1,Jane Doe,jane@acme.com,"{""region"": ""eu""}"\n'
+        "Bad,TX-2,John Roe,john@bad.com,{oops\n"
+    )
+
+    await run_import(JOB_ID, str(path), ImportFormat.CSV, session_factory=lambda: session)
+
+    final = [u for u in job_updates(session) if "processed_rows" in u][-1]
+    assert final["imported_rows"] == 1
+    assert final["errors"] == [{"row": 2, "error": "context: invalid JSON"}]
@@ -0,0 +1,219 @@
+"""Tests for circuit breakers and parking workflows on an open circuit."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.core import circuit_breaker
+from app.core.circuit_breaker import CircuitBreaker, CircuitState
+from app.core.exceptions import CircuitOpenError
+from app.models.database.onboarding_workflow import WorkflowStatus
+from app.orchestrator import persistence
+from app.orchestrator.persistence import FlushPolicy, WorkflowPersistenceWriter
+
+
+class StubbedBreaker(CircuitBreaker):
+    """Breaker whose Redis scripts are replaced by queued answers."""
+
+    def __init__(self, acquire: list[Any], record: list[Any] | None = None) -> None:
+        super().__init__("kyc_provider", failure_threshold=2, recovery_timeout=30)
+        self.acquire_answers = acquire
+        self.record_answers = record or []
+        self.acquired = 0
+        self.recorded: list[bool] = []
+
+    async def _acquire(self) -> tuple[bool, float, CircuitState, int]:
+        self.acquired += 1
+        answer = self.acquire_answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    async def _record(self, success: bool) -> CircuitState:
+        self.recorded.append(success)
+        return self.record_answers.pop(0)
+
+
+async def succeed() -> str:
+    return "ok"
+
+
+async def fail() -> str:
+    raise ConnectionError("provider down")
+
+
+async def test_closed_breaker_without_failures_skips_the_report():
+    breaker = StubbedBreaker([(True, 0.0, CircuitState.CLOSED, 0)])
+
+    assert await breaker.call(succeed) == "ok"
+    assert breaker.recorded == []
+
+
+async def test_open_breaker_rejects_locally_until_the_recovery_timeout():
+    breaker = StubbedBreaker([(False, 12.5, CircuitState.OPEN, 0)])
+
+    with pytest.raises(CircuitOpenError) as first:
+        await breaker.call(succeed)
+    with pytest.raises(CircuitOpenError) as second:
+        await breaker.call(succeed)
+
+    assert first.value.retry_after == 12.5
+    assert 0 < second.value.retry_after <= 12.5
+    # The second rejection did not ask Redis
+    assert breaker.acquired == 1
+
+
+async def test_failure_that_opens_the_breaker_short_circuits_later_calls():
+    breaker = StubbedBreaker([(True, 0.0, CircuitState.CLOSED, 1)], [CircuitState.OPEN])
+
+    with pytest.raises(ConnectionError):
+        await breaker.call(fail)
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(succeed)
+
+    assert breaker.recorded == [False]
+    assert breaker.acquired == 1
+
+
+async def test_successful_half_open_probe_closes_the_breaker():
+    breaker = StubbedBreaker(
+        [(True, 0.0, CircuitState.HALF_OPEN, 0), (True, 0.0, CircuitState.CLOSED, 0)],
+        [CircuitState.CLOSED],
+    )
+
+    assert await breaker.call(succeed) == "ok"
+    assert await breaker.call(succeed) == "ok"
+    assert breaker.recorded == [True]
+
+
+async def test_half_open_breaker_with_probes_taken_rejects_without_local_open():
+    breaker = StubbedBreaker(
+        [(False, 30.0, CircuitState.HALF_OPEN, 0), (True, 0.0, CircuitState.HALF_OPEN, 0)],
+        [CircuitState.CLOSED],
+    )
+
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(succeed)
+    # Probe slots free up at any time, so the next call asks Redis again
+    assert await breaker.call(succeed) == "ok"
+    assert breaker.acquired == 2
+
+
+async def test_breaker_fails_open_when_redis_is_down():
+    breaker = StubbedBreaker([ConnectionError("redis down")])
+
+    assert await breaker.call(succeed) == "ok"
+
+
+@pytest.fixture
+def shared_breaker(monkeypatch, redis) -> CircuitBreaker:
+    """A breaker running its Lua scripts against an in-memory Redis."""
+    monkeypatch.setattr(circuit_breaker, "get_or_create_redis", lambda: redis)
+    return CircuitBreaker(
+        "kyc_provider", failure_threshold=2, recovery_timeout=0.05, half_open_max_calls=1
+    )
+
+
+async def test_breaker_opens_after_consecutive_failures(shared_breaker):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await shared_breaker.call(fail)
+
+    assert await shared_breaker.get_state() == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        await shared_breaker.call(succeed)
+
+
+async def test_success_resets_the_failure_count(shared_breaker):
+    with pytest.raises(ConnectionError):
+        await shared_breaker.call(fail)
+    await shared_breaker.call(succeed)
+    with pytest.raises(ConnectionError):
+        await shared_breaker.call(fail)
+
+    assert await shared_breaker.get_state() == CircuitState.CLOSED
+
+
+async def test_half_open_breaker_admits_one_probe_and_closes_on_success(shared_breaker):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await shared_breaker.call(fail)
+    await asyncio.sleep(0.06)
+
+    probe_started = asyncio.Event()
+    finish_probe = asyncio.Event()
+
+    async def slow_probe() -> str:
+        probe_started.set()
+        await finish_probe.wait()
+        return "ok"
+
+    probe = asyncio.create_task(shared_breaker.call(slow_probe))
+    await probe_started.wait()
+    assert await shared_breaker.get_state() == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        await shared_breaker.call(succeed)
+
+    finish_probe.set()
+    assert await probe == "ok"
+    assert await shared_breaker.get_state() == CircuitState.CLOSED
+    assert await shared_breaker.call(succeed) == "ok"
+
+
+async def test_failed_probe_reopens_the_breaker(shared_breaker):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await shared_breaker.call(fail)
+    await asyncio.sleep(0.06)
+
+    with pytest.raises(ConnectionError):
+        await shared_breaker.call(fail)
+
+    assert await shared_breaker.get_state() == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        await shared_breaker.call(succeed)
+
+
+async def test_breakers_share_state_across_processes(shared_breaker):
+    other_process = CircuitBreaker("kyc_provider", failure_threshold=2, recovery_timeout=0.05)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await shared_breaker.call(fail)
+
+    with pytest.raises(CircuitOpenError):
+        await other_process.call(succeed)
+
+
+async def test_park_flushes_and_waits_for_the_integration(monkeypatch, session, workflow):
+    published: list[tuple[str, dict]] = []
+
+    async def noop(*args: Any, **kwargs: Any) -> None:
+        pass
+
+    async def set_workflow_status(session, workflow, new_status):
+        workflow.status = new_status
+
+    async def publish_progress(workflow_id, event, data):
+        published.append((event, data))
+
+    monkeypatch.setattr(persistence, "record_steps", noop)
+    monkeypatch.setattr(persistence, "set_workflow_status", set_workflow_status)
+    monkeypatch.setattr(persistence, "publish_progress", publish_progress)
+    monkeypatch.setattr(persistence, "invalidate_cache", noop)
+
+    writer = WorkflowPersistenceWriter(
+        str(workflow.id), policy=FlushPolicy.PHASE_BOUNDARY, session_factory=lambda: session
+    )
+    async with writer:
+        await writer.park(CircuitOpenError("kyc_provider", retry_after=12.5))
+
+    assert session.commits == 1
+    assert workflow.status == WorkflowStatus.AWAITING_INPUT
+    assert workflow.error_message == "Waiting for kyc_provider to recover"
+    assert published == [
+        (
+            "status",
+            {"status": "awaiting_input", "integration": "kyc_provider", "retry_after": 12.5},
+        )
+    ]
@@ -0,0 +1,131 @@
+"""Tests for the request context middleware."""
+
+from collections.abc import Iterator
+from typing import Any
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from app.core import middleware
+from app.core.middleware import RequestContextMiddleware
+from app.core.tracing import Span, SpanExporter, set_exporter
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+TRACEPARENT = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+
+class ListExporter(SpanExporter):
+    """Keeps finished spans in memory."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int, request: Request) -> dict[str, Any]:
+        return {"id": item_id, "request_id": request.state.request_id}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def body():
+            for n in range(50):
+                yield f"data: {n}\n\n".encode()
+
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    @app.get("/boom")
+    async def boom() -> None:
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+@pytest.fixture
+def observed(monkeypatch) -> list[tuple]:
+    """Requests recorded in the latency metric."""
+    calls: list[tuple] = []
+    monkeypatch.setattr(
+        middleware,
+        "observe_request",
+        lambda method, route, status, seconds: calls.append((method, route, status)),
+    )
+    return calls
+
+
+@pytest.fixture
+def spans() -> Iterator[list[Span]]:
+    exporter = ListExporter()
+    set_exporter(exporter)
+    yield exporter.spans
+    set_exporter(None)
+
+
+@pytest.fixture
+async def client():
+    transport = httpx.ASGITransport(app=build_app(), raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def test_request_id_is_generated_and_exposed(client, observed):
+    response = await client.get("/items/42")
+
+    request_id = response.headers["X-Request-ID"]
+    assert request_id
+    assert response.json() == {"id": 42, "request_id": request_id}
+    assert float(response.headers["X-Process-Time"]) >= 0
+
+
+async def test_incoming_request_id_is_kept(client, observed):
+    response = await client.get("/items/1", headers={"X-Request-ID": "req-123"})
+
+    assert response.headers["X-Request-ID"] == "req-123"
+    assert response.json()["request_id"] == "req-123"
+
+
+async def test_metrics_use_the_route_template(client, observed):
+    await client.get("/items/1")
+    await client.get("/items/2")
+    await client.get("/missing")
+
+    assert observed == [
+        ("GET", "/items/{item_id}", 200),
+        ("GET", "/items/{item_id}", 200),
+        ("GET", "unmatched", 404),
+    ]
+
+
+async def test_span_continues_the_callers_trace(client, observed, spans):
+    response = await client.get("/items/7", headers={"traceparent": TRACEPARENT})
+
+    assert response.headers["X-Trace-ID"] == TRACE_ID
+    (span,) = spans
+    assert span.trace_id == TRACE_ID
+    assert span.parent_id == "00f067aa0ba902b7"
+    assert span.name == "GET /items/{item_id}"
+    assert span.attributes["http.status_code"] == 200
+
+
+async def test_streaming_responses_pass_through(client, observed):
+    response = await client.get("/stream")
+
+    assert response.text == "".join(f"data: {n}\n\n" for n in range(50))
+    assert "X-Request-ID" in response.headers
+    assert observed == [("GET", "/stream", 200)]
+
+
+async def test_unhandled_errors_are_counted_once_as_500(client, observed, spans):
+    response = await client.get("/boom")
+
+    assert response.status_code == 500
+    assert observed == [("GET", "/boom", 500)]
+    assert spans[0].status == "error"
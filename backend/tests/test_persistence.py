@@ -0,0 +1,162 @@
+"""Tests for batched persistence of workflow progress."""
+
+from typing import Any
+
+import pytest
+
+from app.models.database.onboarding_workflow import WorkflowStatus
+from app.models.database.workflow_step import WorkflowStep
+from app.orchestrator import persistence
+from app.orchestrator.checkpointer import PendingCheckpoint
+from app.orchestrator.persistence import FlushPolicy, WorkflowPersistenceWriter
+
+
+class FakeSaver:
+    """Records the checkpoints a writer persists."""
+
+    def __init__(self) -> None:
+        self.written: list[PendingCheckpoint] = []
+        self.cached: list[PendingCheckpoint] = []
+
+    async def write(self, session: Any, pending: PendingCheckpoint) -> None:
+        self.written.append(pending)
+
+    async def cache(self, pending: PendingCheckpoint) -> None:
+        self.cached.append(pending)
+
+
+@pytest.fixture
+def deleted_checkpoints(monkeypatch) -> list[str]:
+    """Replace the writer's database and Redis helpers; returns deleted checkpoint threads."""
+    deleted: list[str] = []
+
+    async def noop(*args: Any, **kwargs: Any) -> None:
+        pass
+
+    async def set_workflow_status(session, workflow, new_status):
+        old, workflow.status = workflow.status, new_status
+        return old
+
+    async def delete_checkpoints(session, thread_id):
+        deleted.append(thread_id)
+
+    monkeypatch.setattr(persistence, "record_steps", noop)
+    monkeypatch.setattr(persistence, "set_workflow_status", set_workflow_status)
+    monkeypatch.setattr(persistence, "delete_checkpoints", delete_checkpoints)
+    monkeypatch.setattr(persistence, "evict_cached_checkpoint", noop)
+    monkeypatch.setattr(persistence, "publish_progress", noop)
+    monkeypatch.setattr(persistence, "invalidate_cache", noop)
+    return deleted
+
+
+def make_writer(session, workflow, policy: FlushPolicy, **kwargs: Any):
+    return WorkflowPersistenceWriter(
+        str(workflow.id), policy=policy, session_factory=lambda: session, **kwargs
+    )
+
+
+def state_after(phase: str, completed: list[str]) -> dict[str, Any]:
+    return {"current_phase": phase, "completed_phases": completed}
+
+
+def committed_steps(session) -> list[str]:
+    return [obj.step_name for obj in session.committed if isinstance(obj, WorkflowStep)]
+
+
+@pytest.mark.usefixtures("deleted_checkpoints")
+async def test_every_node_flushes_after_each_step(session, workflow):
+    async with make_writer(session, workflow, FlushPolicy.EVERY_NODE) as writer:
+        await writer.record_step("intake", state_after("intake", ["intake"]), {})
+        await writer.record_step("kyc", state_after("verification", ["intake"]), {})
+
+        assert writer.flush_count == 2
+        assert committed_steps(session) == ["intake", "kyc"]
+        assert workflow.current_step == "kyc"
+
+
+@pytest.mark.usefixtures("deleted_checkpoints")
+async def test_every_n_flushes_in_batches(session, workflow):
+    async with make_writer(session, workflow, FlushPolicy.EVERY_N, flush_every=2) as writer:
+        await writer.record_step("intake", state_after("intake", ["intake"]), {})
+        assert session.commits == 0
+
+        await writer.record_step("kyc", state_after("verification", ["intake"]), {})
+        assert session.commits == 1
+
+        await writer.record_step("kyb", state_after("verification", ["intake"]), {})
+        assert session.commits == 1
+
+    # Leftovers are flushed on exit
+    assert session.commits == 2
+    assert committed_steps(session) == ["intake", "kyc", "kyb"]
+    assert session.closed
+
+
+@pytest.mark.usefixtures("deleted_checkpoints")
+async def test_phase_boundary_batches_nodes_of_one_phase(session, workflow):
+    async with make_writer(session, workflow, FlushPolicy.PHASE_BOUNDARY) as writer:
+        await writer.record_step("intake", state_after("intake", ["intake"]), {})
+        await writer.record_step("kyc", state_after("verification", ["intake"]), {})
+        await writer.record_step("kyb", state_after("verification", ["intake"]), {})
+        assert writer.flush_count == 2
+
+        await writer.finalize(state_after("verification", ["intake", "verification"]))
+        assert writer.flush_count == 3
+
+    assert committed_steps(session) == ["intake", "kyc", "kyb"]
+    assert workflow.status == WorkflowStatus.COMPLETED
+    assert workflow.progress_percentage == 100
+
+
+@pytest.mark.usefixtures("deleted_checkpoints")
+async def test_failed_flush_keeps_the_batch_for_the_next_one(session, workflow):
+    session.fail_commits = 1
+
+    async with make_writer(session, workflow, FlushPolicy.EVERY_NODE) as writer:
+        await writer.record_step("intake", state_after("intake", ["intake"]), {})
+        assert session.rollbacks == 1
+        assert writer.flush_count == 0
+
+        await writer.record_step("kyc", state_after("verification", ["intake"]), {})
+
+    assert committed_steps(session) == ["intake", "kyc"]
+    assert workflow.current_step == "kyc"
+
+
+@pytest.mark.usefixtures("deleted_checkpoints")
+async def test_finalize_raises_when_the_flush_fails(session, workflow):
+    async with make_writer(session, workflow, FlushPolicy.PHASE_BOUNDARY) as writer:
+        session.fail_commits = 1
+        with pytest.raises(RuntimeError):
+            await writer.finalize(state_after("review", []))
+
+    # The exit flush retried the status change
+    assert workflow.status == WorkflowStatus.COMPLETED
+
+
+async def test_checkpoint_is_written_with_the_flush(session, workflow, deleted_checkpoints):
+    saver = FakeSaver()
+    checkpoint = PendingCheckpoint(str(workflow.id), "2", "1", "{}", {"step": 1})
+
+    async with make_writer(session, workflow, FlushPolicy.EVERY_NODE) as writer:
+        writer.buffer_checkpoint(saver, checkpoint)
+        await writer.record_step("intake", state_after("intake", ["intake"]), {})
+
+    assert saver.written == [checkpoint]
+    assert saver.cached == [checkpoint]
+    assert deleted_checkpoints == []
+
+
+async def test_checkpoints_are_deleted_when_the_workflow_ends(
+    session, workflow, deleted_checkpoints
+):
+    saver = FakeSaver()
+
+    async with make_writer(session, workflow, FlushPolicy.PHASE_BOUNDARY) as writer:
+        writer.buffer_checkpoint(
+            saver, PendingCheckpoint(str(workflow.id), "2", "1", "{}", {"step": 1})
+        )
+        await writer.finalize(state_after("review", []))
+
+    assert saver.written == []
+    assert deleted_checkpoints == [str(workflow.id)]
@@ -0,0 +1,78 @@
+"""Tests for token-bucket rate limits on integration calls."""
+
+import pytest
+
+from app.config import settings
+from app.core import rate_limiter
+from app.core.deadline import deadline_scope
+from app.core.exceptions import RateLimitExceededError
+from app.core.rate_limiter import RATE_LIMIT_WAIT_KEY, RateLimiter
+
+
+@pytest.fixture
+def shared_redis(monkeypatch, redis):
+    monkeypatch.setattr(rate_limiter, "get_or_create_redis", lambda: redis)
+    monkeypatch.setattr(settings, "rate_limit_max_wait", 5.0)
+    return redis
+
+
+async def test_burst_is_granted_without_waiting(shared_redis):
+    limiter = RateLimiter("salesforce", rate=1, burst=3)
+
+    assert [await limiter.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+
+async def test_empty_bucket_queues_callers_at_the_refill_rate(shared_redis):
+    limiter = RateLimiter("salesforce", rate=20, burst=1)
+
+    waits = [await limiter.acquire() for _ in range(3)]
+
+    assert waits[0] == 0.0
+    # Each token arrives 1/rate seconds after the previous one was reserved
+    assert 0.03 < waits[1] <= 0.05
+    assert 0.03 < waits[2] <= 0.05
+
+
+async def test_wait_beyond_the_limit_is_refused_without_taking_a_token(shared_redis, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_max_wait", 0.5)
+    limiter = RateLimiter("docusign", rate=1, burst=1)
+    await limiter.acquire()
+
+    for _ in range(2):
+        with pytest.raises(RateLimitExceededError) as refused:
+            await limiter.acquire()
+        # Refusals took nothing, so the wait does not grow
+        assert 0.9 < refused.value.retry_after <= 1.0
+
+    counters = await shared_redis.hgetall(RATE_LIMIT_WAIT_KEY)
+    assert counters["docusign:calls"] == "1"
+    assert counters["docusign:rejected"] == "2"
+
+
+async def test_workflow_deadline_caps_the_wait(shared_redis):
+    limiter = RateLimiter("sendgrid", rate=2, burst=1)
+    await limiter.acquire()
+
+    with deadline_scope(0.1), pytest.raises(RateLimitExceededError):
+        await limiter.acquire()
+
+
+async def test_throttled_calls_are_counted(shared_redis):
+    limiter = RateLimiter("twilio", rate=50, burst=1)
+    await limiter.acquire()
+    await limiter.acquire()
+
+    counters = await shared_redis.hgetall(RATE_LIMIT_WAIT_KEY)
+    assert counters["twilio:calls"] == "2"
+    assert counters["twilio:throttled"] == "1"
+    assert float(counters["twilio:wait_sum"]) > 0
+
+
+async def test_limiter_fails_open_when_redis_is_down(monkeypatch):
+    class BrokenRedis:
+        async def eval(self, *args):
+            raise ConnectionError("redis down")
+
+    monkeypatch.setattr(rate_limiter, "get_or_create_redis", BrokenRedis)
+
+    assert await RateLimiter("salesforce", rate=1, burst=1).acquire() == 0.0
@@ -0,0 +1,144 @@
+"""Tests for incremental analytics rollups."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.analytics.rollups import (
+    _upsert,
+    hour_bucket,
+    record_workflow_transition,
+    set_workflow_status,
+)
+from app.models.database.analytics_rollup import WorkflowRollup
+from app.models.database.onboarding_workflow import OnboardingWorkflow, WorkflowStatus
+
+CREATED_AT = datetime(2026, 10, 17, 9, 42, 7, tzinfo=timezone.utc)
+KEY = ["bucket", "workflow_type", "status"]
+
+
+def upserted_rows(statement: Any) -> list[dict[str, Any]]:
+    """The VALUES rows of an upsert, in statement order."""
+    params = statement.compile(dialect=postgresql.dialect()).params
+    rows = []
+    while f"status_m{len(rows)}" in params:
+        suffix = f"_m{len(rows)}"
+        rows.append(
+            {
+                name[: -len(suffix)]: value
+                for name, value in params.items()
+                if name.endswith(suffix) and value is not None
+            }
+        )
+    return rows
+
+
+@pytest.fixture
+def rollup_workflow() -> OnboardingWorkflow:
+    return OnboardingWorkflow(
+        id=uuid.uuid4(),
+        workflow_type="enterprise_onboarding",
+        status=WorkflowStatus.IN_PROGRESS,
+        created_at=CREATED_AT,
+    )
+
+
+def test_hour_bucket_truncates_to_the_utc_hour():
+    local = datetime(2026, 10, 17, 11, 42, tzinfo=timezone(timedelta(hours=2)))
+
+    assert hour_bucket(local) == datetime(2026, 10, 17, 9, tzinfo=timezone.utc)
+    assert hour_bucket(datetime(2026, 10, 17, 9, 42)) == datetime(
+        2026, 10, 17, 9, tzinfo=timezone.utc
+    )
+
+
+def test_upsert_adds_to_counters_on_conflict():
+    row = {"bucket": CREATED_AT, "workflow_type": "a", "status": WorkflowStatus.PENDING}
+    statement = _upsert(
+        WorkflowRollup,
+        KEY,
+        [{**row, "workflow_count": 1, "duration_seconds_sum": 0.0, "duration_count": 0}],
+    )
+
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (bucket, workflow_type, status) DO UPDATE" in sql
+    assert "workflow_count = (workflow_rollups.workflow_count + excluded.workflow_count)" in sql
+    assert "status = " not in sql.split("DO UPDATE")[1]
+
+
+def test_upsert_orders_rows_by_key():
+    rows = [
+        {
+            "bucket": CREATED_AT,
+            "workflow_type": workflow_type,
+            "status": WorkflowStatus.PENDING,
+            "workflow_count": 1,
+            "duration_seconds_sum": 0.0,
+            "duration_count": 0,
+        }
+        for workflow_type in ("kyc", "enterprise_onboarding", "kyb")
+    ]
+
+    ordered = upserted_rows(_upsert(WorkflowRollup, KEY, rows))
+
+    assert [row["workflow_type"] for row in ordered] == ["enterprise_onboarding", "kyb", "kyc"]
+
+
+async def test_transition_moves_the_count(session, rollup_workflow):
+    await record_workflow_transition(
+        session, rollup_workflow, WorkflowStatus.PENDING, WorkflowStatus.IN_PROGRESS
+    )
+
+    rows = upserted_rows(session.executed[0])
+    counts = {row["status"]: row["workflow_count"] for row in rows}
+    assert counts == {WorkflowStatus.IN_PROGRESS: 1, WorkflowStatus.PENDING: -1}
+    assert {row["bucket"] for row in rows} == {hour_bucket(CREATED_AT)}
+
+
+async def test_completed_transition_adds_the_duration(session, rollup_workflow):
+    rollup_workflow.completed_at = CREATED_AT + timedelta(minutes=3)
+
+    await record_workflow_transition(
+        session, rollup_workflow, WorkflowStatus.IN_PROGRESS, WorkflowStatus.COMPLETED
+    )
+
+    completed = next(
+        row
+        for row in upserted_rows(session.executed[0])
+        if row["status"] == WorkflowStatus.COMPLETED
+    )
+    assert completed["duration_seconds_sum"] == 180.0
+    assert completed["duration_count"] == 1
+
+
+async def test_unchanged_status_writes_nothing(session, rollup_workflow):
+    await record_workflow_transition(
+        session, rollup_workflow, WorkflowStatus.PENDING, WorkflowStatus.PENDING
+    )
+
+    assert session.executed == []
+
+
+async def test_set_status_moves_the_count_from_the_stored_status(session, rollup_workflow):
+    # The loaded instance is stale: the row was already moved to AWAITING_APPROVAL
+    session.scalar_results.append(WorkflowStatus.AWAITING_APPROVAL)
+
+    old = await set_workflow_status(session, rollup_workflow, WorkflowStatus.APPROVED)
+
+    assert old == WorkflowStatus.AWAITING_APPROVAL
+    assert rollup_workflow.status == WorkflowStatus.APPROVED
+    update, upsert = session.executed
+    assert "FOR UPDATE" in str(update.compile(dialect=postgresql.dialect()))
+    counts = {row["status"]: row["workflow_count"] for row in upserted_rows(upsert)}
+    assert counts == {WorkflowStatus.APPROVED: 1, WorkflowStatus.AWAITING_APPROVAL: -1}
+
+
+async def test_set_status_of_a_deleted_workflow_does_nothing(session, rollup_workflow):
+    old = await set_workflow_status(session, rollup_workflow, WorkflowStatus.CANCELLED)
+
+    assert old is None
+    assert rollup_workflow.status == WorkflowStatus.IN_PROGRESS
+    assert len(session.executed) == 1
@@ -0,0 +1,92 @@
+"""Tests for weighted admission of workflow tasks."""
+
+import asyncio
+
+import pytest
+
+from app.core.scheduling import WeightedSlots
+
+
+async def grant_order(slots: WeightedSlots, waiters: dict[str, int], grants: int) -> list[str]:
+    """Queue waiters behind a held slot, then release ``grants`` times and record who got in."""
+    order: list[str] = []
+
+    async def wait(priority: str) -> None:
+        await slots.acquire(priority)
+        order.append(priority)
+
+    await slots.acquire("hold")
+    tasks = [
+        asyncio.create_task(wait(priority))
+        for priority, count in waiters.items()
+        for _ in range(count)
+    ]
+    await asyncio.sleep(0)
+
+    for _ in range(grants):
+        slots.release()
+        await asyncio.sleep(0)
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return order
+
+
+async def test_acquire_takes_free_slot_immediately():
+    slots = WeightedSlots(2, {"normal": 1})
+
+    await slots.acquire("normal")
+    await slots.acquire("normal")
+    assert slots._free == 0
+
+    slots.release()
+    slots.release()
+    assert slots._free == 2
+
+
+async def test_slots_are_shared_by_weight():
+    slots = WeightedSlots(1, {"urgent": 8, "low": 1})
+
+    order = await grant_order(slots, {"urgent": 20, "low": 20}, grants=18)
+
+    assert order.count("urgent") == 16
+    assert order.count("low") == 2
+
+
+async def test_low_weight_class_is_not_starved():
+    slots = WeightedSlots(1, {"urgent": 8, "low": 1})
+
+    order = await grant_order(slots, {"urgent": 50, "low": 1}, grants=10)
+
+    assert "low" in order
+
+
+async def test_priority_missing_from_weights_gets_default_weight():
+    slots = WeightedSlots(1, {"urgent": 8})
+
+    order = await grant_order(slots, {"urgent": 20, "normal": 20}, grants=9)
+
+    assert order.count("urgent") == 8
+    assert order.count("normal") == 1
+
+
+async def test_cancelled_waiter_gives_up_its_place():
+    slots = WeightedSlots(1, {"normal": 1})
+    await slots.acquire("normal")
+
+    waiter = asyncio.create_task(slots.acquire("normal"))
+    await asyncio.sleep(0)
+    assert slots.waiting() == {"normal": 1}
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    assert slots.waiting() == {"normal": 0}
+
+    slots.release()
+    assert slots._free == 1
+
+
+def test_non_positive_weight_is_rejected():
+    with pytest.raises(ValueError, match="low"):
+        WeightedSlots(1, {"urgent": 8, "low": 0})
@@ -0,0 +1,123 @@
+"""Tests for delta-based workflow state storage."""
+
+from app.orchestrator.state_store import WorkflowStateStore, diff_state, load_workflow_state
+
+
+def delta_rows(deltas) -> list[tuple]:
+    """Rows of the replay query for deltas added to a session."""
+    return [
+        (delta.sequence, delta.changes, delta.appended, delta.merged)
+        for delta in sorted(deltas, key=lambda d: d.sequence)
+    ]
+
+
+def test_diff_state_replaces_changed_and_new_keys():
+    diff = diff_state({"status": "running", "score": 1}, {"status": "review", "score": 1, "x": 1})
+
+    assert diff.changes == {"status": "review", "x": 1}
+    assert not diff.appended and not diff.merged
+
+
+def test_diff_state_keeps_only_appended_items():
+    previous = {"messages": [{"n": 1}, {"n": 2}], "completed_phases": ["intake"]}
+    current = {"messages": [{"n": 1}, {"n": 2}, {"n": 3}], "completed_phases": ["intake"]}
+
+    diff = diff_state(previous, current)
+
+    assert diff.appended == {"messages": [{"n": 3}]}
+    assert not diff.changes
+
+
+def test_diff_state_keeps_only_merged_entries():
+    previous = {"step_metrics": {"intake": {"duration_seconds": 1.0}}}
+    current = {
+        "step_metrics": {"intake": {"duration_seconds": 1.0}, "kyc": {"duration_seconds": 2.0}}
+    }
+
+    assert diff_state(previous, current).merged == {
+        "step_metrics": {"kyc": {"duration_seconds": 2.0}}
+    }
+
+
+def test_diff_state_replaces_lists_and_dicts_that_did_not_just_grow():
+    previous = {"errors": [1, 2], "context": {"a": 1, "b": 2}}
+    current = {"errors": [2], "context": {"a": 1}}
+
+    assert diff_state(previous, current).changes == current
+
+
+def test_diff_state_of_identical_states_is_empty():
+    state = {"status": "running", "completed_phases": ["intake"]}
+
+    assert not diff_state(state, dict(state))
+
+
+async def test_append_records_only_changes(session, workflow):
+    store = WorkflowStateStore(workflow)
+
+    first = await store.append(session, {**workflow.state, "current_phase": "intake"})
+    second = await store.append(session, {**workflow.state, "current_phase": "intake"})
+
+    assert first.changes == {"current_phase": "intake"}
+    assert first.workflow_id == workflow.id
+    assert second is None
+
+
+async def test_append_numbers_deltas_in_order(session, workflow):
+    store = WorkflowStateStore(workflow)
+
+    deltas = [
+        await store.append(session, {"current_phase": phase})
+        for phase in ("intake", "verification", "review")
+    ]
+
+    assert [delta.sequence for delta in deltas] == [1, 2, 3]
+
+
+async def test_load_replays_deltas_over_the_snapshot(session, workflow):
+    store = WorkflowStateStore(workflow)
+    states = [
+        {**workflow.state, "current_phase": "intake", "messages": [], "step_metrics": {}},
+        {
+            **workflow.state,
+            "current_phase": "verification",
+            "messages": [{"node": "intake"}],
+            "step_metrics": {"intake": {"duration_seconds": 1.0}},
+        },
+        {
+            **workflow.state,
+            "current_phase": "verification",
+            "messages": [{"node": "intake"}, {"node": "kyc"}],
+            "step_metrics": {"intake": {"duration_seconds": 1.0}, "kyc": {"attempts": 1}},
+            "kyc_result": {"status": "verified"},
+        },
+    ]
+    for state in states:
+        await store.append(session, state)
+
+    session.results.append(delta_rows(session.pending))
+
+    assert await load_workflow_state(session, workflow) == states[-1]
+
+
+async def test_load_without_deltas_returns_the_snapshot(session, workflow):
+    assert await load_workflow_state(session, workflow) == workflow.state
+
+
+async def test_loaded_store_diffs_against_earlier_deltas(session, workflow):
+    earlier = WorkflowStateStore(workflow)
+    state = {**workflow.state, "current_phase": "review", "messages": [{"node": "intake"}]}
+    await earlier.append(session, {**workflow.state, "current_phase": "intake", "messages": []})
+    await earlier.append(session, state)
+
+    # A new run, e.g. resuming after approval, picks up where the deltas left off
+    session.results.append(delta_rows(session.pending))
+    store = await WorkflowStateStore.load(session, workflow)
+
+    assert await store.append(session, state) is None
+    delta = await store.append(
+        session, {**state, "messages": [{"node": "intake"}, {"node": "approval"}]}
+    )
+    assert delta.sequence == 3
+    assert delta.appended == {"messages": [{"node": "approval"}]}
+    assert not delta.changes
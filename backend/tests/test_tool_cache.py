@@ -0,0 +1,52 @@
+"""Tests for tool result cache keys."""
+
+from app.agents.tool_cache import ToolCachePolicy, normalize_arguments
+
+
+def test_fields_not_listed_are_kept_as_is():
+    arguments = {"customer_id": " AbC-12 ", "notes": "Call  Back"}
+
+    assert normalize_arguments(arguments, frozenset({"name"})) == arguments
+
+
+def test_listed_fields_are_folded():
+    normalized = normalize_arguments(
+        {"name": "  ACME   Corp ", "tax_id": "AB 12"}, frozenset({"name"})
+    )
+
+    assert normalized == {"name": "acme corp", "tax_id": "AB 12"}
+
+
+def test_listed_fields_are_folded_at_any_depth():
+    normalized = normalize_arguments(
+        {"parties": [{"name": "Jane DOE", "email": "Jane@Example.com"}], "name": ("A", "B")},
+        frozenset({"name"}),
+    )
+
+    assert normalized == {
+        "parties": [{"name": "jane doe", "email": "Jane@Example.com"}],
+        "name": ["a", "b"],
+    }
+
+
+def test_non_string_values_are_unchanged():
+    assert normalize_arguments({"name": 3, "flag": None}, frozenset({"name"})) == {
+        "name": 3,
+        "flag": None,
+    }
+
+
+def test_equivalent_inputs_share_a_key():
+    policy = ToolCachePolicy(ttl=60, case_insensitive=frozenset({"name"}))
+
+    assert policy.key("verify_kyc", {"name": "Jane Doe", "id_number": "X1"}) == policy.key(
+        "verify_kyc", {"id_number": "X1", "name": " jane  DOE"}
+    )
+
+
+def test_case_sensitive_fields_change_the_key():
+    policy = ToolCachePolicy(ttl=60, case_insensitive=frozenset({"name"}))
+
+    assert policy.key("verify_kyc", {"name": "Jane", "id_number": "ab1"}) != policy.key(
+        "verify_kyc", {"name": "Jane", "id_number": "AB1"}
+    )